@@ -1,45 +1,31 @@
 # -*- coding: utf-8 -*-
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import argparse
 import os
+import threading
+import time
 
-
-class Empleado:
-    """Clase de dominio que representa un empleado."""
-
-    def __init__(self, nombre, apellidos, cargo, genero,
-                 salario_dia, dias_trabajados,
-                 otros_ingresos, pagos_salud, aporte_pension):
-        self.nombre = nombre
-        self.apellidos = apellidos
-        self.cargo = cargo            # Directivo, Estratégico, Operativo
-        self.genero = genero          # Masculino, Femenino
-        self.salario_dia = salario_dia
-        self.dias_trabajados = dias_trabajados
-        self.otros_ingresos = otros_ingresos
-        self.pagos_salud = pagos_salud
-        self.aporte_pension = aporte_pension
-
-    def calcular_salario_mensual(self):
-        """
-        Salario mensual = (días trabajados * sueldo por día)
-                          + otros ingresos
-                          - pagos por salud
-                          - aporte pensiones
-        """
-        return (self.dias_trabajados * self.salario_dia) \
-            + self.otros_ingresos \
-            - self.pagos_salud \
-            - self.aporte_pension
+from almacen_sqlite import AlmacenEmpleadosSQLite
+from deducciones import CAMPOS_DEDUCCION, ReglaDeduccion, ReglasDeduccion, reglas_por_defecto
+from empleados import CARGOS, Empleado, AlmacenEmpleados, convertir_monto, validar_empleado
+from importacion import importar_empleados
+from reporte import escribir_reporte
 
 
 class AgregarEmpleadoWindow(tk.Toplevel):
-    """Ventana para agregar un empleado."""
+    """
+    Ventana para agregar un empleado.
+
+    Si ya se aplicaron reglas de deducción (reglas, ya compiladas), los pagos
+    de salud y el aporte a pensiones no se escriben: se calculan con ellas.
+    """
 
-    def __init__(self, master, lista_empleados):
+    def __init__(self, master, lista_empleados, reglas=None):
         super().__init__(master)
         self.title("Agregar empleado")
         self.lista_empleados = lista_empleados
+        self.reglas = reglas
 
         self.geometry("450x430")
         self.resizable(False, False)
@@ -118,6 +104,11 @@ class AgregarEmpleadoWindow(tk.Toplevel):
         self.entry_aporte_pension = tk.Entry(frame)
         self.entry_aporte_pension.grid(row=8, column=1, sticky="ew")
 
+        if self.reglas is not None:
+            for entry in (self.entry_pagos_salud, self.entry_aporte_pension):
+                entry.insert(0, "Según reglas")
+                entry.config(state="disabled")
+
         # Botones
         btn_frame = tk.Frame(self, pady=5)
         btn_frame.pack(fill=tk.X, side=tk.BOTTOM)
@@ -139,37 +130,10 @@ class AgregarEmpleadoWindow(tk.Toplevel):
         if self.var_femenino.get() == 1:
             self.var_masculino.set(0)
 
-    def _parse_float(self, entry, nombre_campo, obligatorio=True):
-        texto = entry.get().strip()
-        if texto == "":
-            if obligatorio:
-                messagebox.showerror("Error", f'El campo "{nombre_campo}" es obligatorio.')
-                return None
-            else:
-                return 0.0
-        try:
-            return float(texto)
-        except ValueError:
-            messagebox.showerror("Error", f'El campo "{nombre_campo}" debe ser un número.')
-            return None
-
     def _guardar_empleado(self):
-        nombre = self.entry_nombre.get().strip()
-        apellidos = self.entry_apellidos.get().strip()
-
-        if not nombre:
-            messagebox.showerror("Error", "El nombre es obligatorio.")
-            return
-        if not apellidos:
-            messagebox.showerror("Error", "Los apellidos son obligatorios.")
-            return
-
         # Cargo
         seleccion_cargo = self.list_cargo.curselection()
-        if not seleccion_cargo:
-            messagebox.showerror("Error", "Debe seleccionar un cargo.")
-            return
-        cargo = self.list_cargo.get(seleccion_cargo[0])
+        cargo = self.list_cargo.get(seleccion_cargo[0]) if seleccion_cargo else ""
 
         # Género
         if self.var_masculino.get() == 1 and self.var_femenino.get() == 0:
@@ -177,49 +141,29 @@ class AgregarEmpleadoWindow(tk.Toplevel):
         elif self.var_masculino.get() == 0 and self.var_femenino.get() == 1:
             genero = "Femenino"
         else:
-            messagebox.showerror("Error", "Debe seleccionar exactamente un género.")
-            return
-
-        # Salario día
-        salario_dia = self._parse_float(self.entry_salario_dia, "Salario por día", obligatorio=True)
-        if salario_dia is None:
-            return
-
-        # Días trabajados
+            genero = ""
+
+        datos = {
+            "nombre": self.entry_nombre.get(),
+            "apellidos": self.entry_apellidos.get(),
+            "cargo": cargo,
+            "genero": genero,
+            "salario_dia": self.entry_salario_dia.get(),
+            "dias_trabajados": self.spin_dias.get(),
+            "otros_ingresos": self.entry_otros_ingresos.get(),
+            "pagos_salud": self.entry_pagos_salud.get() if self.reglas is None else "",
+            "aporte_pension": self.entry_aporte_pension.get() if self.reglas is None else "",
+        }
         try:
-            dias_trabajados = int(self.var_dias.get())
-            if dias_trabajados < 1 or dias_trabajados > 31:
-                raise ValueError
-        except ValueError:
-            messagebox.showerror("Error", "Los días trabajados deben estar entre 1 y 31.")
-            return
-
-        # Otros campos
-        otros_ingresos = self._parse_float(self.entry_otros_ingresos, "Otros ingresos", obligatorio=False)
-        if otros_ingresos is None:
-            return
-
-        pagos_salud = self._parse_float(self.entry_pagos_salud, "Pagos por salud", obligatorio=False)
-        if pagos_salud is None:
-            return
-
-        aporte_pension = self._parse_float(self.entry_aporte_pension, "Aporte pensiones", obligatorio=False)
-        if aporte_pension is None:
+            empleado = Empleado(*validar_empleado(datos))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        empleado = Empleado(
-            nombre=nombre,
-            apellidos=apellidos,
-            cargo=cargo,
-            genero=genero,
-            salario_dia=salario_dia,
-            dias_trabajados=dias_trabajados,
-            otros_ingresos=otros_ingresos,
-            pagos_salud=pagos_salud,
-            aporte_pension=aporte_pension
-        )
-
         self.lista_empleados.append(empleado)
+        if self.reglas is not None:
+            self.lista_empleados.aplicar_deducciones(
+                self.reglas, desde=len(self.lista_empleados) - 1)
         messagebox.showinfo("Información", "Empleado agregado correctamente.")
 
         # Limpiar campos para permitir agregar otro
@@ -234,17 +178,31 @@ class AgregarEmpleadoWindow(tk.Toplevel):
         self.entry_salario_dia.delete(0, tk.END)
         self.var_dias.set(1)
         self.entry_otros_ingresos.delete(0, tk.END)
-        self.entry_pagos_salud.delete(0, tk.END)
-        self.entry_aporte_pension.delete(0, tk.END)
+        if self.reglas is None:
+            self.entry_pagos_salud.delete(0, tk.END)
+            self.entry_aporte_pension.delete(0, tk.END)
 
 
 class NominaWindow(tk.Toplevel):
-    """Ventana que muestra la tabla de nómina y el total."""
+    """
+    Ventana que muestra la tabla de nómina y el total.
+
+    Con muchos empleados la tabla pasa a modo virtual: solo existen los
+    ítems del Treeview que caben en pantalla y se rellenan desde el almacén
+    a medida que el usuario se desplaza.
+    """
 
-    def __init__(self, master, lista_empleados):
+    # A partir de esta cantidad de empleados se usa la tabla virtual
+    UMBRAL_TABLA_VIRTUAL = 2000
+    FILAS_POR_RUEDA = 3
+
+    def __init__(self, master, lista_empleados, virtual=None):
         super().__init__(master)
         self.title("Nómina de empleados")
         self.lista_empleados = lista_empleados
+        if virtual is None:
+            virtual = len(lista_empleados) > self.UMBRAL_TABLA_VIRTUAL
+        self.virtual = virtual
 
         self.geometry("600x400")
         self.resizable(True, True)
@@ -260,21 +218,29 @@ class NominaWindow(tk.Toplevel):
         tree.column("nombre", width=150)
         tree.column("apellidos", width=200)
         tree.column("salario", width=120, anchor="e")
+        self.tree = tree
 
-        scrollbar_y = ttk.Scrollbar(self, orient="vertical", command=tree.yview)
-        tree.configure(yscroll=scrollbar_y.set)
+        if self.virtual:
+            scrollbar_y = ttk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        else:
+            scrollbar_y = ttk.Scrollbar(self, orient="vertical", command=tree.yview)
+            tree.configure(yscroll=scrollbar_y.set)
+        self.scrollbar_y = scrollbar_y
 
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
 
-        total_nomina = 0.0
-        for emp in self.lista_empleados:
-            salario_mensual = emp.calcular_salario_mensual()
-            total_nomina += salario_mensual
-            tree.insert(
-                "", tk.END,
-                values=(emp.nombre, emp.apellidos, f"{salario_mensual:.2f}")
-            )
+        self._total_filas = len(self.lista_empleados)
+
+        if self.virtual:
+            self._preparar_tabla_virtual()
+        else:
+            for nombre, apellido, _, _, salario_mensual in self.lista_empleados.filas_nomina():
+                tree.insert(
+                    "", tk.END,
+                    values=(nombre, apellido, f"{salario_mensual:.2f}")
+                )
+        total_nomina = self.lista_empleados.total_nomina()
 
         lbl_total = tk.Label(
             self,
@@ -283,29 +249,270 @@ class NominaWindow(tk.Toplevel):
         )
         lbl_total.pack(fill=tk.X, side=tk.BOTTOM, padx=5, pady=5)
 
+    # ----- Tabla virtual -----
 
-class NominaApp(tk.Tk):
-    """Ventana principal de la aplicación."""
+    def _preparar_tabla_virtual(self):
+        self._inicio = 0
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        for secuencia in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(secuencia, self._rueda)
+
+    def _filas_que_caben(self, alto):
+        hijos = self.tree.get_children()
+        caja = self.tree.bbox(hijos[0]) if hijos else ""
+        if caja:
+            encabezado, alto_fila = caja[1], caja[3]
+        else:
+            encabezado, alto_fila = 25, 20
+        return max(1, (alto - encabezado) // alto_fila)
+
+    def _al_redimensionar(self, event):
+        filas = min(self._filas_que_caben(event.height), self._total_filas)
+        hijos = self.tree.get_children()
+        if len(hijos) < filas:
+            for _ in range(filas - len(hijos)):
+                self.tree.insert("", tk.END, values=("", "", ""))
+        elif len(hijos) > filas:
+            self.tree.delete(*hijos[filas:])
+        self._pintar()
+
+    def _pintar(self):
+        hijos = self.tree.get_children()
+        total = self._total_filas
+        self._inicio = max(0, min(self._inicio, total - len(hijos)))
+        filas = self.lista_empleados.filas_nomina(self._inicio, self._inicio + len(hijos))
+        for item, (nombre, apellido, _, _, salario_mensual) in zip(hijos, filas):
+            self.tree.item(item, values=(nombre, apellido, f"{salario_mensual:.2f}"))
+        if total:
+            self.scrollbar_y.set(self._inicio / total, (self._inicio + len(hijos)) / total)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self._inicio = int(float(cantidad) * self._total_filas)
+        elif accion == "scroll":
+            paso = int(cantidad)
+            if unidad == "pages":
+                paso *= max(1, len(self.tree.get_children()) - 1)
+            self._inicio += paso
+        self._pintar()
+
+    def _rueda(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._inicio -= self.FILAS_POR_RUEDA
+        else:
+            self._inicio += self.FILAS_POR_RUEDA
+        self._pintar()
+        return "break"
+
+
+class DeduccionesWindow(tk.Toplevel):
+    """
+    Ventana para configurar las tasas de salud y pensión por cargo y
+    recalcular esas deducciones para todos los empleados a la vez.
+    """
+
+    def __init__(self, master, lista_empleados, reglas, callback_reglas):
+        super().__init__(master)
+        self.title("Deducciones de salud y pensión")
+        self.lista_empleados = lista_empleados
+        self.reglas = reglas
+        self.callback_reglas = callback_reglas
+
+        self.geometry("420x230")
+        self.resizable(False, False)
+        self.grab_set()
+
+        self._crear_widgets()
+
+    def _crear_widgets(self):
+        frame = tk.Frame(self, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(frame, text="Cargo").grid(row=0, column=0, sticky="w")
+        tk.Label(frame, text="Salud (%)").grid(row=0, column=1)
+        tk.Label(frame, text="Pensión (%)").grid(row=0, column=2)
+
+        # entries[(cargo, campo)] -> Entry con la tasa en porcentaje
+        self.entries = {}
+        for fila, cargo in enumerate(CARGOS, start=1):
+            tk.Label(frame, text=f"{cargo}:").grid(row=fila, column=0, sticky="w")
+            for columna, campo in enumerate(CAMPOS_DEDUCCION, start=1):
+                entry = tk.Entry(frame, width=10)
+                entry.insert(0, f"{self.reglas.regla(campo, cargo).tasa * 100:g}")
+                entry.grid(row=fila, column=columna, padx=5, pady=2)
+                self.entries[(cargo, campo)] = entry
+
+        # Topes (opcionales, iguales para todos los cargos)
+        fila_topes = len(CARGOS) + 1
+        tk.Label(frame, text="Tope (opcional):").grid(row=fila_topes, column=0, sticky="w")
+        self.entries_tope = {}
+        for columna, campo in enumerate(CAMPOS_DEDUCCION, start=1):
+            entry = tk.Entry(frame, width=10)
+            tope = self.reglas.generales[campo].tope
+            if tope is not None:
+                entry.insert(0, f"{tope:g}")
+            entry.grid(row=fila_topes, column=columna, padx=5, pady=2)
+            self.entries_tope[campo] = entry
+
+        btn_frame = tk.Frame(self, pady=5)
+        btn_frame.pack(fill=tk.X, side=tk.BOTTOM)
+
+        btn_aplicar = tk.Button(btn_frame, text="Aplicar a todos", command=self._aplicar)
+        btn_aplicar.pack(side=tk.RIGHT, padx=5)
+
+        btn_cerrar = tk.Button(btn_frame, text="Cerrar", command=self.destroy)
+        btn_cerrar.pack(side=tk.RIGHT)
+
+    def _leer_reglas(self):
+        topes = {}
+        for campo, entry in self.entries_tope.items():
+            texto = entry.get().strip()
+            topes[campo] = convertir_monto(texto, "Tope") if texto else None
+
+        por_cargo = {}
+        for (cargo, campo), entry in self.entries.items():
+            tasa = convertir_monto(entry.get(), f"Tasa {cargo}") / 100
+            por_cargo.setdefault(cargo, {})[campo] = ReglaDeduccion(tasa, topes[campo])
+
+        generales = reglas_por_defecto().generales
+        return ReglasDeduccion(
+            ReglaDeduccion(generales["pagos_salud"].tasa, topes["pagos_salud"]),
+            ReglaDeduccion(generales["aporte_pension"].tasa, topes["aporte_pension"]),
+            por_cargo
+        )
+
+    def _aplicar(self):
+        try:
+            reglas = self._leer_reglas()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        inicio = time.perf_counter()
+        compiladas = reglas.compilar()
+        self.lista_empleados.aplicar_deducciones(compiladas)
+        milisegundos = (time.perf_counter() - inicio) * 1000
 
-    def __init__(self):
+        self.callback_reglas(reglas, compiladas)
+        messagebox.showinfo(
+            "Información",
+            f"Deducciones recalculadas para {len(self.lista_empleados)} empleados "
+            f"en {milisegundos:.0f} ms."
+        )
+        self.destroy()
+
+
+class ProgresoWindow(tk.Toplevel):
+    """
+    Ventana modal que ejecuta una tarea larga (guardar o importar la nómina)
+    en un hilo aparte y muestra su avance, para no bloquear la interfaz.
+
+    tarea recibe una función progreso(hechos, total); al_terminar se llama en
+    el hilo de Tk con (resultado, error) cuando la tarea finaliza.
+    """
+
+    def __init__(self, master, titulo, mensaje, tarea, al_terminar):
+        super().__init__(master)
+        self.title(titulo)
+        self.tarea = tarea
+        self.al_terminar = al_terminar
+
+        self.geometry("350x110")
+        self.resizable(False, False)
+        self.grab_set()  # Evita modificar la nómina mientras trabaja el hilo
+        self.protocol("WM_DELETE_WINDOW", lambda: None)
+
+        self._avance = (0, 0)
+        self._resultado = None
+        self._error = None
+        self._terminado = False
+
+        self._crear_widgets(mensaje)
+        threading.Thread(target=self._ejecutar, daemon=True).start()
+        self.after(100, self._revisar_avance)
+
+    def _crear_widgets(self, mensaje):
+        frame = tk.Frame(self, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(frame, text=mensaje).pack(anchor="w")
+        self.barra = ttk.Progressbar(frame, maximum=100)
+        self.barra.pack(fill=tk.X, pady=5)
+        self.lbl_avance = tk.Label(frame, text="")
+        self.lbl_avance.pack(anchor="w")
+
+    def _ejecutar(self):
+        # Se ejecuta en el hilo de trabajo: no debe tocar widgets
+        try:
+            self._resultado = self.tarea(self._registrar_avance)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._terminado = True
+
+    def _registrar_avance(self, hechos, total):
+        self._avance = (hechos, total)
+
+    def _revisar_avance(self):
+        hechos, total = self._avance
+        porcentaje = 100 * hechos / total if total else 0
+        self.barra["value"] = porcentaje
+        self.lbl_avance.config(text=f"{porcentaje:.0f} %")
+        if not self._terminado:
+            self.after(100, self._revisar_avance)
+            return
+
+        self.destroy()
+        self.al_terminar(self._resultado, self._error)
+
+
+class NominaApp(tk.Tk):
+    """
+    Ventana principal de la aplicación.
+
+    Si se indica ruta_bd, los empleados se guardan en esa base SQLite y se
+    conservan entre sesiones; si no, viven solo en memoria. Con centavos=True
+    el almacén en memoria calcula en punto fijo; la base SQLite guarda los
+    montos como REAL, así que no admite centavos=True.
+    """
+
+    def __init__(self, ruta_bd=None, centavos=False):
+        if ruta_bd and centavos:
+            raise ValueError("El modo de centavos solo está disponible sin base de datos.")
         super().__init__()
         self.title("Gestión de Nómina")
         self.geometry("600x400")
         self.resizable(True, True)
 
-        self.empleados = []
+        if ruta_bd:
+            self.empleados = AlmacenEmpleadosSQLite(ruta_bd)
+        else:
+            self.empleados = AlmacenEmpleados(centavos=centavos)
+        self.reglas_deduccion = reglas_por_defecto()
+        # Reglas compiladas que se aplican a los empleados nuevos; None
+        # mientras no se use "Aplicar a todos"
+        self.reglas_aplicadas = None
+        self.protocol("WM_DELETE_WINDOW", self._salir)
 
         self._crear_menu()
         self._crear_contenido_principal()
 
+    def _salir(self):
+        self.empleados.cerrar()
+        self.destroy()
+
     def _crear_menu(self):
         menubar = tk.Menu(self)
 
         menu_opciones = tk.Menu(menubar, tearoff=0)
         menu_opciones.add_command(label="Agregar empleado", command=self._abrir_agregar_empleado)
+        menu_opciones.add_command(label="Importar empleados", command=self._importar_archivo)
+        menu_opciones.add_command(label="Deducciones salud/pensión", command=self._abrir_deducciones)
         menu_opciones.add_command(label="Calcular nómina", command=self._abrir_nomina)
         menu_opciones.add_separator()
         menu_opciones.add_command(label="Guardar archivo", command=self._guardar_archivo)
+        menu_opciones.add_command(label="Guardar archivo comprimido",
+                                  command=lambda: self._guardar_archivo(comprimir=True))
 
         menubar.add_cascade(label="Opciones", menu=menu_opciones)
 
@@ -320,7 +527,14 @@ class NominaApp(tk.Tk):
         lbl.pack(expand=True)
 
     def _abrir_agregar_empleado(self):
-        AgregarEmpleadoWindow(self, self.empleados)
+        AgregarEmpleadoWindow(self, self.empleados, self.reglas_aplicadas)
+
+    def _abrir_deducciones(self):
+        DeduccionesWindow(self, self.empleados, self.reglas_deduccion, self._actualizar_reglas)
+
+    def _actualizar_reglas(self, reglas, compiladas):
+        self.reglas_deduccion = reglas
+        self.reglas_aplicadas = compiladas
 
     def _abrir_nomina(self):
         if not self.empleados:
@@ -328,7 +542,7 @@ class NominaApp(tk.Tk):
             return
         NominaWindow(self, self.empleados)
 
-    def _guardar_archivo(self):
+    def _guardar_archivo(self, comprimir=False):
         if not self.empleados:
             messagebox.showinfo("Información", "No hay empleados para guardar.")
             return
@@ -339,33 +553,68 @@ class NominaApp(tk.Tk):
         if not carpeta:
             return  # Usuario canceló
 
-        ruta_archivo = os.path.join(carpeta, "Nómina.txt")
+        nombre_archivo = "Nómina.txt.gz" if comprimir else "Nómina.txt"
+        ruta_archivo = os.path.join(carpeta, nombre_archivo)
 
-        try:
-            total_nomina = 0.0
-            with open(ruta_archivo, "w", encoding="utf-8") as f:
-                f.write("NÓMINA DE EMPLEADOS\n")
-                f.write("------------------------------------------------------\n")
-                for emp in self.empleados:
-                    salario_mensual = emp.calcular_salario_mensual()
-                    total_nomina += salario_mensual
-                    linea = (
-                        f"Nombre: {emp.nombre} {emp.apellidos} | "
-                        f"Cargo: {emp.cargo} | Género: {emp.genero} | "
-                        f"Salario mensual: {salario_mensual:.2f}\n"
-                    )
-                    f.write(linea)
-                f.write("------------------------------------------------------\n")
-                f.write(f"TOTAL NÓMINA: {total_nomina:.2f}\n")
-
-            messagebox.showinfo(
-                "Éxito",
-                f"Archivo guardado correctamente en:\n{ruta_archivo}"
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar el archivo:\n{e}")
+        def tarea(progreso):
+            escribir_reporte(self.empleados, ruta_archivo,
+                             comprimir=comprimir, progreso=progreso)
+
+        def al_terminar(resultado, error):
+            if error is None:
+                messagebox.showinfo(
+                    "Éxito",
+                    f"Archivo guardado correctamente en:\n{ruta_archivo}"
+                )
+            else:
+                messagebox.showerror("Error", f"Error al guardar el archivo:\n{error}")
+
+        ProgresoWindow(self, "Guardando nómina", "Guardando el archivo de nómina...",
+                       tarea, al_terminar)
+
+    def _importar_archivo(self):
+        ruta_archivo = filedialog.askopenfilename(
+            title="Seleccione el archivo de empleados a importar",
+            filetypes=[("CSV o JSONL", "*.csv *.jsonl *.ndjson"), ("Todos", "*.*")]
+        )
+        if not ruta_archivo:
+            return  # Usuario canceló
+
+        reglas = self.reglas_aplicadas
+        desde = len(self.empleados)
+
+        def tarea(progreso):
+            try:
+                return importar_empleados(ruta_archivo, self.empleados, progreso=progreso)
+            finally:
+                # También si la importación falló a medias
+                if reglas is not None:
+                    self.empleados.aplicar_deducciones(reglas, desde=desde)
+
+        def al_terminar(resultado, error):
+            if error is not None:
+                messagebox.showerror("Error", f"Error al importar el archivo:\n{error}")
+                return
+            mensaje = (f"Empleados importados: {resultado.importados}\n"
+                       f"Filas rechazadas: {resultado.rechazados}")
+            if resultado.errores:
+                detalle = "\n".join(f"Fila {fila}: {texto}"
+                                    for fila, texto in resultado.errores[:10])
+                mensaje += f"\n\nPrimeros errores:\n{detalle}"
+            messagebox.showinfo("Importación terminada", mensaje)
+
+        ProgresoWindow(self, "Importando empleados", "Importando empleados...",
+                       tarea, al_terminar)
 
 
 if __name__ == "__main__":
-    app = NominaApp()
+    parser = argparse.ArgumentParser(description="Gestión de Nómina")
+    parser.add_argument("--bd", help="base SQLite donde se guardan los empleados")
+    parser.add_argument("--centavos", action="store_true",
+                        help="calcula la nómina en punto fijo (centavos enteros)")
+    args = parser.parse_args()
+    if args.bd and args.centavos:
+        parser.error("--centavos no se puede usar con --bd (la base guarda los montos como REAL)")
+
+    app = NominaApp(ruta_bd=args.bd, centavos=args.centavos)
     app.mainloop()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Almacén de empleados persistente sobre SQLite.
+
+Ofrece la misma interfaz que AlmacenEmpleados, pero los empleados quedan
+guardados en un archivo de base de datos entre sesiones. Los totales de la
+nómina se calculan con agregados SQL, sin cargar las filas en Python.
+
+Los ids de las filas, en orden, se guardan también en un arreglo en
+memoria (8 bytes por empleado): pasar de posición a id es un acceso al
+arreglo y las páginas del reporte se piden por rango de id sobre la clave
+primaria, sin LIMIT/OFFSET, que obliga a SQLite a recorrer todas las filas
+anteriores.
+"""
+import sqlite3
+import threading
+from array import array
+
+from empleados import CAMPOS, CAMPOS_MONETARIOS, VALORES_CATEGORICOS, Empleado, comprobar_valores
+
+_SALARIO_SQL = ("(dias_trabajados * salario_dia) + otros_ingresos"
+                " - pagos_salud - aporte_pension")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS empleados (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    apellidos TEXT NOT NULL,
+    cargo TEXT NOT NULL,
+    genero TEXT NOT NULL,
+    salario_dia REAL NOT NULL,
+    dias_trabajados INTEGER NOT NULL,
+    otros_ingresos REAL NOT NULL,
+    pagos_salud REAL NOT NULL,
+    aporte_pension REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_empleados_cargo ON empleados (cargo);
+CREATE INDEX IF NOT EXISTS idx_empleados_genero ON empleados (genero);
+CREATE INDEX IF NOT EXISTS idx_empleados_apellidos ON empleados (apellidos);
+"""
+
+_INSERTAR = (f"INSERT INTO empleados ({', '.join(CAMPOS)}) "
+             f"VALUES ({', '.join('?' for _ in CAMPOS)})")
+
+
+class AlmacenEmpleadosSQLite:
+    """
+    Almacén de empleados guardado en una base SQLite (modo WAL).
+
+    Las filas se identifican por su posición, en el orden en que se
+    agregaron. La conexión se comparte con los hilos de guardado e
+    importación, por eso cada operación toma un candado. Los montos se
+    guardan como REAL: este almacén no tiene modo de centavos.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._candado = threading.Lock()
+        with self._candado, self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(_ESQUEMA)
+            self._ids = array("q", (fila[0] for fila in
+                                    self._conexion.execute("SELECT id FROM empleados ORDER BY id")))
+
+    def _consultar(self, sql, parametros=()):
+        with self._candado:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    def _modificar(self, sql, parametros=()):
+        with self._candado, self._conexion:
+            self._conexion.execute(sql, parametros)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _id(self, indice):
+        if indice < 0:
+            indice += len(self._ids)
+        if not 0 <= indice < len(self._ids):
+            raise IndexError("Índice de empleado fuera de rango.")
+        return self._ids[indice]
+
+    def __getitem__(self, indice):
+        self._id(indice)  # Valida el índice
+        return Empleado._vista(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield Empleado._vista(self, indice)
+
+    def __delitem__(self, indice):
+        self.quitar(indice)
+
+    def append(self, empleado):
+        """Guarda el empleado y lo convierte en vista de la nueva fila."""
+        origen, indice = empleado._almacen, empleado._indice
+        fila = tuple(origen._leer(indice, campo) for campo in CAMPOS)
+        with self._candado, self._conexion:
+            self._ids.append(self._conexion.execute(_INSERTAR, fila).lastrowid)
+        empleado._almacen = self
+        empleado._indice = len(self) - 1
+
+    def extender(self, filas):
+        """Inserta muchas filas en una sola transacción."""
+        filas = list(filas)
+        # Se valida antes de insertar, como en AlmacenEmpleados
+        for posicion, campo in enumerate(CAMPOS):
+            if campo in VALORES_CATEGORICOS or campo in CAMPOS_MONETARIOS:
+                comprobar_valores(campo, [fila[posicion] for fila in filas])
+        with self._candado, self._conexion:
+            self._conexion.executemany(_INSERTAR, filas)
+            ultimo = self._ids[-1] if self._ids else 0
+            self._ids.extend(fila[0] for fila in self._conexion.execute(
+                "SELECT id FROM empleados WHERE id > ? ORDER BY id", (ultimo,)))
+
+    def quitar(self, indice):
+        if indice < 0:
+            indice += len(self._ids)
+        id_fila = self._id(indice)
+        with self._candado, self._conexion:
+            self._conexion.execute("DELETE FROM empleados WHERE id = ?", (id_fila,))
+            del self._ids[indice]
+
+    def _leer(self, indice, campo):
+        # campo siempre es uno de CAMPOS, nunca texto del usuario
+        return self._consultar(f"SELECT {campo} FROM empleados WHERE id = ?",
+                               (self._id(indice),))[0][0]
+
+    def _escribir(self, indice, campo, valor):
+        comprobar_valores(campo, (valor,))
+        self._modificar(f"UPDATE empleados SET {campo} = ? WHERE id = ?",
+                        (valor, self._id(indice)))
+
+    def filas_nomina(self, inicio=0, fin=None):
+        """
+        Devuelve tuplas (nombre, apellidos, cargo, genero, salario mensual)
+        de las filas inicio a fin, con el salario calculado por SQLite. Las
+        filas se piden por rango de id, que SQLite ubica en la clave primaria.
+        """
+        inicio, fin, _ = slice(inicio, fin).indices(len(self._ids))
+        if inicio >= fin:
+            return []
+        return self._consultar(
+            f"SELECT nombre, apellidos, cargo, genero, {_SALARIO_SQL} "
+            "FROM empleados WHERE id BETWEEN ? AND ? ORDER BY id",
+            (self._ids[inicio], self._ids[fin - 1])
+        )
+
+    def salario_mensual(self, indice):
+        return self._consultar(f"SELECT {_SALARIO_SQL} FROM empleados WHERE id = ?",
+                               (self._id(indice),))[0][0]
+
+    def salarios_mensuales(self, inicio=0, fin=None):
+        return [fila[4] for fila in self.filas_nomina(inicio, fin)]
+
+    def total_nomina(self):
+        return self._consultar(f"SELECT TOTAL({_SALARIO_SQL}) FROM empleados")[0][0]
+
+    def subtotales(self, campo):
+        """
+        Cantidad de empleados y total de salarios por cargo o por género,
+        calculados con GROUP BY: {valor: (cantidad, total)}.
+        """
+        columna = "cargo" if campo == "cargo" else "genero"
+        return {clave: (cantidad, total) for clave, cantidad, total in self._consultar(
+            f"SELECT {columna}, COUNT(*), TOTAL({_SALARIO_SQL}) "
+            f"FROM empleados GROUP BY {columna}")}
+
+    def aplicar_deducciones(self, reglas, desde=0):
+        """
+        Recalcula pagos_salud y aporte_pension con un solo UPDATE, de todos
+        los empleados o solo de las filas desde la indicada.
+        """
+        if desde >= len(self._ids):
+            return
+        asignaciones, parametros = [], []
+        for campo, (expresion, valores) in reglas.sql.items():
+            asignaciones.append(f"{campo} = {expresion}")
+            parametros += valores
+        self._modificar(f"UPDATE empleados SET {', '.join(asignaciones)} WHERE id >= ?",
+                        parametros + [self._ids[desde]])
+
+    def cerrar(self):
+        with self._candado:
+            self._conexion.close()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de reglas para los pagos por salud y los aportes a pensión.
+
+Cada deducción es una tasa sobre el salario básico del mes (días trabajados
+por salario por día), con un tope opcional, y puede cambiar según el cargo.
+Las reglas se compilan una sola vez en funciones que calculan la deducción
+de todos los empleados del almacén en una pasada.
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+from empleados import CARGOS
+
+CAMPOS_DEDUCCION = ("pagos_salud", "aporte_pension")
+
+
+class ReglaDeduccion:
+    """Tasa (0.04 = 4 %) sobre el salario básico, con tope opcional en pesos."""
+
+    def __init__(self, tasa, tope=None):
+        if tasa < 0:
+            raise ValueError("La tasa de una deducción no puede ser negativa.")
+        if tope is not None and tope < 0:
+            raise ValueError("El tope de una deducción no puede ser negativo.")
+        self.tasa = tasa
+        self.tope = tope
+
+
+class ReglasDeduccion:
+    """
+    Reglas generales de salud y pensión, con excepciones por cargo.
+
+    por_cargo asocia un cargo con un diccionario {campo: ReglaDeduccion}
+    que reemplaza la regla general de ese campo.
+    """
+
+    def __init__(self, salud, pension, por_cargo=None):
+        self.generales = {"pagos_salud": salud, "aporte_pension": pension}
+        self.por_cargo = por_cargo or {}
+
+    def regla(self, campo, cargo):
+        return self.por_cargo.get(cargo, {}).get(campo, self.generales[campo])
+
+    def compilar(self):
+        return ReglasCompiladas(self)
+
+
+def reglas_por_defecto():
+    """Salud 4 % y pensión 4 % para todos los cargos, sin topes."""
+    return ReglasDeduccion(ReglaDeduccion(0.04), ReglaDeduccion(0.04))
+
+
+def _compilar_campo(reglas, campo):
+    """
+    Devuelve una función calcular(base, categorias, codigos, centavos) que
+    aplica las reglas del campo a todos los empleados. base es el salario
+    básico de cada empleado y codigos[i] la posición de su cargo en
+    categorias. Los montos están en las unidades internas del almacén.
+    """
+    # Se resuelve la regla de cada cargo una sola vez
+    resueltas = {cargo: reglas.regla(campo, cargo) for cargo in CARGOS}
+    general = reglas.generales[campo]
+
+    def tablas(categorias, centavos):
+        escala = 100 if centavos else 1
+        tasas, topes = [], []
+        for cargo in categorias:
+            regla = resueltas.get(cargo, general)
+            tasas.append(regla.tasa)
+            topes.append(float("inf") if regla.tope is None else regla.tope * escala)
+        return tasas, topes
+
+    if np is not None:
+        def calcular(base, categorias, codigos, centavos):
+            tasas, topes = tablas(categorias, centavos)
+            indices = np.frombuffer(codigos, dtype=codigos.typecode)
+            valores = np.minimum(base * np.array(tasas)[indices], np.array(topes)[indices])
+            if centavos:
+                return np.rint(valores).astype(np.int64)
+            return np.round(valores, 2)
+    else:
+        def calcular(base, categorias, codigos, centavos):
+            tasas, topes = tablas(categorias, centavos)
+            if centavos:
+                return [round(min(b * tasas[c], topes[c])) for b, c in zip(base, codigos)]
+            return [round(min(b * tasas[c], topes[c]), 2) for b, c in zip(base, codigos)]
+
+    return calcular
+
+
+def _compilar_sql(reglas, campo):
+    """Expresión SQL (y sus parámetros) equivalente a las reglas del campo."""
+    general = reglas.generales[campo]
+    tasas, topes = [], []
+    for cargo in CARGOS:
+        regla = reglas.regla(campo, cargo)
+        tasas += [cargo, regla.tasa]
+        topes += [cargo, float("inf") if regla.tope is None else regla.tope]
+    tasas.append(general.tasa)
+    topes.append(float("inf") if general.tope is None else general.tope)
+    casos = "CASE cargo " + " ".join("WHEN ? THEN ?" for _ in CARGOS) + " ELSE ? END"
+    expresion = f"ROUND(MIN((dias_trabajados * salario_dia) * {casos}, {casos}), 2)"
+    return expresion, tasas + topes
+
+
+class ReglasCompiladas:
+    """Reglas de deducción compiladas: una función (y una expresión SQL) por campo."""
+
+    def __init__(self, reglas):
+        self.funciones = {campo: _compilar_campo(reglas, campo)
+                          for campo in CAMPOS_DEDUCCION}
+        self.sql = {campo: _compilar_sql(reglas, campo)
+                    for campo in CAMPOS_DEDUCCION}
+
+    def calcular(self, campo, base, categorias, codigos, centavos=False):
+        return self.funciones[campo](base, categorias, codigos, centavos)
@@ -0,0 +1,580 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo de dominio de la nómina.
+
+Los empleados se guardan en un almacén columnar: cada campo numérico vive en
+un arreglo tipado y contiguo (módulo array), de modo que el salario mensual
+de toda la nómina se calcula en una sola pasada vectorizada con NumPy, o con
+un bucle simple si NumPy no está instalado.
+
+Con centavos=True el almacén trabaja en punto fijo: los montos se guardan
+como enteros de 64 bits en centavos y los totales son exactos. Los montos
+solo se convierten a decimal al mostrarlos.
+"""
+import math
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+CAMPOS_TEXTO = ("nombre", "apellidos", "cargo", "genero")
+
+# Campos de texto con pocos valores distintos: se guardan como códigos
+CAMPOS_CATEGORICOS = ("cargo", "genero")
+
+# Campos numéricos y su código de tipo en el módulo array
+CAMPOS_NUMERICOS = (
+    ("salario_dia", "d"),
+    ("dias_trabajados", "i"),
+    ("otros_ingresos", "d"),
+    ("pagos_salud", "d"),
+    ("aporte_pension", "d"),
+)
+
+# Orden de los campos de una fila (el mismo del constructor de Empleado)
+CAMPOS = CAMPOS_TEXTO + tuple(campo for campo, _ in CAMPOS_NUMERICOS)
+
+# Campos que representan dinero (en centavos en el modo de punto fijo)
+CAMPOS_MONETARIOS = ("salario_dia", "otros_ingresos", "pagos_salud", "aporte_pension")
+
+CARGOS = ("Directivo", "Estratégico", "Operativo")
+GENEROS = ("Masculino", "Femenino")
+VALORES_CATEGORICOS = {"cargo": frozenset(CARGOS), "genero": frozenset(GENEROS)}
+
+# Mayor valor absoluto de un campo monetario: así el salario de una fila en
+# centavos y las sumas de millones de filas caben en un entero de 64 bits
+MAX_MONTO = 1e9
+
+
+def monto_valido(valor):
+    return math.isfinite(valor) and abs(valor) <= MAX_MONTO
+
+
+def comprobar_valores(campo, valores):
+    """
+    Lanza ValueError si algún valor no sirve para el campo: un cargo o un
+    género que no está en CARGOS o GENEROS, o un monto no finito o fuera de
+    rango. Es la parte de validar_empleado() que vale para valores ya
+    convertidos (los que llegan al almacén por extender o por una vista).
+    """
+    if campo in VALORES_CATEGORICOS:
+        invalidos = set(valores) - VALORES_CATEGORICOS[campo]
+        if invalidos:
+            nombre = "género" if campo == "genero" else campo
+            raise ValueError(f'El {nombre} "{min(invalidos, key=str)}" no es válido.')
+    elif campo in CAMPOS_MONETARIOS:
+        if not all(map(monto_valido, valores)):
+            raise ValueError("Monto fuera de rango.")
+
+
+def a_centavos(valor):
+    """
+    Convierte un monto a centavos enteros, redondeando al más cercano. Lanza
+    ValueError si el monto no es finito o pasa de MAX_MONTO.
+    """
+    if not monto_valido(valor):
+        raise ValueError(f"Monto fuera de rango: {valor!r}.")
+    return round(valor * 100)
+
+
+def convertir_monto(texto, nombre_campo, obligatorio=True):
+    """
+    Convierte a float el texto de un campo monetario. Un campo opcional vacío
+    vale 0.0. Si el texto no es un número finito de valor absoluto hasta
+    MAX_MONTO lanza ValueError con el mensaje que se muestra al usuario.
+    """
+    texto = texto.strip()
+    if texto == "":
+        if obligatorio:
+            raise ValueError(f'El campo "{nombre_campo}" es obligatorio.')
+        return 0.0
+    try:
+        monto = float(texto)
+    except ValueError:
+        raise ValueError(f'El campo "{nombre_campo}" debe ser un número.') from None
+    if not monto_valido(monto):
+        raise ValueError(f'El campo "{nombre_campo}" debe estar entre '
+                         f'-{MAX_MONTO:,.0f} y {MAX_MONTO:,.0f}.')
+    return monto
+
+
+def validar_empleado(datos):
+    """
+    Valida los datos en texto de un empleado (diccionario campo -> texto) y
+    devuelve la fila lista para el almacén, en el orden de CAMPOS. Lanza
+    ValueError con el primer error encontrado.
+    """
+    nombre = datos.get("nombre", "").strip()
+    apellidos = datos.get("apellidos", "").strip()
+    cargo = datos.get("cargo", "").strip()
+    genero = datos.get("genero", "").strip()
+
+    if not nombre:
+        raise ValueError("El nombre es obligatorio.")
+    if not apellidos:
+        raise ValueError("Los apellidos son obligatorios.")
+    if not cargo:
+        raise ValueError("Debe seleccionar un cargo.")
+    if cargo not in CARGOS:
+        raise ValueError(f'El cargo "{cargo}" no es válido.')
+    if not genero:
+        raise ValueError("Debe seleccionar exactamente un género.")
+    if genero not in GENEROS:
+        raise ValueError(f'El género "{genero}" no es válido.')
+
+    salario_dia = convertir_monto(datos.get("salario_dia", ""), "Salario por día")
+
+    try:
+        dias_trabajados = int(datos.get("dias_trabajados", "").strip())
+        if dias_trabajados < 1 or dias_trabajados > 31:
+            raise ValueError
+    except ValueError:
+        raise ValueError("Los días trabajados deben estar entre 1 y 31.") from None
+
+    otros_ingresos = convertir_monto(datos.get("otros_ingresos", ""), "Otros ingresos", obligatorio=False)
+    pagos_salud = convertir_monto(datos.get("pagos_salud", ""), "Pagos por salud", obligatorio=False)
+    aporte_pension = convertir_monto(datos.get("aporte_pension", ""), "Aporte pensiones", obligatorio=False)
+
+    return (nombre, apellidos, cargo, genero, salario_dia, dias_trabajados,
+            otros_ingresos, pagos_salud, aporte_pension)
+
+
+def _campo(nombre):
+    """Propiedad que lee y escribe el campo en la fila del almacén."""
+
+    def leer(self):
+        return self._almacen._leer(self._indice, nombre)
+
+    def escribir(self, valor):
+        self._almacen._escribir(self._indice, nombre, valor)
+
+    return property(leer, escribir)
+
+
+class Empleado:
+    """
+    Clase de dominio que representa un empleado.
+
+    Es una vista sobre una fila de un AlmacenEmpleados. Un empleado creado
+    directamente vive en un almacén propio de una sola fila hasta que se
+    agrega a otro almacén con append().
+    """
+
+    __slots__ = ("_almacen", "_indice")
+
+    def __init__(self, nombre, apellidos, cargo, genero,
+                 salario_dia, dias_trabajados,
+                 otros_ingresos, pagos_salud, aporte_pension):
+        almacen = AlmacenEmpleados()
+        almacen._agregar_fila((nombre, apellidos, cargo, genero,
+                               salario_dia, dias_trabajados,
+                               otros_ingresos, pagos_salud, aporte_pension))
+        self._almacen = almacen
+        self._indice = 0
+
+    @classmethod
+    def _vista(cls, almacen, indice):
+        empleado = cls.__new__(cls)
+        empleado._almacen = almacen
+        empleado._indice = indice
+        return empleado
+
+    nombre = _campo("nombre")
+    apellidos = _campo("apellidos")
+    cargo = _campo("cargo")            # Directivo, Estratégico, Operativo
+    genero = _campo("genero")          # Masculino, Femenino
+    salario_dia = _campo("salario_dia")
+    dias_trabajados = _campo("dias_trabajados")
+    otros_ingresos = _campo("otros_ingresos")
+    pagos_salud = _campo("pagos_salud")
+    aporte_pension = _campo("aporte_pension")
+
+    def calcular_salario_mensual(self):
+        """
+        Salario mensual = (días trabajados * sueldo por día)
+                          + otros ingresos
+                          - pagos por salud
+                          - aporte pensiones
+
+        El cálculo lo hace el almacén, en sus propias unidades.
+        """
+        return self._almacen.salario_mensual(self._indice)
+
+
+class _ColumnaCategorica:
+    """
+    Columna de texto con pocos valores distintos (cargo, género), guardada
+    como un arreglo de códigos de 2 bytes y una tabla código -> valor. Se
+    usa igual que una lista de textos.
+    """
+
+    __slots__ = ("valores", "codigos", "_codigo_de")
+
+    def __init__(self):
+        self.valores = []
+        self.codigos = array("h")
+        self._codigo_de = {}
+
+    def codigo(self, valor):
+        codigo = self._codigo_de.get(valor)
+        if codigo is None:
+            codigo = self._codigo_de[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            valores = self.valores
+            return [valores[codigo] for codigo in self.codigos[indice]]
+        return self.valores[self.codigos[indice]]
+
+    def __setitem__(self, indice, valor):
+        self.codigos[indice] = self.codigo(valor)
+
+    def __delitem__(self, indice):
+        del self.codigos[indice]
+
+    def append(self, valor):
+        self.codigos.append(self.codigo(valor))
+
+    def extend(self, valores):
+        self.codigos.extend(map(self.codigo, valores))
+
+
+class AgregadosNomina:
+    """
+    Totales de la nómina mantenidos de forma incremental, en las unidades
+    internas del almacén (centavos enteros en el modo de punto fijo).
+
+    por_cargo y por_genero asocian cada valor con una lista
+    [cantidad de empleados, suma de salarios].
+    """
+
+    def __init__(self, cero=0.0):
+        self._cero = cero
+        self.total = cero
+        self.cantidad = 0
+        self.por_cargo = {}
+        self.por_genero = {}
+
+    def sumar(self, salario, cargo, genero, signo=1):
+        """Suma (signo=1) o resta (signo=-1) el aporte de un empleado."""
+        self.total += signo * salario
+        self.cantidad += signo
+        for subtotales, clave in ((self.por_cargo, cargo), (self.por_genero, genero)):
+            subtotal = subtotales.setdefault(clave, [0, self._cero])
+            subtotal[0] += signo
+            subtotal[1] += signo * salario
+            if subtotal[0] == 0:
+                del subtotales[clave]
+
+
+# Filas nuevas hasta las que aplicar_deducciones ajusta los agregados fila
+# por fila en lugar de reconstruirlos
+MAX_FILAS_INCREMENTAL = 1000
+
+# Campos que, al cambiar, modifican el aporte de un empleado a los agregados
+_CAMPOS_AGREGADOS = {"cargo", "genero"} | {campo for campo, _ in CAMPOS_NUMERICOS}
+
+
+class AlmacenEmpleados:
+    """
+    Almacén columnar de empleados: unos 60 bytes por empleado con nombres
+    repetidos, frente a ~450 bytes de un objeto con __dict__ por empleado
+    (200 000 filas importadas de CSV, medido con tracemalloc).
+
+    Se comporta como la lista de empleados que usaba la aplicación (append,
+    len, índices e iteración devuelven vistas Empleado), pero además calcula
+    los salarios por lotes y mantiene los agregados de la nómina al día con
+    cada alta, edición o baja.
+
+    Con centavos=True los montos se guardan en centavos (int64); las vistas
+    Empleado y los métodos públicos siguen recibiendo y devolviendo montos
+    en unidades monetarias.
+    """
+
+    def __init__(self, centavos=False):
+        self.centavos = centavos
+        self._tipos = {
+            campo: "q" if centavos and campo in CAMPOS_MONETARIOS else tipo
+            for campo, tipo in CAMPOS_NUMERICOS
+        }
+        # nombre y apellidos: listas de textos internados (sys.intern), así
+        # los nombres repetidos comparten un solo objeto
+        self._texto = {
+            campo: _ColumnaCategorica() if campo in CAMPOS_CATEGORICOS else []
+            for campo in CAMPOS_TEXTO
+        }
+        self._numeros = {campo: array(tipo) for campo, tipo in self._tipos.items()}
+        self.agregados = self._nuevos_agregados()
+
+    def _nuevos_agregados(self):
+        return AgregadosNomina(0 if self.centavos else 0.0)
+
+    def _es_centavos(self, campo):
+        return self.centavos and campo in CAMPOS_MONETARIOS
+
+    def _monto(self, valor):
+        """Convierte un valor en unidades internas a unidades monetarias."""
+        return valor / 100 if self.centavos else valor
+
+    def __len__(self):
+        return len(self._texto["nombre"])
+
+    def __getitem__(self, indice):
+        n = len(self)
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError("Índice de empleado fuera de rango.")
+        return Empleado._vista(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield Empleado._vista(self, indice)
+
+    def __delitem__(self, indice):
+        self.quitar(indice)
+
+    def append(self, empleado):
+        """Copia el empleado al almacén y lo convierte en vista de la nueva fila."""
+        origen, indice = empleado._almacen, empleado._indice
+        self._agregar_fila(tuple(origen._leer(indice, campo) for campo in CAMPOS))
+        empleado._almacen = self
+        empleado._indice = len(self) - 1
+
+    def extender(self, filas):
+        """
+        Agrega muchas filas de una vez. Cada fila es una tupla con los campos
+        en el orden de CAMPOS.
+        """
+        inicio = len(self)
+        columnas = list(zip(*filas))
+        if not columnas:
+            return
+        # Todo se convierte antes de tocar una columna: si una fila falla,
+        # el almacén queda como estaba
+        convertidas = [self._columna_convertida(campo, valores)
+                       for campo, valores in zip(CAMPOS, columnas)]
+        for campo, valores in zip(CAMPOS, convertidas):
+            columna = self._texto[campo] if campo in self._texto else self._numeros[campo]
+            columna.extend(valores)
+        for indice in range(inicio, len(self)):
+            self._sumar_agregados(indice)
+
+    def quitar(self, indice):
+        """
+        Elimina el empleado de la fila indicada. Las vistas de las filas
+        posteriores quedan apuntando a la fila siguiente.
+        """
+        if indice < 0:
+            indice += len(self)
+        self._sumar_agregados(indice, signo=-1)
+        for columna in self._texto.values():
+            del columna[indice]
+        for columna in self._numeros.values():
+            del columna[indice]
+
+    def _agregar_fila(self, fila):
+        self.extender((fila,))
+
+    def _columna_convertida(self, campo, valores):
+        """
+        Valores listos para la columna del campo: textos internados, montos
+        en centavos si corresponde y números en un arreglo del tipo de la
+        columna. Un cargo o género desconocido o un monto no finito o fuera
+        de rango lanza ValueError y un tipo equivocado TypeError, sin haber
+        modificado el almacén.
+        """
+        if campo in CAMPOS_CATEGORICOS:
+            valores = list(valores)
+            comprobar_valores(campo, valores)
+            return valores
+        if campo in self._texto:
+            return list(map(sys.intern, valores))
+        if self._es_centavos(campo):
+            valores = map(a_centavos, valores)   # a_centavos comprueba el rango
+        elif campo in CAMPOS_MONETARIOS:
+            valores = list(valores)
+            comprobar_valores(campo, valores)
+        return array(self._tipos[campo], valores)
+
+    def _salario(self, indice):
+        # En unidades internas
+        numeros = self._numeros
+        return (numeros["dias_trabajados"][indice] * numeros["salario_dia"][indice]) \
+            + numeros["otros_ingresos"][indice] \
+            - numeros["pagos_salud"][indice] \
+            - numeros["aporte_pension"][indice]
+
+    def _sumar_agregados(self, indice, signo=1):
+        self.agregados.sumar(self._salario(indice),
+                             self._texto["cargo"][indice],
+                             self._texto["genero"][indice],
+                             signo)
+
+    def _leer(self, indice, campo):
+        if campo in self._texto:
+            return self._texto[campo][indice]
+        valor = self._numeros[campo][indice]
+        return valor / 100 if self._es_centavos(campo) else valor
+
+    def _escribir(self, indice, campo, valor):
+        nuevo = self._columna_convertida(campo, (valor,))[0]
+        afecta_agregados = campo in _CAMPOS_AGREGADOS
+        if afecta_agregados:
+            self._sumar_agregados(indice, signo=-1)
+        columna = self._texto[campo] if campo in self._texto else self._numeros[campo]
+        columna[indice] = nuevo
+        if afecta_agregados:
+            self._sumar_agregados(indice)
+
+    def salario_mensual(self, indice):
+        """Salario mensual del empleado de la fila indicada."""
+        return self._monto(self._salario(indice))
+
+    def filas_nomina(self, inicio=0, fin=None):
+        """
+        Devuelve tuplas (nombre, apellidos, cargo, genero, salario mensual)
+        de las filas inicio a fin, con los salarios calculados en lote.
+        """
+        salarios = self.salarios_mensuales(inicio, fin)
+        columnas = [self._texto[campo][inicio:fin] for campo in CAMPOS_TEXTO]
+        return list(zip(*columnas, salarios))
+
+    def cerrar(self):
+        """El almacén en memoria no tiene recursos que liberar."""
+
+    def _columnas_numpy(self, inicio, fin):
+        # Vistas sin copia sobre los arreglos. Solo deben vivir dentro del
+        # cálculo: mientras exista una vista, el arreglo no puede crecer.
+        return [np.frombuffer(self._numeros[campo], dtype=self._tipos[campo])[inicio:fin]
+                for campo, _ in CAMPOS_NUMERICOS]
+
+    def _salarios_internos(self, inicio, fin):
+        if np is not None:
+            salario_dia, dias, otros, salud, pension = self._columnas_numpy(inicio, fin)
+            return (dias * salario_dia) + otros - salud - pension
+        columnas = [self._numeros[campo][inicio:fin] for campo, _ in CAMPOS_NUMERICOS]
+        return array("q" if self.centavos else "d", [
+            (dias * salario_dia) + otros - salud - pension
+            for salario_dia, dias, otros, salud, pension in zip(*columnas)
+        ])
+
+    def salarios_mensuales(self, inicio=0, fin=None):
+        """
+        Calcula en una pasada el salario mensual de los empleados de las
+        filas inicio a fin (por defecto, de todos).
+        """
+        salarios = self._salarios_internos(inicio, fin)
+        if not self.centavos:
+            return salarios
+        if np is not None:
+            return salarios / 100
+        return array("d", [salario / 100 for salario in salarios])
+
+    def salarios_centavos(self, inicio=0, fin=None):
+        """Salarios mensuales exactos, en centavos (solo en punto fijo)."""
+        if not self.centavos:
+            raise ValueError("El almacén no está en modo de centavos.")
+        return self._salarios_internos(inicio, fin)
+
+    def total_nomina(self):
+        """Suma de los salarios mensuales, tomada de los agregados."""
+        return self._monto(self.agregados.total)
+
+    def subtotales(self, campo):
+        """
+        Cantidad de empleados y total de salarios por cargo o por género:
+        {valor: (cantidad, total)}.
+        """
+        agrupados = self.agregados.por_cargo if campo == "cargo" else self.agregados.por_genero
+        return {clave: (cantidad, self._monto(total))
+                for clave, (cantidad, total) in agrupados.items()}
+
+    def codigos(self, campo):
+        """
+        Codifica una columna de texto: devuelve (categorías, códigos), donde
+        códigos[i] es la posición del valor de la fila i en categorías.
+        """
+        columna = self._texto[campo]
+        if isinstance(columna, _ColumnaCategorica):
+            return list(columna.valores), array(columna.codigos.typecode, columna.codigos)
+        categorias = {}
+        codigos = array("i", [categorias.setdefault(valor, len(categorias))
+                              for valor in self._texto[campo]])
+        return list(categorias), codigos
+
+    def _base_cotizacion(self, desde=0):
+        # Salario básico del mes (días * salario por día), en unidades internas
+        if np is not None:
+            salario_dia, dias = self._columnas_numpy(desde, None)[:2]
+            return dias * salario_dia
+        return [dias * salario_dia for salario_dia, dias in
+                zip(self._numeros["salario_dia"][desde:], self._numeros["dias_trabajados"][desde:])]
+
+    def aplicar_deducciones(self, reglas, desde=0):
+        """
+        Recalcula pagos_salud y aporte_pension con unas ReglasCompiladas, de
+        todos los empleados o solo de las filas desde la indicada (las que
+        se acaban de agregar), y pone al día los agregados.
+        """
+        if desde >= len(self):
+            return
+        # Pocas filas: se restan y se vuelven a sumar; muchas: se reconstruye todo
+        incremental = desde > 0 and len(self) - desde <= MAX_FILAS_INCREMENTAL
+        if incremental:
+            for indice in range(desde, len(self)):
+                self._sumar_agregados(indice, signo=-1)
+        categorias, codigos = self.codigos("cargo")
+        base = self._base_cotizacion(desde)
+        for campo in reglas.funciones:
+            valores = reglas.calcular(campo, base, categorias, codigos[desde:], self.centavos)
+            columna = array(self._tipos[campo])
+            if np is not None:
+                columna.frombytes(valores.astype(self._tipos[campo]).tobytes())
+            else:
+                columna.extend(valores)
+            self._numeros[campo][desde:] = columna   # Mismo largo: no redimensiona
+        if incremental:
+            for indice in range(desde, len(self)):
+                self._sumar_agregados(indice)
+        else:
+            self.recalcular_agregados()
+
+    def recalcular_agregados(self):
+        """
+        Reconstruye los agregados desde cero (tras cambios masivos). Como
+        sumar(), no deja categorías sin empleados (por ejemplo un cargo que
+        quedó en la tabla de códigos pero cuyas filas se quitaron).
+        """
+        agregados = self._nuevos_agregados()
+        salarios = self._salarios_internos(0, None)
+        agregados.cantidad = len(self)
+        for campo, subtotales in (("cargo", agregados.por_cargo),
+                                  ("genero", agregados.por_genero)):
+            categorias, codigos = self.codigos(campo)
+            if np is not None:
+                indices = np.frombuffer(codigos, dtype=codigos.typecode)
+                for codigo, clave in enumerate(categorias):
+                    filas = indices == codigo
+                    cantidad = int(filas.sum())
+                    if cantidad:
+                        subtotales[clave] = [cantidad, salarios[filas].sum().item()]
+            else:
+                for codigo, salario in zip(codigos, salarios):
+                    subtotal = subtotales.setdefault(categorias[codigo], [0, agregados._cero])
+                    subtotal[0] += 1
+                    subtotal[1] += salario
+        if np is not None:
+            agregados.total = salarios.sum().item() if len(salarios) else agregados._cero
+        else:
+            agregados.total = sum(salarios, agregados._cero)
+        self.agregados = agregados
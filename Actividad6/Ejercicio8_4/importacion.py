@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de empleados desde archivos CSV o JSONL.
+
+El archivo se lee en streaming y las filas válidas se agregan al almacén por
+lotes, así que la memoria usada no depende del tamaño del archivo. Cada fila
+se valida con las mismas reglas del formulario de alta (validar_empleado) y
+los errores se registran por fila en lugar de detener la importación; eso
+incluye las filas que no son UTF-8 válido o que el módulo csv no puede leer.
+Por eso el archivo se abre en binario y cada línea se decodifica por separado.
+"""
+import codecs
+import csv
+import json
+import os
+
+from empleados import CAMPOS, validar_empleado
+
+TAMANO_LOTE = 10000
+MAX_ERRORES = 1000   # errores que se guardan con detalle; el resto solo se cuenta
+
+
+class ResultadoImportacion:
+    """Resumen de una importación: filas importadas, rechazadas y errores."""
+
+    def __init__(self):
+        self.importados = 0
+        self.rechazados = 0
+        self.errores = []   # (número de fila, mensaje)
+
+    def registrar_error(self, numero_fila, mensaje):
+        self.rechazados += 1
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append((numero_fila, mensaje))
+
+
+def _sin_bom(numero_linea, linea):
+    if numero_linea == 1 and linea.startswith(codecs.BOM_UTF8):
+        return linea[len(codecs.BOM_UTF8):]
+    return linea
+
+
+def _lineas_texto(f, invalidas):
+    """
+    Decodifica cada línea del archivo binario. Las que no son UTF-8 válido
+    se decodifican con reemplazos y su número se anota en invalidas.
+    """
+    for numero_linea, linea in enumerate(f, start=1):
+        linea = _sin_bom(numero_linea, linea)
+        try:
+            yield linea.decode("utf-8")
+        except UnicodeDecodeError:
+            invalidas.add(numero_linea)
+            yield linea.decode("utf-8", errors="replace")
+
+
+def _descartar_hasta(invalidas, numero_linea):
+    invalidas.difference_update([linea for linea in invalidas if linea <= numero_linea])
+
+
+def _filas_csv(f):
+    invalidas = set()
+    lector = csv.DictReader(_lineas_texto(f, invalidas))
+    try:
+        columnas = lector.fieldnames or ()
+    except csv.Error as e:
+        raise ValueError(f"El encabezado no se pudo leer como CSV: {e}.") from None
+    if invalidas:
+        raise ValueError("El encabezado no es texto UTF-8 válido.")
+    faltantes = [campo for campo in CAMPOS if campo not in columnas]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}.")
+    numero_fila = 1   # La fila 1 es el encabezado
+    while True:
+        try:
+            for fila in lector:
+                numero_fila += 1
+                # Las líneas inválidas que el lector ya consumió son de esta
+                # fila (una fila puede ocupar varias líneas)
+                if invalidas and min(invalidas) <= lector.line_num:
+                    _descartar_hasta(invalidas, lector.line_num)
+                    yield numero_fila, None, "La fila no es texto UTF-8 válido."
+                    continue
+                yield numero_fila, {campo: fila.get(campo) or "" for campo in CAMPOS}, None
+            return
+        except csv.Error as e:
+            # El lector sigue con la línea siguiente
+            numero_fila += 1
+            _descartar_hasta(invalidas, lector.line_num)
+            yield numero_fila, None, f"La fila no se pudo leer como CSV: {e}."
+
+
+def _texto_json(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))   # 3.0 es un entero válido en JSON para dias_trabajados
+    return str(valor)
+
+
+def _filas_jsonl(f):
+    for numero_fila, linea in enumerate(f, start=1):
+        linea = _sin_bom(numero_fila, linea)
+        if not linea.strip():
+            continue
+        try:
+            objeto = json.loads(linea.decode("utf-8"))
+            if not isinstance(objeto, dict):
+                raise ValueError
+        except UnicodeDecodeError:
+            yield numero_fila, None, "La línea no es texto UTF-8 válido."
+            continue
+        except ValueError:
+            yield numero_fila, None, "La línea no es un objeto JSON válido."
+            continue
+        fila = {campo: _texto_json(objeto.get(campo)) for campo in CAMPOS}
+        yield numero_fila, fila, None
+
+
+def importar_empleados(ruta, almacen, tam_lote=TAMANO_LOTE, progreso=None):
+    """
+    Importa los empleados del archivo (.csv, o .jsonl/.ndjson) al almacén y
+    devuelve un ResultadoImportacion.
+
+    progreso, si se indica, se llama con (bytes leídos, tamaño del archivo)
+    después de cada lote.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        leer_filas = _filas_csv
+    elif extension in (".jsonl", ".ndjson"):
+        leer_filas = _filas_jsonl
+    else:
+        raise ValueError(f'Formato de archivo no soportado: "{extension}".')
+
+    resultado = ResultadoImportacion()
+    tamano = os.path.getsize(ruta)
+    lote = []
+
+    def guardar_lote():
+        almacen.extender(lote)
+        resultado.importados += len(lote)
+        lote.clear()
+        if progreso is not None:
+            progreso(f.tell(), tamano)
+
+    with open(ruta, "rb") as f:
+        for numero_fila, datos, error in leer_filas(f):
+            if error is None:
+                try:
+                    lote.append(validar_empleado(datos))
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                resultado.registrar_error(numero_fila, error)
+            if len(lote) >= tam_lote:
+                guardar_lote()
+        guardar_lote()
+    return resultado
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Procesamiento de nóminas por lotes, sin interfaz gráfica.
+
+Cada archivo de entrada (CSV o JSONL, uno por departamento o por mes) se
+procesa en un proceso aparte: se importa, se escribe su reporte con el mismo
+formato de Nómina.txt y se devuelven solo sus totales. Al final se escribe
+un resumen con los totales de todos los archivos.
+
+Uso:
+    python nomina_cli.py enero.csv febrero.jsonl ... [-o CARPETA] [-j PROCESOS] [--gzip]
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from empleados import AlmacenEmpleados
+from importacion import importar_empleados
+from reporte import SEPARADOR, escribir_reporte
+
+NOMBRE_RESUMEN = "Resumen_Nómina.txt"
+
+
+def rutas_reportes(archivos, carpeta_salida, comprimir=False):
+    """
+    Ruta del reporte de cada archivo: <nombre>_Nómina.txt en la carpeta de
+    salida, numerando los nombres que se repiten (enero.csv y enero.jsonl).
+    """
+    bases = [os.path.splitext(os.path.basename(ruta))[0] for ruta in archivos]
+    vistos = {}
+    rutas = []
+    for base in bases:
+        if bases.count(base) > 1:
+            vistos[base] = vistos.get(base, 0) + 1
+            base = f"{base}_{vistos[base]}"
+        nombre = f"{base}_Nómina.txt.gz" if comprimir else f"{base}_Nómina.txt"
+        rutas.append(os.path.join(carpeta_salida, nombre))
+    return rutas
+
+
+def texto_monto(valor, centavos=False):
+    """
+    Monto con dos decimales. Con centavos=True el valor son centavos enteros
+    y se formatea sin pasar por float, así el total sigue siendo exacto.
+    """
+    if not centavos:
+        return f"{valor:.2f}"
+    signo = "-" if valor < 0 else ""
+    return f"{signo}{abs(valor) // 100}.{abs(valor) % 100:02d}"
+
+
+def procesar_archivo(ruta, ruta_reporte, comprimir=False, centavos=False):
+    """
+    Importa un archivo, escribe su reporte y devuelve sus totales, en las
+    unidades internas del almacén (centavos enteros si centavos=True).
+    """
+    almacen = AlmacenEmpleados(centavos=centavos)
+    resultado = importar_empleados(ruta, almacen)
+    escribir_reporte(almacen, ruta_reporte, comprimir=comprimir)
+
+    return {
+        "archivo": ruta,
+        "reporte": ruta_reporte,
+        "empleados": len(almacen),
+        "rechazados": resultado.rechazados,
+        "centavos": centavos,
+        "total": almacen.agregados.total,
+        "por_cargo": {cargo: tuple(subtotal) for cargo, subtotal in almacen.agregados.por_cargo.items()},
+    }
+
+
+def escribir_resumen(resultados, ruta):
+    """
+    Escribe el resumen combinado de todos los archivos procesados. Los
+    totales se suman en las unidades de cada resultado (enteros en centavos)
+    y solo se formatean al escribirlos.
+    """
+    centavos = any(r["centavos"] for r in resultados)
+    cero = 0 if centavos else 0.0
+    total_empleados = 0
+    total_nomina = cero
+    por_cargo = {}
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("RESUMEN DE NÓMINAS\n")
+        f.write(SEPARADOR)
+        for r in resultados:
+            f.write(
+                f"Archivo: {os.path.basename(r['archivo'])} | "
+                f"Empleados: {r['empleados']} | Rechazados: {r['rechazados']} | "
+                f"Total: {texto_monto(r['total'], r['centavos'])}\n"
+            )
+            total_empleados += r["empleados"]
+            total_nomina += r["total"]
+            for cargo, (cantidad, total) in r["por_cargo"].items():
+                subtotal = por_cargo.setdefault(cargo, [0, cero])
+                subtotal[0] += cantidad
+                subtotal[1] += total
+        f.write(SEPARADOR)
+        for cargo, (cantidad, total) in sorted(por_cargo.items()):
+            f.write(f"Cargo: {cargo} | Empleados: {cantidad} | Total: {texto_monto(total, centavos)}\n")
+        f.write(SEPARADOR)
+        f.write(f"TOTAL EMPLEADOS: {total_empleados}\n")
+        f.write(f"TOTAL NÓMINA: {texto_monto(total_nomina, centavos)}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesa archivos de nómina sin interfaz gráfica.")
+    parser.add_argument("archivos", nargs="+", help="archivos de empleados (.csv, .jsonl)")
+    parser.add_argument("-o", "--salida", default=".", help="carpeta donde se escriben los reportes")
+    parser.add_argument("-j", "--procesos", type=int, default=None,
+                        help="cantidad de procesos (por defecto, uno por CPU)")
+    parser.add_argument("--gzip", action="store_true", help="comprime los reportes de cada archivo")
+    parser.add_argument("--centavos", action="store_true",
+                        help="calcula en punto fijo (centavos enteros) para totales exactos")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.salida, exist_ok=True)
+    reportes = rutas_reportes(args.archivos, args.salida, args.gzip)
+    resultados = {}
+    fallidos = 0
+    with ProcessPoolExecutor(max_workers=args.procesos) as ejecutor:
+        futuros = {ejecutor.submit(procesar_archivo, ruta, ruta_reporte, args.gzip, args.centavos): ruta
+                   for ruta, ruta_reporte in zip(args.archivos, reportes)}
+        for futuro in as_completed(futuros):
+            ruta = futuros[futuro]
+            try:
+                r = futuro.result()
+            except Exception as e:
+                fallidos += 1
+                print(f"Error procesando {ruta}: {e}", file=sys.stderr)
+                continue
+            resultados[ruta] = r
+            print(f"{ruta}: {r['empleados']} empleados, total "
+                  f"{texto_monto(r['total'], r['centavos'])} -> {r['reporte']}")
+
+    # El resumen conserva el orden en que se pasaron los archivos
+    ordenados = [resultados[ruta] for ruta in args.archivos if ruta in resultados]
+    ruta_resumen = os.path.join(args.salida, NOMBRE_RESUMEN)
+    escribir_resumen(ordenados, ruta_resumen)
+    print(f"Resumen escrito en {ruta_resumen}")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
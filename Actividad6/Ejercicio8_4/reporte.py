@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Generación del archivo Nómina.txt.
+
+Las líneas se formatean por bloques de empleados y se escriben a través de un
+buffer grande, opcionalmente comprimidas con gzip. El contenido es el mismo
+que escribía NominaApp._guardar_archivo línea por línea.
+"""
+import gzip
+import io
+
+ENCABEZADO = "NÓMINA DE EMPLEADOS\n"
+SEPARADOR = "------------------------------------------------------\n"
+
+TAMANO_BLOQUE = 10000          # empleados por bloque de texto
+TAMANO_BUFFER = 1 << 20        # 1 MiB
+
+
+def _bloques_empleados(almacen, tam_bloque):
+    """Genera (empleados procesados, texto del bloque)."""
+    total = len(almacen)
+    for inicio in range(0, total, tam_bloque):
+        fin = min(inicio + tam_bloque, total)
+        filas = almacen.filas_nomina(inicio, fin)
+        yield fin, "".join(
+            f"Nombre: {nombre} {apellidos} | "
+            f"Cargo: {cargo} | Género: {genero} | "
+            f"Salario mensual: {salario_mensual:.2f}\n"
+            for nombre, apellidos, cargo, genero, salario_mensual in filas
+        )
+
+
+def _pie(almacen):
+    return SEPARADOR + f"TOTAL NÓMINA: {almacen.total_nomina():.2f}\n"
+
+
+def _abrir(ruta, comprimir):
+    if comprimir:
+        crudo = io.BufferedWriter(gzip.open(ruta, "wb"), TAMANO_BUFFER)
+        return io.TextIOWrapper(crudo, encoding="utf-8")
+    return open(ruta, "w", encoding="utf-8", buffering=TAMANO_BUFFER)
+
+
+def escribir_reporte(almacen, ruta, comprimir=False, progreso=None,
+                     tam_bloque=TAMANO_BLOQUE):
+    """
+    Escribe el reporte de nómina en la ruta indicada.
+
+    progreso, si se indica, se llama con (empleados escritos, total) después
+    de cada bloque.
+    """
+    total = len(almacen)
+    with _abrir(ruta, comprimir) as f:
+        f.write(ENCABEZADO + SEPARADOR)
+        for hechos, bloque in _bloques_empleados(almacen, tam_bloque):
+            f.write(bloque)
+            if progreso is not None:
+                progreso(hechos, total)
+        f.write(_pie(almacen))
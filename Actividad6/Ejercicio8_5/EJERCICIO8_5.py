@@ -1,49 +1,42 @@
 # -*- coding: utf-8 -*-
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import filedialog
 import datetime as dt
 
-
-class Huesped:
-    def __init__(self, nombre, apellidos, documento):
-        self.nombre = nombre
-        self.apellidos = apellidos
-        self.documento = documento
-
-
-class Habitacion:
-    def __init__(self, numero, precio_dia):
-        self.numero = numero
-        self.precio_dia = precio_dia
-        self.disponible = True
-        self.huesped = None
-        self.fecha_ingreso = None
-
-    def ocupar(self, huesped, fecha_ingreso):
-        self.huesped = huesped
-        self.fecha_ingreso = fecha_ingreso
-        self.disponible = False
-
-    def liberar(self):
-        self.huesped = None
-        self.fecha_ingreso = None
-        self.disponible = True
+from analitica import AnaliticaHotel
+from auditoria import auditoria_nocturna, escribir_auditoria
+from bitacora import Bitacora
+from hotel import PRECIOS_POR_TIPO, Huesped, InventarioHabitaciones, habitaciones_del_hotel
+from huespedes import RegistroHuespedes
+from reservas import CalendarioReservas
+from tarifas import Tarifario, cargar_tarifario
 
 
 class VentanaHabitaciones(tk.Toplevel):
     """Ventana que muestra las habitaciones y permite elegir una para ocupar."""
 
-    def __init__(self, master, habitaciones):
+    def __init__(self, master, habitaciones, reservas=None, registro=None):
         super().__init__(master)
         self.title("Consultar habitaciones")
         self.habitaciones = habitaciones
+        self.reservas = reservas
+        self.registro = registro
+
+        # Fila de la tabla y valores mostrados de cada habitación, para
+        # actualizar solo las filas que cambian
+        self._items = {}
+        self._mostrados = {}
+        self._pendientes = set()
+        self._redibujo = None
 
         self.geometry("500x350")
         self.resizable(False, False)
         self.grab_set()
 
         self._crear_widgets()
+        self.habitaciones.suscribir(self._al_cambiar_habitacion)
 
     def _crear_widgets(self):
         columnas = ("numero", "precio", "estado")
@@ -63,7 +56,7 @@ class VentanaHabitaciones(tk.Toplevel):
         scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
 
         # Llenar la tabla
-        self._refrescar_tabla()
+        self._actualizar_filas(self.habitaciones)
 
         frame_abajo = tk.Frame(self, padx=10, pady=10)
         frame_abajo.pack(fill=tk.X, side=tk.BOTTOM)
@@ -72,19 +65,52 @@ class VentanaHabitaciones(tk.Toplevel):
         self.entry_numero = tk.Entry(frame_abajo, width=5)
         self.entry_numero.pack(side=tk.LEFT, padx=5)
 
+        btn_siguiente = tk.Button(frame_abajo, text="Siguiente libre", command=self._siguiente_libre)
+        btn_siguiente.pack(side=tk.LEFT)
+
         btn_ocupar = tk.Button(frame_abajo, text="Ocupar habitación", command=self._ocuparseleccion)
         btn_ocupar.pack(side=tk.RIGHT)
 
-    def _refrescar_tabla(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _siguiente_libre(self):
+        habitacion = self.habitaciones.siguiente_libre()
+        if habitacion is None:
+            messagebox.showinfo("Información", "No hay habitaciones disponibles.")
+            return
+        self.entry_numero.delete(0, tk.END)
+        self.entry_numero.insert(0, str(habitacion.numero))
+
+    def _al_cambiar_habitacion(self, evento, habitacion, huesped, fecha):
+        self._pendientes.add(habitacion.numero)
+        self._refrescar_tabla()
 
-        for hab in self.habitaciones:
+    def _refrescar_tabla(self):
+        # Varios cambios seguidos se juntan en un solo redibujo
+        if self._redibujo is None:
+            self._redibujo = self.after_idle(self._redibujar)
+
+    def _redibujar(self):
+        self._redibujo = None
+        pendientes, self._pendientes = self._pendientes, set()
+        habitaciones = (self.habitaciones.buscar(numero) for numero in sorted(pendientes))
+        self._actualizar_filas(hab for hab in habitaciones if hab is not None)
+
+    def _actualizar_filas(self, habitaciones):
+        for hab in habitaciones:
             estado = "Disponible" if hab.disponible else "No disponible"
-            self.tree.insert(
-                "", tk.END,
-                values=(hab.numero, f"${hab.precio_dia:,.0f}", estado)
-            )
+            valores = (hab.numero, f"${hab.precio_dia:,.0f}", estado)
+            item = self._items.get(hab.numero)
+            if item is None:
+                self._items[hab.numero] = self.tree.insert("", tk.END, values=valores)
+            elif self._mostrados[hab.numero] != valores:
+                self.tree.item(item, values=valores)
+            self._mostrados[hab.numero] = valores
+
+    def destroy(self):
+        self.habitaciones.desuscribir(self._al_cambiar_habitacion)
+        if self._redibujo is not None:
+            self.after_cancel(self._redibujo)
+            self._redibujo = None
+        super().destroy()
 
     def _ocuparseleccion(self):
         texto = self.entry_numero.get().strip()
@@ -104,23 +130,22 @@ class VentanaHabitaciones(tk.Toplevel):
             return
 
         # Abrir ventana de ingreso de huésped
-        VentanaIngresoHuesped(self, habitacion, self._refrescar_tabla)
+        VentanaIngresoHuesped(self, habitacion, self._refrescar_tabla, self.reservas, self.registro)
 
     def _buscar_habitacion(self, numero):
-        for hab in self.habitaciones:
-            if hab.numero == numero:
-                return hab
-        return None
+        return self.habitaciones.buscar(numero)
 
 
 class VentanaIngresoHuesped(tk.Toplevel):
     """Ventana para registrar el ingreso de un huésped a una habitación."""
 
-    def __init__(self, master, habitacion, callback_actualizar):
+    def __init__(self, master, habitacion, callback_actualizar, reservas=None, registro=None):
         super().__init__(master)
         self.title(f"Ingreso huésped - Habitación {habitacion.numero}")
         self.habitacion = habitacion
         self.callback_actualizar = callback_actualizar
+        self.reservas = reservas
+        self.registro = registro
 
         self.geometry("400x320")
         self.resizable(False, False)
@@ -155,6 +180,10 @@ class VentanaIngresoHuesped(tk.Toplevel):
         self.entry_documento = tk.Entry(frame)
         self.entry_documento.grid(row=4, column=1, sticky="ew")
 
+        if self.registro is not None:
+            btn_buscar = tk.Button(frame, text="Buscar huésped", command=self._buscar_huesped)
+            btn_buscar.grid(row=5, column=1, sticky="e", pady=(5, 0))
+
         frame_botones = tk.Frame(self)
         frame_botones.pack(fill=tk.X, side=tk.BOTTOM, pady=10)
 
@@ -172,6 +201,17 @@ class VentanaIngresoHuesped(tk.Toplevel):
         except ValueError:
             return None
 
+    def _buscar_huesped(self):
+        # Completa nombre y apellidos de un huésped que ya estuvo en el hotel
+        huesped = self.registro.buscar(self.entry_documento.get().strip())
+        if huesped is None:
+            messagebox.showinfo("Información", "No hay un huésped registrado con ese documento.")
+            return
+        self.entry_nombre.delete(0, tk.END)
+        self.entry_nombre.insert(0, huesped.nombre)
+        self.entry_apellidos.delete(0, tk.END)
+        self.entry_apellidos.insert(0, huesped.apellidos)
+
     def _registrar_ingreso(self):
         fecha_txt = self.entry_fecha.get().strip()
         nombre = self.entry_nombre.get().strip()
@@ -187,8 +227,22 @@ class VentanaIngresoHuesped(tk.Toplevel):
             messagebox.showerror("Error", "La fecha de ingreso no tiene el formato correcto (AAAA-MM-DD).")
             return
 
+        # Solo puede ingresar en una fecha reservada quien tiene la reserva
+        reserva = None
+        if self.reservas is not None:
+            reserva = self.reservas.reserva_en(self.habitacion.numero, fecha_ingreso)
+            if reserva is not None and (reserva.huesped is None
+                                        or reserva.huesped.documento != documento):
+                messagebox.showerror("Error", "La habitación tiene una reserva para esa fecha "
+                                              "a nombre de otro huésped.")
+                return
+
         huesped = Huesped(nombre, apellidos, documento)
+        if self.registro is not None:
+            huesped = self.registro.registrar(huesped)
         self.habitacion.ocupar(huesped, fecha_ingreso)
+        if reserva is not None:
+            self.reservas.cancelar(reserva.numero, reserva.entrada)   # La reserva ya se usó
 
         messagebox.showinfo("Éxito", "Ingreso registrado correctamente.")
         self.callback_actualizar()   # Actualizar tabla de habitaciones
@@ -198,10 +252,11 @@ class VentanaIngresoHuesped(tk.Toplevel):
 class VentanaSalidaSeleccion(tk.Toplevel):
     """Ventana que solicita el número de habitación para registrar salida."""
 
-    def __init__(self, master, habitaciones):
+    def __init__(self, master, habitaciones, tarifario):
         super().__init__(master)
         self.title("Salida de huéspedes - Seleccionar habitación")
         self.habitaciones = habitaciones
+        self.tarifario = tarifario
 
         self.geometry("350x150")
         self.resizable(False, False)
@@ -221,10 +276,7 @@ class VentanaSalidaSeleccion(tk.Toplevel):
         btn_continuar.pack(pady=5)
 
     def _buscar_habitacion(self, numero):
-        for hab in self.habitaciones:
-            if hab.numero == numero:
-                return hab
-        return None
+        return self.habitaciones.buscar(numero)
 
     def _continuar(self):
         texto = self.entry_numero.get().strip()
@@ -244,17 +296,18 @@ class VentanaSalidaSeleccion(tk.Toplevel):
             return
 
         # Abrir ventana de registro de salida
-        VentanaRegistrarSalida(self, habitacion)
+        VentanaRegistrarSalida(self, habitacion, self.tarifario)
         self.destroy()
 
 
 class VentanaRegistrarSalida(tk.Toplevel):
     """Ventana donde se registra la fecha de salida, días y total a pagar."""
 
-    def __init__(self, master, habitacion):
+    def __init__(self, master, habitacion, tarifario):
         super().__init__(master)
         self.title(f"Registrar salida - Habitación {habitacion.numero}")
         self.habitacion = habitacion
+        self.tarifario = tarifario
         self.fecha_salida = None
 
         self.geometry("430x300")
@@ -327,7 +380,7 @@ class VentanaRegistrarSalida(tk.Toplevel):
             return
 
         dias = (fecha_salida - self.habitacion.fecha_ingreso).days
-        total = dias * self.habitacion.precio_dia
+        total = self.tarifario.total(self.habitacion.tipo, self.habitacion.fecha_ingreso, fecha_salida)
 
         self.fecha_salida = fecha_salida
         self.lbl_dias.config(text=str(dias))
@@ -341,30 +394,368 @@ class VentanaRegistrarSalida(tk.Toplevel):
             messagebox.showerror("Error", "Primero debe calcular el total.")
             return
 
-        self.habitacion.liberar()
+        self.habitacion.liberar(self.fecha_salida)
         messagebox.showinfo("Éxito", "Salida registrada. La habitación ha quedado disponible.")
         self.destroy()
 
 
+class VentanaReservas(tk.Toplevel):
+    """
+    Ventana para buscar habitaciones libres en un rango de fechas y
+    reservarlas, y para ver y cancelar las reservas de una habitación.
+    """
+
+    def __init__(self, master, habitaciones, reservas, tarifario):
+        super().__init__(master)
+        self.title("Reservas")
+        self.habitaciones = habitaciones
+        self.reservas = reservas
+        self.tarifario = tarifario
+        self._habitacion_mostrada = None   # Habitación de la lista de reservas
+
+        self.geometry("520x620")
+        self.resizable(False, False)
+        self.grab_set()
+
+        self._crear_widgets()
+
+    def _crear_widgets(self):
+        frame_fechas = tk.Frame(self, padx=10, pady=10)
+        frame_fechas.pack(fill=tk.X)
+
+        tk.Label(frame_fechas, text="Entrada (AAAA-MM-DD):").grid(row=0, column=0, sticky="w")
+        self.entry_entrada = tk.Entry(frame_fechas, width=12)
+        self.entry_entrada.grid(row=0, column=1, padx=5)
+
+        tk.Label(frame_fechas, text="Salida (AAAA-MM-DD):").grid(row=1, column=0, sticky="w")
+        self.entry_salida = tk.Entry(frame_fechas, width=12)
+        self.entry_salida.grid(row=1, column=1, padx=5)
+
+        btn_buscar = tk.Button(frame_fechas, text="Buscar libres", command=self._buscar_libres)
+        btn_buscar.grid(row=0, column=2, rowspan=2, padx=10)
+
+        columnas = ("numero", "precio", "total")
+        self.tree = ttk.Treeview(self, columns=columnas, show="headings", height=8)
+        self.tree.heading("numero", text="Habitación")
+        self.tree.heading("precio", text="Precio por día")
+        self.tree.heading("total", text="Total estadía")
+        self.tree.column("numero", width=80, anchor="center")
+        self.tree.column("precio", width=120, anchor="e")
+        self.tree.column("total", width=120, anchor="e")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        frame_huesped = tk.Frame(self, padx=10, pady=10)
+        frame_huesped.pack(fill=tk.X)
+
+        tk.Label(frame_huesped, text="Nombre:").grid(row=0, column=0, sticky="w")
+        self.entry_nombre = tk.Entry(frame_huesped)
+        self.entry_nombre.grid(row=0, column=1, sticky="ew")
+
+        tk.Label(frame_huesped, text="Apellidos:").grid(row=1, column=0, sticky="w")
+        self.entry_apellidos = tk.Entry(frame_huesped)
+        self.entry_apellidos.grid(row=1, column=1, sticky="ew")
+
+        tk.Label(frame_huesped, text="Documento:").grid(row=2, column=0, sticky="w")
+        self.entry_documento = tk.Entry(frame_huesped)
+        self.entry_documento.grid(row=2, column=1, sticky="ew")
+
+        frame_huesped.columnconfigure(1, weight=1)
+
+        btn_reservar = tk.Button(frame_huesped, text="Reservar seleccionada", command=self._reservar)
+        btn_reservar.grid(row=3, column=1, sticky="e", pady=(5, 0))
+
+        # Reservas de una habitación
+        frame_consulta = tk.Frame(self, padx=10)
+        frame_consulta.pack(fill=tk.X)
+
+        tk.Label(frame_consulta, text="Habitación:").pack(side=tk.LEFT)
+        self.entry_habitacion = tk.Entry(frame_consulta, width=8)
+        self.entry_habitacion.pack(side=tk.LEFT, padx=5)
+        btn_ver = tk.Button(frame_consulta, text="Ver reservas", command=self._ver_reservas)
+        btn_ver.pack(side=tk.LEFT)
+
+        columnas = ("entrada", "salida", "huesped")
+        self.tree_reservas = ttk.Treeview(self, columns=columnas, show="headings", height=5)
+        self.tree_reservas.heading("entrada", text="Entrada")
+        self.tree_reservas.heading("salida", text="Salida")
+        self.tree_reservas.heading("huesped", text="Huésped")
+        self.tree_reservas.column("entrada", width=90, anchor="center")
+        self.tree_reservas.column("salida", width=90, anchor="center")
+        self.tree_reservas.column("huesped", width=220)
+        self.tree_reservas.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        frame_botones = tk.Frame(self)
+        frame_botones.pack(fill=tk.X, side=tk.BOTTOM, pady=10)
+
+        btn_cancelar = tk.Button(frame_botones, text="Cancelar reserva seleccionada",
+                                 command=self._cancelar_reserva)
+        btn_cancelar.pack(side=tk.RIGHT, padx=5)
+
+        btn_cerrar = tk.Button(frame_botones, text="Cerrar", command=self.destroy)
+        btn_cerrar.pack(side=tk.RIGHT)
+
+    def _parse_fecha(self, texto):
+        try:
+            return dt.datetime.strptime(texto, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+
+    def _leer_rango(self):
+        entrada = self._parse_fecha(self.entry_entrada.get().strip())
+        salida = self._parse_fecha(self.entry_salida.get().strip())
+        if entrada is None or salida is None:
+            messagebox.showerror("Error", "Las fechas no tienen el formato correcto (AAAA-MM-DD).")
+            return None
+        if salida <= entrada:
+            messagebox.showerror("Error", "La fecha de salida debe ser mayor a la fecha de entrada.")
+            return None
+        return entrada, salida
+
+    def _buscar_libres(self):
+        rango = self._leer_rango()
+        if rango is None:
+            return
+
+        # Las habitaciones ocupadas no se ofrecen: la estadía actual no
+        # tiene fecha de salida, así que no se sabe cuándo quedan libres
+        numeros = [hab.numero for hab in self.habitaciones if hab.disponible]
+        libres = [self.habitaciones.buscar(numero) for numero in self.reservas.libres(numeros, *rango)]
+
+        # El total depende solo del tipo de habitación y de las fechas
+        totales = {tipo: self.tarifario.total(tipo, *rango) for tipo in {hab.tipo for hab in libres}}
+
+        self.tree.delete(*self.tree.get_children())
+        for hab in libres:
+            self.tree.insert("", tk.END, values=(hab.numero, f"${hab.precio_dia:,.0f}",
+                                                 f"${totales[hab.tipo]:,.0f}"))
+
+    def _reservar(self):
+        rango = self._leer_rango()
+        if rango is None:
+            return
+
+        seleccion = self.tree.selection()
+        if not seleccion:
+            messagebox.showerror("Error", "Debe seleccionar una habitación libre.")
+            return
+
+        nombre = self.entry_nombre.get().strip()
+        apellidos = self.entry_apellidos.get().strip()
+        documento = self.entry_documento.get().strip()
+        if not nombre or not apellidos or not documento:
+            messagebox.showerror("Error", "Todos los campos del huésped son obligatorios.")
+            return
+
+        numero = int(self.tree.item(seleccion[0], "values")[0])
+        try:
+            self.reservas.reservar(numero, *rango, Huesped(nombre, apellidos, documento))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        messagebox.showinfo("Éxito", f"Habitación {numero} reservada.")
+        self._buscar_libres()
+
+    def _ver_reservas(self):
+        texto = self.entry_habitacion.get().strip()
+        if not texto.isdigit() or self.habitaciones.buscar(int(texto)) is None:
+            messagebox.showerror("Error", "Debe ingresar un número de habitación válido.")
+            return
+        self._mostrar_reservas(int(texto))
+
+    def _mostrar_reservas(self, numero):
+        self._habitacion_mostrada = numero
+        self.tree_reservas.delete(*self.tree_reservas.get_children())
+        for reserva in self.reservas.reservas(numero):
+            huesped = reserva.huesped
+            nombre = f"{huesped.nombre} {huesped.apellidos} ({huesped.documento})" if huesped else ""
+            self.tree_reservas.insert("", tk.END, values=(reserva.entrada.isoformat(),
+                                                          reserva.salida.isoformat(), nombre))
+
+    def _cancelar_reserva(self):
+        numero = self._habitacion_mostrada
+        seleccion = self.tree_reservas.selection()
+        if numero is None or not seleccion:
+            messagebox.showerror("Error", "Debe seleccionar una reserva.")
+            return
+
+        entrada = dt.date.fromisoformat(self.tree_reservas.item(seleccion[0], "values")[0])
+        if not messagebox.askyesno("Confirmar", f"¿Cancelar la reserva de la habitación {numero} "
+                                                f"que empieza el {entrada.isoformat()}?"):
+            return
+        try:
+            self.reservas.cancelar(numero, entrada)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        messagebox.showinfo("Éxito", "Reserva cancelada.")
+        self._mostrar_reservas(numero)
+
+
+class VentanaBuscarHuesped(tk.Toplevel):
+    """Ventana para buscar un huésped por documento o apellidos y ver dónde está alojado."""
+
+    def __init__(self, master, registro):
+        super().__init__(master)
+        self.title("Buscar huésped")
+        self.registro = registro
+
+        self.geometry("480x320")
+        self.resizable(False, False)
+        self.grab_set()
+
+        self._crear_widgets()
+
+    def _crear_widgets(self):
+        frame = tk.Frame(self, padx=10, pady=10)
+        frame.pack(fill=tk.X)
+
+        tk.Label(frame, text="Documento o apellidos:").pack(side=tk.LEFT)
+        self.entry_busqueda = tk.Entry(frame)
+        self.entry_busqueda.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.entry_busqueda.bind("<Return>", lambda e: self._buscar())
+
+        btn_buscar = tk.Button(frame, text="Buscar", command=self._buscar)
+        btn_buscar.pack(side=tk.LEFT)
+
+        self.txt_resultado = tk.Text(self, height=12, state=tk.DISABLED)
+        self.txt_resultado.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def _describir(self, huesped):
+        lineas = [f"{huesped.nombre} {huesped.apellidos} - Documento: {huesped.documento}"]
+        ubicacion = self.registro.ubicacion(huesped.documento)
+        if ubicacion is not None:
+            numero, fecha_ingreso = ubicacion
+            lineas.append(f"  Alojado en la habitación {numero} desde {fecha_ingreso.isoformat()}")
+        else:
+            lineas.append("  No está alojado en el hotel")
+        for estadia in self.registro.historial(huesped.documento):
+            salida = estadia.fecha_salida.isoformat() if estadia.fecha_salida else "-"
+            lineas.append(f"  Habitación {estadia.numero}: "
+                          f"{estadia.fecha_ingreso.isoformat()} a {salida}")
+        return "\n".join(lineas)
+
+    def _buscar(self):
+        texto = self.entry_busqueda.get().strip()
+        if not texto:
+            messagebox.showerror("Error", "Debe ingresar un documento o unos apellidos.")
+            return
+
+        huesped = self.registro.buscar(texto)
+        encontrados = [huesped] if huesped is not None else self.registro.buscar_por_apellidos(texto)
+
+        self.txt_resultado.config(state=tk.NORMAL)
+        self.txt_resultado.delete("1.0", tk.END)
+        if encontrados:
+            self.txt_resultado.insert(tk.END, "\n\n".join(self._describir(h) for h in encontrados))
+        else:
+            self.txt_resultado.insert(tk.END, "No se encontraron huéspedes.")
+        self.txt_resultado.config(state=tk.DISABLED)
+
+
+class VentanaEstadisticas(tk.Toplevel):
+    """Ventana con ocupación, ADR, RevPAR y duración de las estadías en un período."""
+
+    def __init__(self, master, analitica):
+        super().__init__(master)
+        self.title("Estadísticas")
+        self.analitica = analitica
+
+        self.geometry("480x400")
+        self.resizable(False, False)
+        self.grab_set()
+
+        self._crear_widgets()
+
+    def _crear_widgets(self):
+        frame = tk.Frame(self, padx=10, pady=10)
+        frame.pack(fill=tk.X)
+
+        hoy = dt.date.today()
+        tk.Label(frame, text="Desde (AAAA-MM-DD):").grid(row=0, column=0, sticky="w")
+        self.entry_desde = tk.Entry(frame, width=12)
+        self.entry_desde.insert(0, hoy.replace(day=1).isoformat())
+        self.entry_desde.grid(row=0, column=1, padx=5)
+
+        tk.Label(frame, text="Hasta (AAAA-MM-DD):").grid(row=1, column=0, sticky="w")
+        self.entry_hasta = tk.Entry(frame, width=12)
+        self.entry_hasta.insert(0, (hoy + dt.timedelta(days=1)).isoformat())
+        self.entry_hasta.grid(row=1, column=1, padx=5)
+
+        btn_calcular = tk.Button(frame, text="Calcular", command=self._calcular)
+        btn_calcular.grid(row=0, column=2, rowspan=2, padx=10)
+
+        self.txt_resultado = tk.Text(self, height=16, state=tk.DISABLED)
+        self.txt_resultado.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def _parse_fecha(self, texto):
+        try:
+            return dt.datetime.strptime(texto, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+
+    def _calcular(self):
+        desde = self._parse_fecha(self.entry_desde.get().strip())
+        hasta = self._parse_fecha(self.entry_hasta.get().strip())
+        if desde is None or hasta is None:
+            messagebox.showerror("Error", "Las fechas no tienen el formato correcto (AAAA-MM-DD).")
+            return
+        if hasta <= desde:
+            messagebox.showerror("Error", "La fecha final debe ser mayor a la fecha inicial.")
+            return
+
+        resumen = self.analitica.resumen(desde, hasta)
+        lineas = [
+            f"Estadías registradas: {len(self.analitica)}",
+            f"Noches vendidas: {resumen.noches_vendidas} de {resumen.noches_disponibles}",
+            f"Ocupación: {resumen.ocupacion:.1%}",
+            f"Ingresos: ${resumen.ingresos:,.0f}",
+            f"ADR (tarifa diaria promedio): ${resumen.adr:,.0f}",
+            f"RevPAR: ${resumen.revpar:,.0f}",
+            "",
+            "Duración de las estadías que ingresaron en el período:",
+        ]
+        distribucion = self.analitica.distribucion_estadias(desde, hasta)
+        for noches, cantidad in distribucion.items():
+            lineas.append(f"  {noches} noche(s): {cantidad}")
+        if not distribucion:
+            lineas.append("  Sin estadías")
+
+        self.txt_resultado.config(state=tk.NORMAL)
+        self.txt_resultado.delete("1.0", tk.END)
+        self.txt_resultado.insert(tk.END, "\n".join(lineas))
+        self.txt_resultado.config(state=tk.DISABLED)
+
+
 class HotelApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, carpeta_datos=None, tarifario=None):
         super().__init__()
         self.title("Gestión de Hotel")
         self.geometry("600x400")
         self.resizable(True, True)
 
-        self.habitaciones = []
-        self._crear_habitaciones()
+        self.habitaciones = InventarioHabitaciones(habitaciones_del_hotel())
+        self.reservas = CalendarioReservas()
+        # Sin archivo de tarifas, cada noche cuesta el precio base del tipo
+        self.tarifario = tarifario or Tarifario(PRECIOS_POR_TIPO)
+        self.registro = RegistroHuespedes(self.habitaciones)
+        self.analitica = AnaliticaHotel(len(self.habitaciones), self.habitaciones, self.tarifario)
+
+        # Con una carpeta de datos, los ingresos y salidas se guardan en una
+        # bitácora y se recuperan al volver a abrir la aplicación
+        self.bitacora = None
+        if carpeta_datos:
+            self.bitacora = Bitacora(carpeta_datos, self.habitaciones)
+        self.protocol("WM_DELETE_WINDOW", self._salir)
+
         self._crear_menu()
         self._crear_contenido_principal()
 
-    def _crear_habitaciones(self):
-        # Habitaciones 1 a 5 -> $120 000
-        for i in range(1, 6):
-            self.habitaciones.append(Habitacion(i, 120000))
-        # Habitaciones 6 a 10 -> $160 000
-        for i in range(6, 11):
-            self.habitaciones.append(Habitacion(i, 160000))
+    def _salir(self):
+        if self.bitacora is not None:
+            self.bitacora.cerrar()
+        self.destroy()
 
     def _crear_menu(self):
         menubar = tk.Menu(self)
@@ -372,6 +763,11 @@ class HotelApp(tk.Tk):
         menu_opciones = tk.Menu(menubar, tearoff=0)
         menu_opciones.add_command(label="Consultar habitaciones", command=self._abrir_consulta_habitaciones)
         menu_opciones.add_command(label="Salida de huéspedes", command=self._abrir_salida_huespedes)
+        menu_opciones.add_command(label="Reservas", command=self._abrir_reservas)
+        menu_opciones.add_command(label="Buscar huésped", command=self._abrir_buscar_huesped)
+        menu_opciones.add_separator()
+        menu_opciones.add_command(label="Auditoría nocturna", command=self._auditoria_nocturna)
+        menu_opciones.add_command(label="Estadísticas", command=self._abrir_estadisticas)
 
         menubar.add_cascade(label="Opciones", menu=menu_opciones)
         self.config(menu=menubar)
@@ -383,19 +779,65 @@ class HotelApp(tk.Tk):
                 "Bienvenido al sistema de gestión del hotel.\n\n"
                 "Use el menú 'Opciones' para:\n"
                 " - Consultar habitaciones e ingresar huéspedes\n"
-                " - Registrar la salida de huéspedes"
+                " - Registrar la salida de huéspedes\n"
+                " - Reservar habitaciones para fechas futuras"
             ),
             justify="center"
         )
         lbl.pack(expand=True)
 
     def _abrir_consulta_habitaciones(self):
-        VentanaHabitaciones(self, self.habitaciones)
+        VentanaHabitaciones(self, self.habitaciones, self.reservas, self.registro)
 
     def _abrir_salida_huespedes(self):
-        VentanaSalidaSeleccion(self, self.habitaciones)
+        VentanaSalidaSeleccion(self, self.habitaciones, self.tarifario)
+
+    def _abrir_reservas(self):
+        VentanaReservas(self, self.habitaciones, self.reservas, self.tarifario)
+
+    def _abrir_buscar_huesped(self):
+        VentanaBuscarHuesped(self, self.registro)
+
+    def _abrir_estadisticas(self):
+        VentanaEstadisticas(self, self.analitica)
+
+    def _auditoria_nocturna(self):
+        fecha = dt.date.today()
+        ruta = filedialog.asksaveasfilename(
+            title="Guardar auditoría nocturna",
+            defaultextension=".txt",
+            initialfile=f"Auditoría_{fecha.isoformat()}.txt",
+            filetypes=[("Archivo de texto", "*.txt")]
+        )
+        if not ruta:
+            return
+
+        resultado = auditoria_nocturna(self.habitaciones, self.tarifario, fecha)
+        try:
+            escribir_auditoria(resultado, ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"Error al guardar la auditoría:\n{e}")
+            return
+        messagebox.showinfo(
+            "Auditoría nocturna",
+            f"Habitaciones ocupadas: {len(resultado)} de {resultado.total_habitaciones}\n"
+            f"Ingreso proyectado de la noche: ${resultado.ingreso_proyectado:,.0f}\n"
+            f"Cargos acumulados: ${resultado.cargos_acumulados:,.0f}"
+        )
 
 
 if __name__ == "__main__":
-    app = HotelApp()
+    parser = argparse.ArgumentParser(description="Gestión de Hotel")
+    parser.add_argument("--datos", help="carpeta donde se guarda la bitácora de ingresos y salidas")
+    parser.add_argument("--tarifas", help="archivo JSON con temporadas y factores por día de la semana")
+    args = parser.parse_args()
+
+    tarifario = None
+    if args.tarifas:
+        try:
+            tarifario = cargar_tarifario(args.tarifas, PRECIOS_POR_TIPO)
+        except (OSError, ValueError) as e:
+            parser.error(f"no se pudo leer el archivo de tarifas: {e}")
+
+    app = HotelApp(carpeta_datos=args.datos, tarifario=tarifario)
     app.mainloop()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Indicadores de ocupación e ingresos sobre el historial de estadías.
+
+Las estadías terminadas se guardan en arreglos paralelos (habitación,
+ordinales de ingreso y salida, total). Además, al registrar cada estadía se
+suman sus noches a dos arreglos por día (habitaciones ocupadas e ingresos)
+y su largo a un histograma por día de ingreso; solo cambian los días de esa
+estadía. Las consultas por rango de fechas usan los acumulados de los
+arreglos por día, que se rehacen a partir de ellos (no del historial) la
+primera vez que se consultan después de un cambio.
+
+Indicadores:
+    ocupación  habitaciones-noche vendidas / habitaciones-noche disponibles
+    ADR        ingreso / habitaciones-noche vendidas (tarifa diaria promedio)
+    RevPAR     ingreso / habitaciones-noche disponibles
+"""
+import datetime as dt
+import threading
+from array import array
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+class ResumenPeriodo:
+    __slots__ = ("desde", "hasta", "noches_vendidas", "noches_disponibles", "ingresos")
+
+    def __init__(self, desde, hasta, noches_vendidas, noches_disponibles, ingresos):
+        self.desde = desde
+        self.hasta = hasta
+        self.noches_vendidas = noches_vendidas
+        self.noches_disponibles = noches_disponibles
+        self.ingresos = ingresos
+
+    @property
+    def ocupacion(self):
+        return self.noches_vendidas / self.noches_disponibles if self.noches_disponibles else 0.0
+
+    @property
+    def adr(self):
+        return self.ingresos / self.noches_vendidas if self.noches_vendidas else 0.0
+
+    @property
+    def revpar(self):
+        return self.ingresos / self.noches_disponibles if self.noches_disponibles else 0.0
+
+
+class AnaliticaHotel:
+    """
+    Historial de estadías y consultas de indicadores.
+
+    Si se indican inventario y tarifario, se suscribe al inventario y
+    registra sola cada estadía que termina con fecha de salida, con el total
+    que da el tarifario.
+    """
+
+    def __init__(self, total_habitaciones, inventario=None, tarifario=None):
+        self.total_habitaciones = total_habitaciones
+        self.tarifario = tarifario
+        self._candado = threading.Lock()
+        self._numeros = array("q")
+        self._documentos = []
+        self._ingresos = array("q")      # ordinales de las fechas de ingreso
+        self._salidas = array("q")       # ordinales de las fechas de salida
+        self._totales = array("d")
+        self._abiertas = {}              # número -> fecha de ingreso de la estadía en curso
+        # Valores por día desde el ordinal _origen y, por día de ingreso,
+        # {noches: cantidad de estadías}
+        self._origen = 0
+        self._vendidas_dia = array("q")
+        self._ingreso_dia = array("d")
+        self._noches_por_ingreso = {}
+        self._acumulados = None
+        if inventario is not None:
+            inventario.suscribir(self._al_cambiar)
+
+    def __len__(self):
+        return len(self._numeros)
+
+    def registrar_estadia(self, numero, documento, fecha_ingreso, fecha_salida, total):
+        if fecha_salida <= fecha_ingreso:
+            raise ValueError("La fecha de salida debe ser mayor a la fecha de ingreso.")
+        entrada, salida = fecha_ingreso.toordinal(), fecha_salida.toordinal()
+        with self._candado:
+            self._numeros.append(numero)
+            self._documentos.append(documento)
+            self._ingresos.append(entrada)
+            self._salidas.append(salida)
+            self._totales.append(total)
+
+            self._cubrir(entrada, salida)
+            por_noche = total / (salida - entrada)
+            vendidas, ingreso = self._vendidas_dia, self._ingreso_dia
+            for i in range(entrada - self._origen, salida - self._origen):
+                vendidas[i] += 1
+                ingreso[i] += por_noche
+            histograma = self._noches_por_ingreso.setdefault(entrada, {})
+            histograma[salida - entrada] = histograma.get(salida - entrada, 0) + 1
+            self._acumulados = None   # Los acumulados se rehacen en la próxima consulta
+
+    def _al_cambiar(self, evento, habitacion, huesped, fecha):
+        if evento == "ocupar":
+            self._abiertas[habitacion.numero] = fecha
+            return
+        fecha_ingreso = self._abiertas.pop(habitacion.numero, None)
+        if fecha_ingreso is None or fecha is None or fecha <= fecha_ingreso:
+            return
+        total = self.tarifario.total(habitacion.tipo, fecha_ingreso, fecha) if self.tarifario else 0
+        self.registrar_estadia(habitacion.numero, huesped.documento, fecha_ingreso, fecha, total)
+
+    # ----- Valores y acumulados por día -----
+
+    # Días de más que se agregan al ampliar los arreglos por día
+    MARGEN_DIAS = 366
+
+    def _cubrir(self, entrada, salida):
+        """Amplía los arreglos por día (con el candado tomado) para cubrir [entrada, salida)."""
+        if not self._vendidas_dia:
+            self._origen = entrada - self.MARGEN_DIAS
+            largo = salida - self._origen + self.MARGEN_DIAS
+            self._vendidas_dia = array("q", bytes(8 * largo))
+            self._ingreso_dia = array("d", bytes(8 * largo))
+            return
+        # Se amplía al menos al doble para que ampliar cueste O(1) amortizado
+        faltan = self._origen - entrada
+        if faltan > 0:
+            extra = max(faltan, self.MARGEN_DIAS, len(self._vendidas_dia))
+            self._vendidas_dia = array("q", bytes(8 * extra)) + self._vendidas_dia
+            self._ingreso_dia = array("d", bytes(8 * extra)) + self._ingreso_dia
+            self._origen -= extra
+        faltan = salida - (self._origen + len(self._vendidas_dia))
+        if faltan > 0:
+            extra = max(faltan, self.MARGEN_DIAS, len(self._vendidas_dia))
+            self._vendidas_dia.frombytes(bytes(8 * extra))
+            self._ingreso_dia.frombytes(bytes(8 * extra))
+
+    def _calcular_acumulados(self):
+        """
+        (origen, vendidas, ingresos): acumulado[i] es la suma de los días
+        anteriores al día origen + i. El ingreso de cada estadía se reparte
+        en partes iguales entre sus noches.
+        """
+        if not self._numeros:
+            return 0, [0], [0.0]
+        if np is not None:
+            vendidas = np.concatenate(([0], np.cumsum(np.frombuffer(self._vendidas_dia, dtype=np.int64))))
+            ingreso = np.concatenate(([0.0], np.cumsum(np.frombuffer(self._ingreso_dia, dtype=np.float64))))
+            return self._origen, vendidas, ingreso
+        vendidas = [0] + list(accumulate(self._vendidas_dia))
+        ingreso = [0.0] + list(accumulate(self._ingreso_dia))
+        return self._origen, vendidas, ingreso
+
+    def _acumulados_por_dia(self):
+        with self._candado:
+            if self._acumulados is None:
+                self._acumulados = self._calcular_acumulados()
+            return self._acumulados
+
+    @staticmethod
+    def _posicion(fecha, origen, largo):
+        return min(max(fecha.toordinal() - origen, 0), largo - 1)
+
+    # ----- Consultas -----
+
+    def resumen(self, desde, hasta):
+        """Ocupación, ADR y RevPAR de las noches [desde, hasta)."""
+        if hasta <= desde:
+            raise ValueError("La fecha final debe ser mayor a la fecha inicial.")
+        origen, vendidas, ingreso = self._acumulados_por_dia()
+        a = self._posicion(desde, origen, len(vendidas))
+        b = self._posicion(hasta, origen, len(vendidas))
+        return ResumenPeriodo(desde, hasta, int(vendidas[b] - vendidas[a]),
+                              self.total_habitaciones * (hasta - desde).days,
+                              float(ingreso[b] - ingreso[a]))
+
+    def ocupacion_diaria(self, desde, hasta):
+        """Lista de (fecha, tasa de ocupación) de cada noche en [desde, hasta)."""
+        if hasta <= desde:
+            raise ValueError("La fecha final debe ser mayor a la fecha inicial.")
+        origen, vendidas, _ = self._acumulados_por_dia()
+        largo = len(vendidas)
+        if np is not None and self.total_habitaciones:
+            posiciones = np.clip(np.arange(desde.toordinal(), hasta.toordinal() + 1) - origen, 0, largo - 1)
+            tasas = np.diff(np.asarray(vendidas)[posiciones]) / self.total_habitaciones
+            return [(desde + dt.timedelta(days=i), float(tasa)) for i, tasa in enumerate(tasas)]
+        resultado = []
+        for i in range((hasta - desde).days):
+            fecha = desde + dt.timedelta(days=i)
+            a = self._posicion(fecha, origen, largo)
+            b = self._posicion(fecha + dt.timedelta(days=1), origen, largo)
+            tasa = (vendidas[b] - vendidas[a]) / self.total_habitaciones if self.total_habitaciones else 0.0
+            resultado.append((fecha, float(tasa)))
+        return resultado
+
+    def distribucion_estadias(self, desde, hasta):
+        """{noches: cantidad de estadías} de las estadías con ingreso en [desde, hasta)."""
+        a, b = desde.toordinal(), hasta.toordinal()
+        with self._candado:
+            por_ingreso = self._noches_por_ingreso
+            # Se recorre lo más corto: los días del rango o los días con ingresos
+            if b - a <= len(por_ingreso):
+                dias = [dia for dia in range(a, b) if dia in por_ingreso]
+            else:
+                dias = [dia for dia in por_ingreso if a <= dia < b]
+            distribucion = {}
+            for dia in dias:
+                for noches, cantidad in por_ingreso[dia].items():
+                    distribucion[noches] = distribucion.get(noches, 0) + cantidad
+            return dict(sorted(distribucion.items()))
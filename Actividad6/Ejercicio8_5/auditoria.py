@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Auditoría nocturna: cargos de todas las habitaciones ocupadas en una pasada.
+
+Se toman juntos los datos de las habitaciones ocupadas (número, tipo y
+ordinal de la fecha de ingreso) en arreglos, y con las tablas acumuladas del
+tarifario se calculan de una vez, por tipo de habitación, las noches, los
+cargos acumulados hasta la noche auditada y la tarifa de esa noche. El
+resultado se escribe en un archivo de texto.
+"""
+import datetime as dt
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+SEPARADOR = "------------------------------------------------------\n"
+TAMANO_BLOQUE = 10000          # habitaciones por bloque de texto
+TAMANO_BUFFER = 1 << 20        # 1 MiB
+
+
+class ResultadoAuditoria:
+    """
+    Cargos de las habitaciones ocupadas la noche de fecha, en arreglos
+    paralelos ordenados por número de habitación.
+    """
+
+    def __init__(self, fecha, total_habitaciones, numeros, documentos, ingresos,
+                 noches, acumulados, tarifas_noche):
+        self.fecha = fecha
+        self.total_habitaciones = total_habitaciones
+        self.numeros = numeros
+        self.documentos = documentos
+        self.ingresos = ingresos            # ordinales de las fechas de ingreso
+        self.noches = noches
+        self.acumulados = acumulados
+        self.tarifas_noche = tarifas_noche
+
+    def __len__(self):
+        return len(self.numeros)
+
+    @property
+    def cargos_acumulados(self):
+        return int(sum(self.acumulados))
+
+    @property
+    def ingreso_proyectado(self):
+        """Ingreso por habitaciones de la noche auditada."""
+        return int(sum(self.tarifas_noche))
+
+    @property
+    def ocupacion(self):
+        return len(self) / self.total_habitaciones if self.total_habitaciones else 0.0
+
+
+def _datos_ocupadas(inventario, fecha):
+    """Número, tipo, documento e ingreso de las ocupadas, tomados bajo el candado."""
+    with inventario._candado:
+        ocupadas = sorted((h for h in inventario if not h.disponible and h.fecha_ingreso <= fecha),
+                          key=lambda h: h.numero)
+        return (len(inventario),
+                array("q", [h.numero for h in ocupadas]),
+                [h.tipo for h in ocupadas],
+                [h.huesped.documento for h in ocupadas],
+                array("q", [h.fecha_ingreso.toordinal() for h in ocupadas]))
+
+
+def auditoria_nocturna(inventario, tarifario, fecha):
+    """
+    Calcula, para cada habitación ocupada la noche de fecha: noches
+    alojadas contando esa noche, cargos acumulados desde el ingreso hasta esa
+    noche incluida y la tarifa de esa noche.
+    """
+    total, numeros, tipos, documentos, ingresos = _datos_ocupadas(inventario, fecha)
+    n = len(numeros)
+    manana = fecha + dt.timedelta(days=1)
+    fin = manana.toordinal()
+
+    if np is not None:
+        entradas = np.frombuffer(ingresos, dtype=np.int64) if n else np.zeros(0, dtype=np.int64)
+        tipos_arr = np.array(tipos, dtype=object)
+        acumulados = np.zeros(n, dtype=np.int64)
+        tarifas_noche = np.zeros(n, dtype=np.int64)
+        desde = dt.date.fromordinal(int(entradas.min())) if n else fecha
+        for tipo in set(tipos):
+            tabla, origen = tarifario.tabla_acumulada(tipo, desde, manana)
+            tabla = np.frombuffer(tabla, dtype=np.int64)
+            filas = tipos_arr == tipo
+            acumulados[filas] = tabla[fin - origen] - tabla[entradas[filas] - origen]
+            tarifas_noche[filas] = tabla[fin - origen] - tabla[fin - 1 - origen]
+        noches = fin - entradas
+        return ResultadoAuditoria(fecha, total, numeros, documentos, ingresos,
+                                  noches.tolist(), acumulados.tolist(), tarifas_noche.tolist())
+
+    desde = dt.date.fromordinal(min(ingresos)) if n else fecha
+    tablas = {tipo: tarifario.tabla_acumulada(tipo, desde, manana) for tipo in set(tipos)}
+    acumulados, tarifas_noche = [], []
+    for tipo, entrada in zip(tipos, ingresos):
+        tabla, origen = tablas[tipo]
+        acumulados.append(tabla[fin - origen] - tabla[entrada - origen])
+        tarifas_noche.append(tabla[fin - origen] - tabla[fin - 1 - origen])
+    noches = [fin - entrada for entrada in ingresos]
+    return ResultadoAuditoria(fecha, total, numeros, documentos, ingresos,
+                              noches, acumulados, tarifas_noche)
+
+
+def _bloques(resultado, tam_bloque):
+    for inicio in range(0, len(resultado), tam_bloque):
+        fin = min(inicio + tam_bloque, len(resultado))
+        yield "".join(
+            f"Habitación: {numero} | Documento: {documento} | "
+            f"Ingreso: {dt.date.fromordinal(ingreso).isoformat()} | Noches: {noches} | "
+            f"Tarifa noche: {tarifa:.0f} | Cargos acumulados: {acumulado:.0f}\n"
+            for numero, documento, ingreso, noches, tarifa, acumulado in zip(
+                resultado.numeros[inicio:fin], resultado.documentos[inicio:fin],
+                resultado.ingresos[inicio:fin], resultado.noches[inicio:fin],
+                resultado.tarifas_noche[inicio:fin], resultado.acumulados[inicio:fin])
+        )
+
+
+def escribir_auditoria(resultado, ruta, tam_bloque=TAMANO_BLOQUE):
+    """Escribe el reporte de la auditoría en la ruta indicada."""
+    with open(ruta, "w", encoding="utf-8", buffering=TAMANO_BUFFER) as f:
+        f.write(f"AUDITORÍA NOCTURNA {resultado.fecha.isoformat()}\n")
+        f.write(SEPARADOR)
+        for bloque in _bloques(resultado, tam_bloque):
+            f.write(bloque)
+        f.write(SEPARADOR)
+        f.write(f"HABITACIONES OCUPADAS: {len(resultado)} de {resultado.total_habitaciones} "
+                f"({resultado.ocupacion:.1%})\n")
+        f.write(f"INGRESO PROYECTADO DE LA NOCHE: {resultado.ingreso_proyectado:.0f}\n")
+        f.write(f"CARGOS ACUMULADOS: {resultado.cargos_acumulados:.0f}\n")
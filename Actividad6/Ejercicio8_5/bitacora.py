@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Bitácora de eventos del hotel para no perder el estado al reiniciar.
+
+Cada ingreso o salida se agrega como una línea JSON al final de
+bitacora.jsonl, con un número de secuencia. Las escrituras se sincronizan
+con el disco (fsync) por lotes, desde un hilo, para no pagar un fsync por
+evento. Cada cierto número de eventos se guarda una instantánea compacta del
+estado de todas las habitaciones y la bitácora vuelve a empezar vacía, así
+que al arrancar solo se reproducen los eventos posteriores a la última
+instantánea.
+"""
+import datetime as dt
+import json
+import os
+import threading
+
+from hotel import Huesped
+
+NOMBRE_BITACORA = "bitacora.jsonl"
+NOMBRE_INSTANTANEA = "instantanea.json"
+
+
+def _huesped_a_dict(huesped):
+    return {"nombre": huesped.nombre, "apellidos": huesped.apellidos,
+            "documento": huesped.documento}
+
+
+def _aplicar(inventario, evento, numero, huesped, fecha):
+    """Repite un ingreso (huesped es un dict) o una salida sobre el inventario."""
+    habitacion = inventario.buscar(numero)
+    if habitacion is None:
+        return
+    if evento == "liberar":
+        habitacion.liberar(dt.date.fromisoformat(fecha) if fecha else None)
+    else:
+        habitacion.ocupar(Huesped(huesped["nombre"], huesped["apellidos"], huesped["documento"]),
+                          dt.date.fromisoformat(fecha))
+
+
+class Bitacora:
+    """
+    Registra los cambios de un InventarioHabitaciones en una carpeta.
+
+    Al crearla se recupera el estado guardado (instantánea más bitácora) y
+    luego se suscribe al inventario. Hay que llamar a cerrar() al salir para
+    sincronizar los últimos eventos.
+    """
+
+    def __init__(self, carpeta, inventario, eventos_por_instantanea=1000, intervalo_fsync=0.2):
+        os.makedirs(carpeta, exist_ok=True)
+        self.ruta_bitacora = os.path.join(carpeta, NOMBRE_BITACORA)
+        self.ruta_instantanea = os.path.join(carpeta, NOMBRE_INSTANTANEA)
+        self.inventario = inventario
+        self.eventos_por_instantanea = eventos_por_instantanea
+        self.intervalo_fsync = intervalo_fsync
+
+        self._candado = threading.Lock()
+        self._secuencia = 0
+        self._desde_instantanea = 0
+        self._sin_sincronizar = False
+
+        self.recuperados = self._recuperar()
+        self._archivo = open(self.ruta_bitacora, "a", encoding="utf-8")
+
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+        self._hilo.start()
+        inventario.suscribir(self._registrar)
+
+    # ----- Recuperación -----
+
+    def _recuperar(self):
+        """Carga la instantánea y reproduce la cola de la bitácora. Devuelve
+        la cantidad de eventos reproducidos."""
+        if os.path.exists(self.ruta_instantanea):
+            with open(self.ruta_instantanea, encoding="utf-8") as f:
+                instantanea = json.load(f)
+            self._secuencia = instantanea["secuencia"]
+            for estado in instantanea["habitaciones"]:
+                if estado["huesped"] is not None:
+                    _aplicar(self.inventario, "ocupar", estado["numero"], estado["huesped"], estado["fecha"])
+
+        reproducidos = 0
+        if os.path.exists(self.ruta_bitacora):
+            with open(self.ruta_bitacora, "r+b") as f:
+                valido = 0   # Bytes hasta el final de la última línea completa
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break   # Última línea a medio escribir por un cierre abrupto
+                    try:
+                        evento = json.loads(linea)
+                    except ValueError:
+                        break
+                    valido += len(linea)
+                    if evento["secuencia"] <= self._secuencia:
+                        continue   # Ya incluido en la instantánea
+                    _aplicar(self.inventario, evento["evento"], evento["numero"],
+                             evento["huesped"], evento["fecha"])
+                    self._secuencia = evento["secuencia"]
+                    reproducidos += 1
+                # Se corta el resto para que los eventos nuevos no queden
+                # pegados a la línea rota (y se pierdan en la próxima recuperación)
+                f.truncate(valido)
+        self._desde_instantanea = reproducidos
+        return reproducidos
+
+    # ----- Registro -----
+
+    def _registrar(self, evento, habitacion, huesped, fecha):
+        # Se llama dentro del candado del inventario, en el orden de los cambios
+        with self._candado:
+            self._secuencia += 1
+            linea = json.dumps({
+                "secuencia": self._secuencia,
+                "evento": evento,
+                "numero": habitacion.numero,
+                "huesped": _huesped_a_dict(huesped),
+                "fecha": fecha.isoformat() if fecha else None,
+            }, ensure_ascii=False)
+            self._archivo.write(linea + "\n")
+            self._sin_sincronizar = True
+            self._desde_instantanea += 1
+            if self._desde_instantanea >= self.eventos_por_instantanea:
+                self._guardar_instantanea()
+
+    def _sincronizar(self):
+        if self._sin_sincronizar:
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._sin_sincronizar = False
+
+    def _sincronizar_periodicamente(self):
+        while not self._detener.wait(self.intervalo_fsync):
+            with self._candado:
+                if not self._archivo.closed:
+                    self._sincronizar()
+
+    def _guardar_instantanea(self):
+        """Escribe el estado completo y vacía la bitácora (con el candado tomado)."""
+        estado = {
+            "secuencia": self._secuencia,
+            "habitaciones": [
+                {"numero": h.numero,
+                 "huesped": None if h.disponible else _huesped_a_dict(h.huesped),
+                 "fecha": None if h.disponible else h.fecha_ingreso.isoformat()}
+                for h in self.inventario
+            ],
+        }
+        temporal = self.ruta_instantanea + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.ruta_instantanea)
+
+        # Si se corta aquí, los eventos viejos de la bitácora se saltan al
+        # recuperar porque su secuencia ya está en la instantánea
+        self._archivo.close()
+        self._archivo = open(self.ruta_bitacora, "w", encoding="utf-8")
+        self._sin_sincronizar = False
+        self._desde_instantanea = 0
+
+    def instantanea(self):
+        """Fuerza una instantánea (por ejemplo, antes de copiar la carpeta)."""
+        with self.inventario._candado, self._candado:
+            self._guardar_instantanea()
+
+    def cerrar(self):
+        self.inventario.desuscribir(self._registrar)
+        self._detener.set()
+        self._hilo.join()
+        with self._candado:
+            self._sincronizar()
+            self._archivo.close()
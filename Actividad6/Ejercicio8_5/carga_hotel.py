@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Generador de carga para el servidor del hotel.
+
+Abre varias conexiones a la vez y manda una mezcla de ingresos, salidas y
+consultas durante un tiempo fijo. Al final informa las peticiones por
+segundo y la latencia (p50, p99 y máxima) de cada operación.
+
+Uso:
+    python carga_hotel.py [--puerto 8765] [--clientes 50] [--segundos 10]
+    python carga_hotel.py --local       # levanta un servidor en el mismo proceso
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+import random
+import time
+
+from servidor_hotel import PUERTO, ServicioHotel, iniciar_servidor
+
+# Proporción de cada operación en el tráfico generado
+MEZCLA = (
+    ("consultar", 0.35),
+    ("libres", 0.15),
+    ("libres_fechas", 0.10),
+    ("ingreso", 0.20),
+    ("salida", 0.20),
+)
+
+
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _peticion(azar, op, habitaciones, cliente, i):
+    numero = azar.randint(1, habitaciones)
+    fecha = dt.date(2024, 1, 1) + dt.timedelta(days=azar.randint(0, 365))
+    if op == "consultar":
+        return {"op": op, "numero": numero}
+    if op == "libres":
+        return {"op": op}
+    if op == "libres_fechas":
+        return {"op": op, "entrada": fecha.isoformat(),
+                "salida": (fecha + dt.timedelta(days=azar.randint(1, 7))).isoformat()}
+    if op == "ingreso":
+        return {"op": op, "numero": numero, "nombre": "Cliente", "apellidos": f"Carga {cliente}",
+                "documento": f"{cliente}-{i}", "fecha": fecha.isoformat()}
+    return {"op": op, "numero": numero}
+
+
+async def _cliente(host, puerto, cliente, habitaciones, hasta, latencias, rechazos):
+    azar = random.Random(cliente)
+    operaciones = [op for op, _ in MEZCLA]
+    pesos = [peso for _, peso in MEZCLA]
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    i = 0
+    try:
+        while time.perf_counter() < hasta:
+            op = azar.choices(operaciones, pesos)[0]
+            linea = json.dumps(_peticion(azar, op, habitaciones, cliente, i)).encode("utf-8") + b"\n"
+            inicio = time.perf_counter()
+            escritor.write(linea)
+            await escritor.drain()
+            respuesta = json.loads(await lector.readline())
+            latencias[op].append(time.perf_counter() - inicio)
+            if not respuesta["ok"]:
+                rechazos[op] += 1   # Habitación ocupada, ya libre, etc.
+            i += 1
+    finally:
+        escritor.close()
+        await escritor.wait_closed()
+
+
+async def generar_carga(host, puerto, clientes, segundos, habitaciones):
+    """Corre la carga y devuelve (latencias por operación, rechazos, segundos)."""
+    latencias = {op: [] for op, _ in MEZCLA}
+    rechazos = {op: 0 for op, _ in MEZCLA}
+    inicio = time.perf_counter()
+    hasta = inicio + segundos
+    await asyncio.gather(*(_cliente(host, puerto, c, habitaciones, hasta, latencias, rechazos)
+                           for c in range(clientes)))
+    return latencias, rechazos, time.perf_counter() - inicio
+
+
+def informar(latencias, rechazos, segundos):
+    total = sum(len(valores) for valores in latencias.values())
+    print(f"{total} peticiones en {segundos:.2f} s: {total / segundos:,.0f} peticiones/s")
+    print(f"{'operación':<15}{'cantidad':>10}{'rechazos':>10}{'p50 ms':>10}{'p99 ms':>10}{'máx ms':>10}")
+    todas = []
+    for op, valores in latencias.items():
+        ordenados = sorted(valores)
+        todas += ordenados
+        print(f"{op:<15}{len(ordenados):>10}{rechazos[op]:>10}"
+              f"{_percentil(ordenados, 50) * 1000:>10.2f}{_percentil(ordenados, 99) * 1000:>10.2f}"
+              f"{(ordenados[-1] if ordenados else 0) * 1000:>10.2f}")
+    todas.sort()
+    print(f"{'total':<15}{len(todas):>10}{sum(rechazos.values()):>10}"
+          f"{_percentil(todas, 50) * 1000:>10.2f}{_percentil(todas, 99) * 1000:>10.2f}"
+          f"{(todas[-1] if todas else 0) * 1000:>10.2f}")
+
+
+async def _principal(args):
+    servidor = None
+    if args.local:
+        servidor = await iniciar_servidor(ServicioHotel(cantidad_habitaciones=args.habitaciones),
+                                          args.host, 0)
+        args.puerto = servidor.sockets[0].getsockname()[1]
+    try:
+        informar(*await generar_carga(args.host, args.puerto, args.clientes,
+                                      args.segundos, args.habitaciones))
+    finally:
+        if servidor is not None:
+            servidor.close()
+            await servidor.wait_closed()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor del hotel.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--clientes", type=int, default=50, help="conexiones simultáneas")
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--habitaciones", type=int, default=10,
+                        help="habitaciones del hotel (las mismas que tenga el servidor)")
+    parser.add_argument("--local", action="store_true",
+                        help="levanta el servidor en este mismo proceso")
+    args = parser.parse_args(argv)
+    asyncio.run(_principal(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo de dominio del hotel: huéspedes, habitaciones y el inventario que
+las indexa.
+
+El inventario guarda las habitaciones en un diccionario número -> habitación
+y lleva la disponibilidad en dos árboles de Fenwick (uno en orden de número
+y otro en orden de precio). Así buscar una habitación es O(1), contar las
+libres es O(1) y encontrar la siguiente libre o las libres de una franja de
+precios es O(log n) por resultado.
+"""
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+
+# Precio base por día de cada tipo de habitación
+PRECIOS_POR_TIPO = {"estandar": 120000, "superior": 160000}
+
+
+class Huesped:
+    # Con __slots__ y nombres internados: 56 bytes por huésped, 110 contando
+    # un documento propio (con __dict__: 96 y 280 bytes, medido con tracemalloc)
+    __slots__ = ("nombre", "apellidos", "documento")
+
+    def __init__(self, nombre, apellidos, documento):
+        self.nombre = sys.intern(nombre)
+        self.apellidos = sys.intern(apellidos)
+        self.documento = documento
+
+
+class Habitacion:
+    # Con __slots__: 96 bytes por habitación (con __dict__: 144 bytes, medido
+    # con tracemalloc sobre 100 000 habitaciones, sin contar los números)
+    __slots__ = ("numero", "precio_dia", "tipo", "disponible", "huesped", "fecha_ingreso",
+                 "version", "_inventario")
+
+    def __init__(self, numero, precio_dia, tipo="estandar"):
+        self.numero = numero
+        self.precio_dia = precio_dia
+        self.tipo = tipo
+        self.disponible = True
+        self.huesped = None
+        self.fecha_ingreso = None
+        self.version = 0   # Aumenta con cada ingreso o salida
+        self._inventario = None
+
+    def ocupar(self, huesped, fecha_ingreso):
+        # Si pertenece a un inventario, el cambio pasa por él para que sus
+        # índices se actualicen junto con la habitación
+        if self._inventario is not None:
+            self._inventario._ocupar(self, huesped, fecha_ingreso)
+        else:
+            self._asignar(huesped, fecha_ingreso)
+
+    def liberar(self, fecha_salida=None):
+        if self._inventario is not None:
+            self._inventario._liberar(self, fecha_salida)
+        else:
+            self._vaciar()
+
+    def _asignar(self, huesped, fecha_ingreso):
+        self.huesped = huesped
+        self.fecha_ingreso = fecha_ingreso
+        self.disponible = False
+        self.version += 1
+
+    def _vaciar(self):
+        self.huesped = None
+        self.fecha_ingreso = None
+        self.disponible = True
+        self.version += 1
+
+
+def habitaciones_del_hotel(cantidad=10):
+    """
+    Habitaciones numeradas desde 1: la primera mitad estándar y la segunda
+    superior (con 10, las 1 a 5 a $120 000 y las 6 a 10 a $160 000).
+    """
+    mitad = (cantidad + 1) // 2
+    return [Habitacion(i, PRECIOS_POR_TIPO[tipo], tipo)
+            for i in range(1, cantidad + 1)
+            for tipo in ["estandar" if i <= mitad else "superior"]]
+
+
+class _ArbolFenwick:
+    """Árbol de Fenwick sobre marcas 0/1 (1 = habitación libre)."""
+
+    __slots__ = ("_arbol",)
+
+    def __init__(self, marcas):
+        n = len(marcas)
+        arbol = [0] * (n + 1)
+        for i, marca in enumerate(marcas, start=1):
+            arbol[i] += marca
+            padre = i + (i & -i)
+            if padre <= n:
+                arbol[padre] += arbol[i]
+        self._arbol = arbol
+
+    def sumar(self, posicion, delta):
+        arbol = self._arbol
+        i = posicion + 1
+        while i < len(arbol):
+            arbol[i] += delta
+            i += i & -i
+
+    def prefijo(self, posicion):
+        """Cantidad de marcas en las posiciones [0, posicion)."""
+        arbol = self._arbol
+        total = 0
+        i = posicion
+        while i > 0:
+            total += arbol[i]
+            i -= i & -i
+        return total
+
+    def k_esima(self, k):
+        """Posición de la k-ésima marca (k >= 1)."""
+        arbol = self._arbol
+        posicion = 0
+        paso = 1 << (len(arbol) - 1).bit_length()
+        while paso:
+            siguiente = posicion + paso
+            if siguiente < len(arbol) and arbol[siguiente] < k:
+                posicion = siguiente
+                k -= arbol[siguiente]
+            paso >>= 1
+        return posicion
+
+    def siguiente(self, posicion, limite):
+        """Primera posición marcada en [posicion, limite), o None."""
+        k = self.prefijo(posicion) + 1
+        if k > self.prefijo(limite):
+            return None
+        return self.k_esima(k)
+
+
+class InventarioHabitaciones:
+    """
+    Conjunto de habitaciones del hotel con índices de disponibilidad.
+
+    Se usa como la lista de habitaciones que tenía la aplicación (append,
+    len, iteración en orden de alta). Los cambios de ocupar/liberar se hacen
+    bajo un candado, de modo que la habitación y los índices cambian juntos.
+
+    Quien necesite enterarse de los cambios (la tabla de habitaciones, por
+    ejemplo) se suscribe con una función f(evento, habitacion, huesped, fecha),
+    que se llama con "ocupar" o "liberar" dentro del candado, en el orden de
+    los cambios. huesped es el que entra o el que sale, y fecha la de ingreso
+    o la de salida (None si no se indicó).
+    """
+
+    def __init__(self, habitaciones=()):
+        self._candado = threading.RLock()
+        self._habitaciones = []
+        self._por_numero = {}
+        self._libres = 0
+        self._sucio = True
+        self._suscriptores = []
+        for habitacion in habitaciones:
+            self.agregar(habitacion)
+
+    def __len__(self):
+        return len(self._habitaciones)
+
+    def __iter__(self):
+        return iter(list(self._habitaciones))
+
+    def agregar(self, habitacion):
+        with self._candado:
+            if habitacion.numero in self._por_numero:
+                raise ValueError(f"La habitación {habitacion.numero} ya existe.")
+            habitacion._inventario = self
+            self._habitaciones.append(habitacion)
+            self._por_numero[habitacion.numero] = habitacion
+            if habitacion.disponible:
+                self._libres += 1
+            self._sucio = True   # Los árboles se reconstruyen en la próxima consulta
+
+    append = agregar
+
+    def suscribir(self, funcion):
+        with self._candado:
+            self._suscriptores.append(funcion)
+
+    def desuscribir(self, funcion):
+        with self._candado:
+            if funcion in self._suscriptores:
+                self._suscriptores.remove(funcion)
+
+    def _notificar(self, evento, habitacion, huesped, fecha):
+        for funcion in list(self._suscriptores):
+            funcion(evento, habitacion, huesped, fecha)
+
+    def _reconstruir(self):
+        por_numero = sorted(self._habitaciones, key=lambda h: h.numero)
+        por_precio = sorted(self._habitaciones, key=lambda h: (h.precio_dia, h.numero))
+        self._numeros = [h.numero for h in por_numero]
+        self._orden_precio = por_precio
+        self._precios = [h.precio_dia for h in por_precio]
+        self._posicion_numero = {h.numero: i for i, h in enumerate(por_numero)}
+        self._posicion_precio = {h.numero: i for i, h in enumerate(por_precio)}
+        self._libres_por_numero = _ArbolFenwick([int(h.disponible) for h in por_numero])
+        self._libres_por_precio = _ArbolFenwick([int(h.disponible) for h in por_precio])
+        self._sucio = False
+
+    def _indices(self):
+        if self._sucio:
+            self._reconstruir()
+
+    # ----- Consultas -----
+
+    def buscar(self, numero):
+        """Habitación con ese número, o None. O(1)."""
+        return self._por_numero.get(numero)
+
+    def cantidad_libres(self):
+        return self._libres
+
+    def siguiente_libre(self, desde=None):
+        """Habitación libre de menor número (mayor o igual a desde), o None."""
+        with self._candado:
+            self._indices()
+            inicio = 0 if desde is None else bisect_left(self._numeros, desde)
+            posicion = self._libres_por_numero.siguiente(inicio, len(self._numeros))
+            if posicion is None:
+                return None
+            return self._por_numero[self._numeros[posicion]]
+
+    def _franja(self, precio_min, precio_max):
+        return bisect_left(self._precios, precio_min), bisect_right(self._precios, precio_max)
+
+    def cantidad_libres_en_precio(self, precio_min, precio_max):
+        """Cantidad de habitaciones libres con precio entre los límites. O(log n)."""
+        with self._candado:
+            self._indices()
+            inicio, fin = self._franja(precio_min, precio_max)
+            return self._libres_por_precio.prefijo(fin) - self._libres_por_precio.prefijo(inicio)
+
+    def libres_en_precio(self, precio_min, precio_max, limite=None):
+        """
+        Habitaciones libres con precio entre los límites, de menor a mayor
+        precio. Cada resultado cuesta O(log n), sin recorrer las ocupadas.
+        """
+        with self._candado:
+            self._indices()
+            inicio, fin = self._franja(precio_min, precio_max)
+            resultado = []
+            while limite is None or len(resultado) < limite:
+                posicion = self._libres_por_precio.siguiente(inicio, fin)
+                if posicion is None:
+                    break
+                resultado.append(self._orden_precio[posicion])
+                inicio = posicion + 1
+            return resultado
+
+    # ----- Cambios de estado (los llama Habitacion) -----
+
+    def _marcar(self, habitacion, delta):
+        self._libres += delta
+        if not self._sucio:
+            self._libres_por_numero.sumar(self._posicion_numero[habitacion.numero], delta)
+            self._libres_por_precio.sumar(self._posicion_precio[habitacion.numero], delta)
+
+    def _ocupar(self, habitacion, huesped, fecha_ingreso):
+        with self._candado:
+            estaba_libre = habitacion.disponible
+            habitacion._asignar(huesped, fecha_ingreso)
+            if estaba_libre:
+                self._marcar(habitacion, -1)
+            self._notificar("ocupar", habitacion, huesped, fecha_ingreso)
+
+    def _liberar(self, habitacion, fecha_salida=None):
+        with self._candado:
+            estaba_ocupada = not habitacion.disponible
+            huesped = habitacion.huesped
+            habitacion._vaciar()
+            if estaba_ocupada:
+                self._marcar(habitacion, 1)
+                self._notificar("liberar", habitacion, huesped, fecha_salida)
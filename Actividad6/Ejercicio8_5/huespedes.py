@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de huéspedes del hotel.
+
+Guarda cada huésped una sola vez, indexado por documento (diccionario, O(1))
+y por apellidos, junto con la habitación donde está alojado ahora y su
+historial de estadías. El historial de cada huésped es un arreglo compacto
+de enteros: número de habitación y ordinales de las fechas de ingreso y
+salida de cada estadía.
+"""
+import datetime as dt
+import sys
+import threading
+from array import array
+
+from hotel import Huesped
+
+# Fecha de salida de una estadía que terminó sin registrarla
+SIN_FECHA = 0
+
+
+def clave_apellidos(apellidos):
+    """Forma normalizada de los apellidos para buscarlos sin importar mayúsculas."""
+    return " ".join(apellidos.casefold().split())
+
+
+class Estadia:
+    __slots__ = ("numero", "fecha_ingreso", "fecha_salida")
+
+    def __init__(self, numero, fecha_ingreso, fecha_salida):
+        self.numero = numero
+        self.fecha_ingreso = fecha_ingreso
+        self.fecha_salida = fecha_salida
+
+
+class RegistroHuespedes:
+    """
+    Huéspedes conocidos por el hotel. Se suscribe a un InventarioHabitaciones
+    para enterarse de los ingresos y las salidas.
+    """
+
+    def __init__(self, inventario=None):
+        self._candado = threading.Lock()
+        self._por_documento = {}
+        self._por_apellidos = {}
+        self._ubicacion = {}     # documento -> (número de habitación, fecha de ingreso)
+        self._historial = {}     # documento -> array de ternas (número, ingreso, salida)
+        if inventario is not None:
+            inventario.suscribir(self._al_cambiar)
+
+    def __len__(self):
+        return len(self._por_documento)
+
+    def registrar(self, huesped):
+        """
+        Devuelve el huésped guardado con ese documento, o guarda este si es
+        nuevo. Si el nombre o los apellidos cambiaron, se actualizan.
+        """
+        with self._candado:
+            guardado = self._por_documento.get(huesped.documento)
+            if guardado is None:
+                guardado = Huesped(huesped.nombre, huesped.apellidos, huesped.documento)
+                self._por_documento[guardado.documento] = guardado
+            elif guardado is not huesped:
+                self._quitar_apellidos(guardado)
+                guardado.nombre = sys.intern(huesped.nombre)
+                guardado.apellidos = sys.intern(huesped.apellidos)
+            self._por_apellidos.setdefault(clave_apellidos(guardado.apellidos), set()).add(guardado.documento)
+            return guardado
+
+    def _quitar_apellidos(self, huesped):
+        clave = clave_apellidos(huesped.apellidos)
+        documentos = self._por_apellidos.get(clave)
+        if documentos is not None:
+            documentos.discard(huesped.documento)
+            if not documentos:
+                del self._por_apellidos[clave]
+
+    # ----- Consultas -----
+
+    def buscar(self, documento):
+        """Huésped con ese documento, o None."""
+        return self._por_documento.get(documento)
+
+    def buscar_por_apellidos(self, apellidos):
+        """Huéspedes con esos apellidos (sin distinguir mayúsculas)."""
+        documentos = self._por_apellidos.get(clave_apellidos(apellidos), ())
+        return sorted((self._por_documento[d] for d in documentos), key=lambda h: h.nombre)
+
+    def ubicacion(self, documento):
+        """(número de habitación, fecha de ingreso) si el huésped está alojado, o None."""
+        return self._ubicacion.get(documento)
+
+    def historial(self, documento):
+        """Estadías terminadas del huésped, de la más antigua a la más reciente."""
+        ternas = self._historial.get(documento, ())
+        return [Estadia(ternas[i], dt.date.fromordinal(ternas[i + 1]),
+                        dt.date.fromordinal(ternas[i + 2]) if ternas[i + 2] != SIN_FECHA else None)
+                for i in range(0, len(ternas), 3)]
+
+    # ----- Eventos del inventario -----
+
+    def _al_cambiar(self, evento, habitacion, huesped, fecha):
+        if evento == "ocupar":
+            self.registrar(huesped)
+            with self._candado:
+                self._ubicacion[huesped.documento] = (habitacion.numero, fecha)
+            return
+
+        with self._candado:
+            ubicacion = self._ubicacion.get(huesped.documento)
+            if ubicacion is None or ubicacion[0] != habitacion.numero:
+                return
+            del self._ubicacion[huesped.documento]
+            numero, fecha_ingreso = ubicacion
+            self._historial.setdefault(huesped.documento, array("i")).extend(
+                (numero, fecha_ingreso.toordinal(), fecha.toordinal() if fecha else SIN_FECHA))
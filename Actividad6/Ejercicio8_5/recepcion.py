@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Recepción del hotel para varios puestos de atención a la vez.
+
+Cada habitación tiene su propio candado, de modo que la comprobación "está
+libre" junto con el ingreso ocurren sin que otro puesto se meta en el medio,
+y un puesto que espera una habitación no retiene a los que atienden otras.
+El cambio mismo sigue pasando por el candado del inventario, que mantiene
+sus índices y avisa a los suscriptores (la bitácora, por ejemplo) en el
+orden de los cambios; ese tramo es corto. Además cada habitación lleva un
+número de versión: un puesto que mostró el estado de una habitación puede
+pedir que el cambio se haga solo si nadie la modificó desde entonces.
+
+Ejecutado directamente, hace una prueba de carga con muchos hilos y luego
+con varios procesos, y comprueba que ninguna habitación quede ocupada dos
+veces:
+
+    python recepcion.py [--habitaciones N] [--hilos N] [--procesos N] [--operaciones N]
+"""
+import argparse
+import datetime as dt
+import random
+import threading
+import time
+from contextlib import ExitStack
+from multiprocessing.managers import BaseManager
+
+from hotel import Habitacion, Huesped, InventarioHabitaciones
+
+
+class ConflictoHabitacion(ValueError):
+    """El cambio pedido no se pudo hacer por el estado actual de la habitación."""
+
+
+class Recepcion:
+    """Ingresos y salidas seguros entre hilos sobre un InventarioHabitaciones."""
+
+    def __init__(self, inventario):
+        self.inventario = inventario
+        # Los candados se crean al usar cada habitación por primera vez, así
+        # que también sirven para las que se agreguen al inventario después
+        self._candados = {}
+        self._guardia = threading.Lock()
+
+    def _habitacion(self, numero):
+        habitacion = self.inventario.buscar(numero)
+        if habitacion is None:
+            raise ValueError(f"La habitación {numero} no existe.")
+        return habitacion
+
+    def _candado(self, numero):
+        candado = self._candados.get(numero)
+        if candado is None:
+            with self._guardia:
+                candado = self._candados.setdefault(numero, threading.Lock())
+        return candado
+
+    def consultar(self, numero):
+        """(disponible, versión) de la habitación, para un cambio condicionado."""
+        habitacion = self._habitacion(numero)
+        with self._candado(numero):
+            return habitacion.disponible, habitacion.version
+
+    @staticmethod
+    def _comprobar_version(habitacion, version_esperada):
+        if version_esperada is not None and habitacion.version != version_esperada:
+            raise ConflictoHabitacion(
+                f"La habitación {habitacion.numero} cambió mientras se atendía al huésped.")
+
+    def registrar_ingreso(self, numero, huesped, fecha_ingreso, version_esperada=None):
+        """Ocupa la habitación si está libre (y en la versión esperada, si se indica)."""
+        habitacion = self._habitacion(numero)
+        with self._candado(numero):
+            self._comprobar_version(habitacion, version_esperada)
+            if not habitacion.disponible:
+                raise ConflictoHabitacion(f"La habitación {numero} ya está ocupada.")
+            habitacion.ocupar(huesped, fecha_ingreso)
+            return habitacion.version
+
+    def registrar_salida(self, numero, fecha_salida=None, version_esperada=None):
+        """Libera la habitación si está ocupada; devuelve el huésped que salió."""
+        habitacion = self._habitacion(numero)
+        with self._candado(numero):
+            self._comprobar_version(habitacion, version_esperada)
+            if habitacion.disponible:
+                raise ConflictoHabitacion(f"La habitación {numero} no está ocupada.")
+            huesped = habitacion.huesped
+            habitacion.liberar(fecha_salida)
+            return huesped
+
+    def ingreso_lote(self, solicitudes):
+        """
+        Ocupa varias habitaciones de una vez: todas o ninguna. solicitudes es
+        una lista de (número, huésped, fecha de ingreso). Los candados se
+        toman en orden de número para que dos lotes no se bloqueen entre sí.
+        """
+        numeros = [numero for numero, _, _ in solicitudes]
+        if len(set(numeros)) != len(numeros):
+            raise ValueError("Un lote no puede repetir habitaciones.")
+        habitaciones = {numero: self._habitacion(numero) for numero in numeros}
+        with ExitStack() as pila:
+            for numero in sorted(numeros):
+                pila.enter_context(self._candado(numero))
+            ocupadas = [numero for numero in numeros if not habitaciones[numero].disponible]
+            if ocupadas:
+                raise ConflictoHabitacion(
+                    "Habitaciones ocupadas: " + ", ".join(str(n) for n in sorted(ocupadas)))
+            for numero, huesped, fecha_ingreso in solicitudes:
+                habitaciones[numero].ocupar(huesped, fecha_ingreso)
+        return len(solicitudes)
+
+
+# ----- Prueba de carga -----
+
+class _Verificador:
+    """Cuenta los ingresos sobre habitaciones que ya estaban ocupadas."""
+
+    def __init__(self, inventario):
+        self.ocupadas = set()
+        self.dobles = 0
+        self.eventos = 0
+        inventario.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento, habitacion, huesped, fecha):
+        # Se llama dentro del candado del inventario, en el orden de los cambios
+        self.eventos += 1
+        if evento == "ocupar":
+            if habitacion.numero in self.ocupadas:
+                self.dobles += 1
+            self.ocupadas.add(habitacion.numero)
+        else:
+            self.ocupadas.discard(habitacion.numero)
+
+    def resultado(self):
+        return self.eventos, self.dobles
+
+
+def _crear_hotel(cantidad):
+    inventario = InventarioHabitaciones(Habitacion(i, 100000) for i in range(1, cantidad + 1))
+    return Recepcion(inventario), _Verificador(inventario)
+
+
+def _atender(recepcion, cantidad, operaciones, semilla):
+    """Trabajo de un puesto: ingresos, salidas y lotes al azar."""
+    azar = random.Random(semilla)
+    fecha = dt.date(2024, 1, 1)
+    exitos = conflictos = 0
+    for i in range(operaciones):
+        numero = azar.randint(1, cantidad)
+        huesped = Huesped("Huésped", f"Puesto {semilla}", f"{semilla}-{i}")
+        try:
+            opcion = azar.random()
+            if opcion < 0.45:
+                recepcion.registrar_ingreso(numero, huesped, fecha)
+            elif opcion < 0.9:
+                recepcion.registrar_salida(numero, fecha)
+            else:
+                numeros = azar.sample(range(1, cantidad + 1), min(3, cantidad))
+                recepcion.ingreso_lote([(n, huesped, fecha) for n in numeros])
+            exitos += 1
+        except ConflictoHabitacion:
+            conflictos += 1
+    return exitos, conflictos
+
+
+_hotel_compartido = None
+
+
+def _hotel_del_servidor(cantidad):
+    # Se ejecuta en el proceso del administrador: un solo hotel para todos
+    global _hotel_compartido
+    if _hotel_compartido is None:
+        _hotel_compartido = _crear_hotel(cantidad)
+    return _hotel_compartido
+
+
+def _recepcion_del_servidor(cantidad):
+    return _hotel_del_servidor(cantidad)[0]
+
+
+def _verificador_del_servidor(cantidad):
+    return _hotel_del_servidor(cantidad)[1]
+
+
+class _AdministradorHotel(BaseManager):
+    pass
+
+
+_AdministradorHotel.register("recepcion", _recepcion_del_servidor)
+_AdministradorHotel.register("verificador", _verificador_del_servidor)
+
+
+def _atender_remoto(direccion, clave, cantidad, operaciones, semilla):
+    administrador = _AdministradorHotel(address=direccion, authkey=clave)
+    administrador.connect()
+    return _atender(administrador.recepcion(cantidad), cantidad, operaciones, semilla)
+
+
+def _informar(titulo, resultados, eventos, dobles, segundos):
+    exitos = sum(r[0] for r in resultados)
+    conflictos = sum(r[1] for r in resultados)
+    total = exitos + conflictos
+    print(f"{titulo}: {total} operaciones en {segundos:.2f} s ({total / segundos:,.0f} op/s), "
+          f"{exitos} exitosas, {conflictos} rechazadas, {eventos} cambios, "
+          f"{dobles} habitaciones ocupadas dos veces")
+
+
+def prueba_hilos(cantidad, hilos, operaciones):
+    recepcion, verificador = _crear_hotel(cantidad)
+    resultados = [None] * hilos
+
+    def trabajar(i):
+        resultados[i] = _atender(recepcion, cantidad, operaciones, i)
+
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    _informar(f"{hilos} hilos", resultados, *verificador.resultado(), time.perf_counter() - inicio)
+    return verificador.dobles
+
+
+def prueba_procesos(cantidad, procesos, operaciones):
+    from concurrent.futures import ProcessPoolExecutor
+
+    clave = b"recepcion"
+    with _AdministradorHotel(address=("127.0.0.1", 0), authkey=clave) as administrador:
+        verificador = administrador.verificador(cantidad)
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [ejecutor.submit(_atender_remoto, administrador.address, clave,
+                                       cantidad, operaciones, i) for i in range(procesos)]
+            resultados = [f.result() for f in futuros]
+        segundos = time.perf_counter() - inicio
+        eventos, dobles = verificador.resultado()
+    _informar(f"{procesos} procesos", resultados, eventos, dobles, segundos)
+    return dobles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la recepción del hotel.")
+    parser.add_argument("--habitaciones", type=int, default=50)
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--operaciones", type=int, default=5000, help="operaciones por hilo o proceso")
+    args = parser.parse_args(argv)
+
+    dobles = prueba_hilos(args.habitaciones, args.hilos, args.operaciones)
+    dobles += prueba_procesos(args.habitaciones, args.procesos, args.operaciones // 5)
+    return 1 if dobles else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
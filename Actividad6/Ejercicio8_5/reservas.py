@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Calendario de reservas futuras por habitación.
+
+Las estadías de cada habitación se guardan como intervalos [entrada, salida)
+que no se solapan, ordenados por fecha de entrada en arreglos de ordinales
+de fecha. Saber si una habitación está libre en un rango es una búsqueda
+binaria, O(log k) para k reservas de esa habitación.
+"""
+import datetime as dt
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class Reserva:
+    __slots__ = ("numero", "entrada", "salida", "huesped")
+
+    def __init__(self, numero, entrada, salida, huesped):
+        self.numero = numero
+        self.entrada = entrada
+        self.salida = salida
+        self.huesped = huesped
+
+
+class _ReservasHabitacion:
+    """Intervalos de una habitación, en arreglos paralelos ordenados."""
+
+    __slots__ = ("entradas", "salidas", "huespedes")
+
+    def __init__(self):
+        self.entradas = array("i")
+        self.salidas = array("i")
+        self.huespedes = []
+
+    def solapa(self, entrada, salida):
+        # La única reserva que puede solapar es la última que entra antes de
+        # la salida pedida (las reservas no se solapan entre sí)
+        i = bisect_left(self.entradas, salida)
+        return i > 0 and self.salidas[i - 1] > entrada
+
+
+class CalendarioReservas:
+    """Reservas de todas las habitaciones, indexadas por número."""
+
+    def __init__(self):
+        self._por_habitacion = {}
+
+    @staticmethod
+    def _rango(entrada, salida):
+        if salida <= entrada:
+            raise ValueError("La fecha de salida debe ser mayor a la fecha de entrada.")
+        return entrada.toordinal(), salida.toordinal()
+
+    def esta_libre(self, numero, entrada, salida):
+        """True si la habitación no tiene reservas entre entrada y salida."""
+        a, b = self._rango(entrada, salida)
+        reservas = self._por_habitacion.get(numero)
+        return reservas is None or not reservas.solapa(a, b)
+
+    def libres(self, numeros, entrada, salida):
+        """Números de las habitaciones (de numeros) libres en el rango."""
+        a, b = self._rango(entrada, salida)
+        por_habitacion = self._por_habitacion
+        return [numero for numero in numeros
+                if numero not in por_habitacion or not por_habitacion[numero].solapa(a, b)]
+
+    def reserva_en(self, numero, fecha):
+        """Reserva de la habitación que incluye esa noche, o None."""
+        reservas = self._por_habitacion.get(numero)
+        if reservas is None:
+            return None
+        a = fecha.toordinal()
+        i = bisect_right(reservas.entradas, a) - 1
+        if i < 0 or reservas.salidas[i] <= a:
+            return None
+        return Reserva(numero, dt.date.fromordinal(reservas.entradas[i]),
+                       dt.date.fromordinal(reservas.salidas[i]), reservas.huespedes[i])
+
+    def reservar(self, numero, entrada, salida, huesped=None):
+        """Registra una reserva; lanza ValueError si se solapa con otra."""
+        a, b = self._rango(entrada, salida)
+        reservas = self._por_habitacion.setdefault(numero, _ReservasHabitacion())
+        if reservas.solapa(a, b):
+            raise ValueError(f"La habitación {numero} ya está reservada en esas fechas.")
+        i = bisect_left(reservas.entradas, a)
+        reservas.entradas.insert(i, a)
+        reservas.salidas.insert(i, b)
+        reservas.huespedes.insert(i, huesped)
+        return Reserva(numero, entrada, salida, huesped)
+
+    def cancelar(self, numero, entrada):
+        """Cancela la reserva de la habitación que empieza en entrada."""
+        reservas = self._por_habitacion.get(numero)
+        a = entrada.toordinal()
+        i = bisect_left(reservas.entradas, a) if reservas else 0
+        if reservas is None or i == len(reservas.entradas) or reservas.entradas[i] != a:
+            raise ValueError(f"No hay una reserva de la habitación {numero} para esa fecha.")
+        del reservas.entradas[i]
+        del reservas.salidas[i]
+        del reservas.huespedes[i]
+
+    def reservas(self, numero):
+        """Reservas de una habitación, en orden de entrada."""
+        reservas = self._por_habitacion.get(numero)
+        if reservas is None:
+            return []
+        return [Reserva(numero, dt.date.fromordinal(a), dt.date.fromordinal(b), huesped)
+                for a, b, huesped in zip(reservas.entradas, reservas.salidas, reservas.huespedes)]
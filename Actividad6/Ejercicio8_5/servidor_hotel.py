@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local del hotel, sin interfaz gráfica.
+
+Atiende en localhost con asyncio. Cada petición es una línea JSON con un
+campo "op" y la respuesta es otra línea JSON con "ok" y los datos, o con
+"ok": false y el mensaje de error. Así varios puestos de recepción y
+kioscos comparten un mismo inventario.
+
+Operaciones:
+    {"op": "consultar", "numero": 3}
+    {"op": "libres"}                               cantidad y siguiente libre
+    {"op": "libres_precio", "min": 0, "max": 150000, "limite": 10}
+    {"op": "libres_fechas", "entrada": "2024-05-01", "salida": "2024-05-04"}
+    {"op": "cotizar", "tipo": "superior", "rangos": [["2024-05-01", "2024-05-04"], ...]}
+    {"op": "reservar", "numero": 3, "entrada": "2024-05-01", "salida": "2024-05-04",
+     "nombre": "...", "apellidos": "...", "documento": "..."}
+    {"op": "cancelar_reserva", "numero": 3, "entrada": "2024-05-01"}
+    {"op": "ingreso", "numero": 3, "nombre": "...", "apellidos": "...",
+     "documento": "...", "fecha": "2024-05-01"}
+    {"op": "salida", "numero": 3, "fecha": "2024-05-04"}
+
+En una fecha reservada solo puede ingresar el huésped con el documento de
+la reserva, y al hacerlo la reserva se da por usada.
+
+Uso:
+    python servidor_hotel.py [--puerto 8765] [--datos CARPETA] [--habitaciones N]
+                             [--tarifas ARCHIVO.json]
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+
+from bitacora import Bitacora
+from hotel import PRECIOS_POR_TIPO, Huesped, InventarioHabitaciones, habitaciones_del_hotel
+from huespedes import RegistroHuespedes
+from recepcion import Recepcion
+from reservas import CalendarioReservas
+from tarifas import Tarifario, cargar_tarifario
+
+PUERTO = 8765
+# Años aceptados en las peticiones; fuera de ellos una fecha es un error de
+# quien la envió y las tablas de tarifas crecerían sin necesidad
+ANIO_MINIMO, ANIO_MAXIMO = 1900, 2199
+MAX_RANGOS_COTIZACION = 1000
+
+
+def _fecha(texto):
+    try:
+        fecha = dt.date.fromisoformat(texto)
+    except (TypeError, ValueError):
+        raise ValueError("La fecha no tiene el formato correcto (AAAA-MM-DD).") from None
+    if not ANIO_MINIMO <= fecha.year <= ANIO_MAXIMO:
+        raise ValueError(f"La fecha debe estar entre los años {ANIO_MINIMO} y {ANIO_MAXIMO}.")
+    return fecha
+
+
+def _describir(habitacion):
+    return {
+        "numero": habitacion.numero,
+        "tipo": habitacion.tipo,
+        "precio_dia": habitacion.precio_dia,
+        "disponible": habitacion.disponible,
+        "documento": None if habitacion.disponible else habitacion.huesped.documento,
+        "fecha_ingreso": None if habitacion.disponible else habitacion.fecha_ingreso.isoformat(),
+        "version": habitacion.version,
+    }
+
+
+class ServicioHotel:
+    """Estado del hotel y operaciones que atiende el servidor."""
+
+    def __init__(self, carpeta_datos=None, cantidad_habitaciones=10, tarifario=None):
+        self.habitaciones = InventarioHabitaciones(habitaciones_del_hotel(cantidad_habitaciones))
+        self.reservas = CalendarioReservas()
+        self.tarifario = tarifario or Tarifario(PRECIOS_POR_TIPO)
+        self.registro = RegistroHuespedes(self.habitaciones)
+        self.recepcion = Recepcion(self.habitaciones)
+        self.bitacora = Bitacora(carpeta_datos, self.habitaciones) if carpeta_datos else None
+
+        self._operaciones = {
+            "consultar": self._consultar,
+            "libres": self._libres,
+            "libres_precio": self._libres_precio,
+            "libres_fechas": self._libres_fechas,
+            "cotizar": self._cotizar,
+            "reservar": self._reservar,
+            "cancelar_reserva": self._cancelar_reserva,
+            "ingreso": self._ingreso,
+            "salida": self._salida,
+        }
+
+    def atender(self, peticion):
+        """Resuelve una petición (dict) y devuelve la respuesta (dict)."""
+        try:
+            operacion = self._operaciones.get(peticion.get("op"))
+            if operacion is None:
+                raise ValueError(f"Operación desconocida: {peticion.get('op')!r}.")
+            return {"ok": True, **operacion(peticion)}
+        except KeyError as e:
+            return {"ok": False, "error": f"Petición incompleta: falta {e}."}
+        except TypeError:
+            return {"ok": False, "error": "Petición con un campo de tipo inválido."}
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        except OverflowError:
+            # Una fecha tan cercana a los extremos que no se le pueden sumar días
+            return {"ok": False, "error": "La fecha está fuera del rango permitido."}
+
+    def _habitacion(self, peticion):
+        habitacion = self.habitaciones.buscar(peticion["numero"])
+        if habitacion is None:
+            raise ValueError(f"La habitación {peticion['numero']} no existe.")
+        return habitacion
+
+    def _consultar(self, peticion):
+        return {"habitacion": _describir(self._habitacion(peticion))}
+
+    def _libres(self, peticion):
+        siguiente = self.habitaciones.siguiente_libre(peticion.get("desde"))
+        return {"cantidad": self.habitaciones.cantidad_libres(),
+                "siguiente": None if siguiente is None else siguiente.numero}
+
+    def _libres_precio(self, peticion):
+        libres = self.habitaciones.libres_en_precio(peticion["min"], peticion["max"], peticion.get("limite"))
+        return {"habitaciones": [h.numero for h in libres]}
+
+    def _libres_fechas(self, peticion):
+        entrada, salida = _fecha(peticion["entrada"]), _fecha(peticion["salida"])
+        # Como en la ventana de reservas, las habitaciones ocupadas no se ofrecen
+        numeros = self.reservas.libres([h.numero for h in self.habitaciones if h.disponible],
+                                       entrada, salida)
+        totales = {tipo: self.tarifario.total(tipo, entrada, salida)
+                   for tipo in self.tarifario.precios}
+        return {"habitaciones": [{"numero": n, "total": totales[self.habitaciones.buscar(n).tipo]}
+                                 for n in numeros]}
+
+    def _cotizar(self, peticion):
+        tipo, rangos = peticion["tipo"], peticion["rangos"]
+        if tipo not in self.tarifario.precios:
+            raise ValueError(f"Tipo de habitación desconocido: {tipo!r}.")
+        if (not isinstance(rangos, list) or len(rangos) > MAX_RANGOS_COTIZACION
+                or any(not isinstance(rango, list) or len(rango) != 2 for rango in rangos)):
+            raise ValueError(f"rangos debe ser una lista de hasta {MAX_RANGOS_COTIZACION} "
+                             "pares [entrada, salida].")
+        rangos = [(_fecha(entrada), _fecha(salida)) for entrada, salida in rangos]
+        return {"totales": self.tarifario.cotizar(tipo, rangos)}
+
+    def _reservar(self, peticion):
+        habitacion = self._habitacion(peticion)
+        entrada, salida = _fecha(peticion["entrada"]), _fecha(peticion["salida"])
+        huesped = Huesped(peticion["nombre"], peticion["apellidos"], peticion["documento"])
+        self.reservas.reservar(habitacion.numero, entrada, salida, huesped)
+        return {"total": self.tarifario.total(habitacion.tipo, entrada, salida)}
+
+    def _cancelar_reserva(self, peticion):
+        habitacion = self._habitacion(peticion)
+        self.reservas.cancelar(habitacion.numero, _fecha(peticion["entrada"]))
+        return {}
+
+    def _ingreso(self, peticion):
+        habitacion = self._habitacion(peticion)
+        fecha = _fecha(peticion["fecha"])
+        reserva = self.reservas.reserva_en(habitacion.numero, fecha)
+        if reserva is not None and (reserva.huesped is None
+                                    or reserva.huesped.documento != peticion["documento"]):
+            raise ValueError("La habitación tiene una reserva para esa fecha a nombre de otro huésped.")
+        # El huésped se registra solo si el ingreso se hace: un ingreso
+        # rechazado no debe crear ni modificar su ficha
+        nombre, apellidos, documento = peticion["nombre"], peticion["apellidos"], peticion["documento"]
+        if not all(isinstance(texto, str) for texto in (nombre, apellidos, documento)):
+            raise TypeError
+        huesped = self.registro.buscar(documento)
+        if huesped is None or (huesped.nombre, huesped.apellidos) != (nombre, apellidos):
+            huesped = Huesped(nombre, apellidos, documento)
+        version = self.recepcion.registrar_ingreso(habitacion.numero, huesped, fecha,
+                                                   peticion.get("version"))
+        self.registro.registrar(huesped)
+        if reserva is not None:
+            self.reservas.cancelar(reserva.numero, reserva.entrada)   # La reserva ya se usó
+        return {"version": version}
+
+    def _salida(self, peticion):
+        habitacion = self._habitacion(peticion)
+        fecha_ingreso = habitacion.fecha_ingreso
+        fecha = _fecha(peticion["fecha"]) if peticion.get("fecha") else None
+        if fecha is not None and fecha_ingreso is not None and fecha <= fecha_ingreso:
+            raise ValueError("La fecha de salida debe ser mayor a la fecha de ingreso.")
+        huesped = self.recepcion.registrar_salida(habitacion.numero, fecha, peticion.get("version"))
+        respuesta = {"documento": huesped.documento}
+        if fecha is not None:
+            respuesta["total"] = self.tarifario.total(habitacion.tipo, fecha_ingreso, fecha)
+        return respuesta
+
+    def cerrar(self):
+        if self.bitacora is not None:
+            self.bitacora.cerrar()
+
+
+async def _atender_cliente(servicio, lector, escritor):
+    try:
+        while True:
+            linea = await lector.readline()
+            if not linea:
+                break
+            try:
+                peticion = json.loads(linea)
+                if not isinstance(peticion, dict):
+                    raise ValueError
+            except ValueError:
+                respuesta = {"ok": False, "error": "La petición no es un objeto JSON válido."}
+            else:
+                respuesta = servicio.atender(peticion)
+            escritor.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+            await escritor.drain()
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+async def iniciar_servidor(servicio, host="127.0.0.1", puerto=PUERTO):
+    """Abre el servidor; devuelve el objeto de asyncio (puerto 0 elige uno libre)."""
+    return await asyncio.start_server(
+        lambda lector, escritor: _atender_cliente(servicio, lector, escritor), host, puerto)
+
+
+async def _servir(args):
+    servicio = ServicioHotel(args.datos, args.habitaciones, args.tarifario)
+    servidor = await iniciar_servidor(servicio, args.host, args.puerto)
+    print(f"Servidor del hotel en {args.host}:{args.puerto}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servicio.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local del hotel (líneas JSON).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--datos", help="carpeta donde se guarda la bitácora de ingresos y salidas")
+    parser.add_argument("--habitaciones", type=int, default=10, help="cantidad de habitaciones del hotel")
+    parser.add_argument("--tarifas", help="archivo JSON con temporadas y factores por día de la semana")
+    args = parser.parse_args(argv)
+    args.tarifario = None
+    if args.tarifas:
+        try:
+            args.tarifario = cargar_tarifario(args.tarifas, PRECIOS_POR_TIPO)
+        except (OSError, ValueError) as e:
+            parser.error(f"no se pudo leer el archivo de tarifas: {e}")
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
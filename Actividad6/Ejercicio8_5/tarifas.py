@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Tarifas por tipo de habitación, temporada y día de la semana.
+
+Para cada tipo de habitación se precalcula la tabla acumulada de tarifas
+diarias sobre un rango de fechas: acumulado[i] es la suma de las tarifas de
+los días anteriores al día i. El total de una estadía es entonces la resta
+de dos posiciones de la tabla, O(1) sin importar cuántas noches tenga, y un
+lote de miles de rangos se cotiza con dos lecturas por rango.
+
+Las temporadas y los factores por día de la semana se leen de un archivo
+JSON con cargar_tarifario() (ver tarifas_ejemplo.json).
+"""
+import datetime as dt
+import json
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+class Temporada:
+    """
+    Factor que se aplica cada año entre dos fechas (mes, día), ambas
+    incluidas. Si fin es anterior a inicio, la temporada cruza el año nuevo.
+    """
+
+    def __init__(self, nombre, inicio, fin, factor):
+        if factor < 0:
+            raise ValueError("El factor de una temporada no puede ser negativo.")
+        self.nombre = nombre
+        self.inicio = inicio
+        self.fin = fin
+        self.factor = factor
+
+    def incluye(self, fecha):
+        dia = (fecha.month, fecha.day)
+        if self.inicio <= self.fin:
+            return self.inicio <= dia <= self.fin
+        return dia >= self.inicio or dia <= self.fin
+
+
+def _mes_dia(texto):
+    """(mes, día) de un texto MM-DD."""
+    try:
+        mes, dia = (int(parte) for parte in texto.split("-"))
+        dt.date(2000, mes, dia)   # Año bisiesto: acepta el 29 de febrero
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"La fecha de temporada {texto!r} no tiene el formato MM-DD.") from None
+    return mes, dia
+
+
+def cargar_tarifario(ruta, precios):
+    """
+    Tarifario con las temporadas y los factores por día de la semana de un
+    archivo JSON así (ambas claves son opcionales):
+
+        {"temporadas": [{"nombre": "Alta", "inicio": "12-15", "fin": "01-15",
+                         "factor": 1.3}],
+         "factores_semana": [1, 1, 1, 1, 1.1, 1.25, 1.25]}
+
+    Lanza ValueError si el contenido no es válido.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        configuracion = json.load(f)
+    try:
+        temporadas = [Temporada(t["nombre"], _mes_dia(t["inicio"]), _mes_dia(t["fin"]),
+                                float(t["factor"]))
+                      for t in configuracion.get("temporadas", ())]
+        factores = configuracion.get("factores_semana")
+        if factores is not None:
+            factores = [float(factor) for factor in factores]
+            if any(factor < 0 for factor in factores):
+                raise ValueError("Los factores por día de la semana no pueden ser negativos.")
+    except KeyError as e:
+        raise ValueError(f"Falta la clave {e} en una temporada.") from None
+    except (AttributeError, TypeError):
+        raise ValueError("El archivo de tarifas no tiene la estructura esperada.") from None
+    return Tarifario(precios, temporadas, factores)
+
+
+class Tarifario:
+    """
+    Tarifas diarias de cada tipo de habitación.
+
+    precios es {tipo: precio base por día}. La tarifa de un día es el precio
+    base por el factor de su temporada (la primera que lo incluya) y por el
+    factor de su día de la semana (lunes primero), redondeada a pesos. Sin
+    temporadas ni factores, el total de una estadía es días * precio base.
+    """
+
+    # Años que cubren las tablas alrededor de la fecha pedida
+    MARGEN_ANIOS = 5
+
+    def __init__(self, precios, temporadas=(), factores_semana=None):
+        self.precios = dict(precios)
+        self.temporadas = list(temporadas)
+        self.factores_semana = tuple(factores_semana or (1,) * 7)
+        if len(self.factores_semana) != 7:
+            raise ValueError("Se necesita un factor por cada día de la semana.")
+        self._origen = None
+        self._acumulados = {}
+
+    def tarifa_dia(self, tipo, fecha):
+        factor = self.factores_semana[fecha.weekday()]
+        for temporada in self.temporadas:
+            if temporada.incluye(fecha):
+                factor *= temporada.factor
+                break
+        return round(self.precios[tipo] * factor)
+
+    def _construir(self, desde, hasta):
+        """Tablas acumuladas de todos los tipos para los días [desde, hasta)."""
+        dias = [desde + dt.timedelta(days=i) for i in range((hasta - desde).days)]
+        acumulados = {}
+        for tipo in self.precios:
+            tabla = array("q", [0])
+            total = 0
+            for fecha in dias:
+                total += self.tarifa_dia(tipo, fecha)
+                tabla.append(total)
+            acumulados[tipo] = tabla
+        self._origen = desde.toordinal()
+        self._acumulados = acumulados
+
+    def _cubrir(self, entrada, salida):
+        """Amplía las tablas si el rango queda fuera de ellas."""
+        if self._origen is not None:
+            largo = len(next(iter(self._acumulados.values()))) - 1
+            if self._origen <= entrada.toordinal() and salida.toordinal() <= self._origen + largo:
+                return
+            desde = min(entrada, dt.date.fromordinal(self._origen))
+            hasta = max(salida, dt.date.fromordinal(self._origen + largo))
+        else:
+            desde, hasta = entrada, salida
+        # Cerca de los extremos del calendario el margen se recorta
+        desde = dt.date(max(desde.year - self.MARGEN_ANIOS, dt.MINYEAR), 1, 1)
+        if hasta.year + self.MARGEN_ANIOS > dt.MAXYEAR:
+            hasta = dt.date.max
+        else:
+            hasta = dt.date(hasta.year + self.MARGEN_ANIOS, 1, 1)
+        self._construir(desde, hasta)
+
+    def tabla_acumulada(self, tipo, desde, hasta):
+        """
+        (tabla, origen): tabla acumulada del tipo que cubre [desde, hasta),
+        donde la posición de una fecha es su ordinal menos origen.
+        """
+        self._cubrir(desde, hasta)
+        return self._acumulados[tipo], self._origen
+
+    def total(self, tipo, entrada, salida):
+        """Total de una estadía desde entrada hasta salida (noches [entrada, salida))."""
+        if salida <= entrada:
+            raise ValueError("La fecha de salida debe ser mayor a la fecha de ingreso.")
+        self._cubrir(entrada, salida)
+        tabla = self._acumulados[tipo]
+        return tabla[salida.toordinal() - self._origen] - tabla[entrada.toordinal() - self._origen]
+
+    def cotizar(self, tipo, rangos):
+        """
+        Totales de muchas estadías del mismo tipo de habitación. rangos es
+        una lista de pares (entrada, salida); devuelve los totales en orden.
+        """
+        if not rangos:
+            return []
+        for entrada, salida in rangos:
+            if salida <= entrada:
+                raise ValueError("La fecha de salida debe ser mayor a la fecha de ingreso.")
+        self._cubrir(min(entrada for entrada, _ in rangos), max(salida for _, salida in rangos))
+        tabla = self._acumulados[tipo]
+        origen = self._origen
+        if np is not None:
+            acumulado = np.frombuffer(tabla, dtype=np.int64)
+            ordinales = np.array([(e.toordinal(), s.toordinal()) for e, s in rangos], dtype=np.int64)
+            return (acumulado[ordinales[:, 1] - origen] - acumulado[ordinales[:, 0] - origen]).tolist()
+        return [tabla[s.toordinal() - origen] - tabla[e.toordinal() - origen] for e, s in rangos]
@@ -1,17 +1,49 @@
 # -*- coding: utf-8 -*-
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
 import datetime as dt
 import calendar
+import sys
+import threading
+from collections import OrderedDict
+
+from busqueda import IndiceBusqueda
+from cumpleanos import IndiceCumpleanos, ProgramadorRecordatorios
+from deduplicacion import buscar_duplicados
+from intercambio import exportar, importar, leer_fecha
+
+# Milisegundos sin teclear antes de filtrar la lista
+DEMORA_BUSQUEDA = 60
+# Milisegundos entre revisiones de los recordatorios de cumpleaños
+INTERVALO_RECORDATORIOS = 60000
+# Nombres que se muestran en un recordatorio antes de resumir el resto
+MAX_NOMBRES_RECORDATORIO = 10
+# Errores de importación que se muestran al terminar (todos van al archivo de errores)
+MAX_ERRORES_MOSTRADOS = 20
+# Grupos de duplicados que se listan (el total siempre se informa)
+MAX_GRUPOS_MOSTRADOS = 500
+# Milisegundos entre revisiones de la búsqueda de duplicados en curso
+INTERVALO_DUPLICADOS = 100
+TIPOS_ARCHIVO = [("CSV", "*.csv"), ("vCard", "*.vcf *.vcard"), ("Todos", "*.*")]
 
 
 class Contacto:
-    """Clase que representa un contacto de la agenda."""
+    """
+    Clase que representa un contacto de la agenda.
+
+    Usa __slots__ y nombres internados: 80 bytes por contacto sin contar
+    dirección, teléfono y correo (con __dict__ y nombres sin internar eran
+    258 bytes, medido con tracemalloc).
+    """
+
+    __slots__ = ("nombres", "apellidos", "fecha_nacimiento",
+                 "direccion", "telefono", "correo")
 
     def __init__(self, nombres, apellidos, fecha_nacimiento,
                  direccion, telefono, correo):
-        self.nombres = nombres
-        self.apellidos = apellidos
+        self.nombres = sys.intern(nombres)
+        self.apellidos = sys.intern(apellidos)
         self.fecha_nacimiento = fecha_nacimiento  # objeto date
         self.direccion = direccion
         self.telefono = telefono
@@ -62,16 +94,130 @@ class DatePicker(tk.Frame):
     def get_date(self):
         """
         Devuelve la fecha seleccionada como objeto date.
-        Si el usuario escribe manualmente, intenta parsearla.
+        Si el usuario escribe manualmente, intenta parsearla
+        (None si el formato es incorrecto).
         """
-        texto = self.entry.get().strip()
-        if not texto:
-            return None
-        try:
-            return dt.datetime.strptime(texto, "%Y-%m-%d").date()
-        except ValueError:
-            # Si el formato es incorrecto, se devuelve None
-            return None
+        return leer_fecha(self.entry.get())
+
+
+class ListaContactos(tk.Frame):
+    """
+    Lista virtual de contactos: el Listbox solo tiene las filas que caben en
+    pantalla y el texto de cada contacto se arma al mostrarlo, guardando los
+    últimos en una caché pequeña. Así Tk no guarda una copia formateada de
+    toda la agenda y se puede saltar a cualquier posición al instante.
+    """
+
+    FILAS_POR_RUEDA = 3
+    TAMANO_CACHE = 512
+
+    def __init__(self, master, contactos, **kwargs):
+        super().__init__(master, **kwargs)
+        self.contactos = contactos
+        self._ids = None            # Posiciones filtradas, o None para mostrar todos
+        self._inicio = 0
+        self._filas_visibles = 1
+        self._cache = OrderedDict()
+
+        self.listbox = tk.Listbox(self, activestyle="none")
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar_y = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._desplazar)
+        self.scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox.bind("<Configure>", self._al_redimensionar)
+        for secuencia in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(secuencia, self._rueda)
+        for tecla, paso in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "pagina-"), ("<Next>", "pagina+")):
+            self.listbox.bind(tecla, lambda e, p=paso: self._tecla(p))
+        self.listbox.bind("<Home>", lambda e: self.ir_a(0) or "break")
+        self.listbox.bind("<End>", lambda e: self.ir_a(self.total() - 1) or "break")
+
+    def total(self):
+        return len(self.contactos) if self._ids is None else len(self._ids)
+
+    def mostrar(self, ids=None):
+        """Muestra solo los contactos de esas posiciones (None: todos)."""
+        self._ids = ids
+        self._inicio = 0
+        self._pintar()
+
+    def actualizar(self):
+        """Vuelve a pintar, por ejemplo después de agregar contactos."""
+        self._pintar()
+
+    def ir_a(self, posicion):
+        """Lleva la fila posicion (desde 0) a la vista y la selecciona."""
+        total = self.total()
+        if not total:
+            return
+        posicion = max(0, min(posicion, total - 1))
+        if not self._inicio <= posicion < self._inicio + self._filas_visibles:
+            self._inicio = posicion - self._filas_visibles // 2
+        self._pintar()
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(posicion - self._inicio)
+        self.listbox.activate(posicion - self._inicio)
+
+    def _texto(self, indice):
+        texto = self._cache.get(indice)
+        if texto is None:
+            texto = str(self.contactos[indice])
+            self._cache[indice] = texto
+            if len(self._cache) > self.TAMANO_CACHE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(indice)
+        return texto
+
+    def _al_redimensionar(self, event):
+        alto_linea = tkfont.nametofont(self.listbox.cget("font")).metrics("linespace") + 1
+        self._filas_visibles = max(1, event.height // alto_linea)
+        self._pintar()
+
+    def _pintar(self):
+        total = self.total()
+        self._inicio = max(0, min(self._inicio, total - self._filas_visibles))
+        fin = min(total, self._inicio + self._filas_visibles)
+        if self._ids is None:
+            indices = range(self._inicio, fin)
+        else:
+            indices = self._ids[self._inicio:fin]
+        self.listbox.delete(0, tk.END)
+        if fin > self._inicio:
+            self.listbox.insert(tk.END, *(self._texto(i) for i in indices))
+        if total:
+            self.scrollbar_y.set(self._inicio / total, fin / total)
+        else:
+            self.scrollbar_y.set(0, 1)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self._inicio = int(float(cantidad) * self.total())
+        elif accion == "scroll":
+            paso = int(cantidad)
+            if unidad == "pages":
+                paso *= max(1, self._filas_visibles - 1)
+            self._inicio += paso
+        self._pintar()
+
+    def _rueda(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._inicio -= self.FILAS_POR_RUEDA
+        else:
+            self._inicio += self.FILAS_POR_RUEDA
+        self._pintar()
+        return "break"
+
+    def _tecla(self, paso):
+        seleccion = self.listbox.curselection()
+        actual = self._inicio + (seleccion[0] if seleccion else 0)
+        if paso == "pagina-":
+            paso = -max(1, self._filas_visibles - 1)
+        elif paso == "pagina+":
+            paso = max(1, self._filas_visibles - 1)
+        self.ir_a(actual + paso)
+        return "break"
 
 
 class CalendarPopup(tk.Toplevel):
@@ -157,6 +303,72 @@ class CalendarPopup(tk.Toplevel):
         self.destroy()
 
 
+class VentanaCumpleanos(tk.Toplevel):
+    """Cumpleaños de los próximos días."""
+
+    def __init__(self, master, contactos, cumpleanos):
+        super().__init__(master)
+        self.title("Próximos cumpleaños")
+        self.geometry("420x300")
+        self.contactos = contactos
+        self.cumpleanos = cumpleanos
+
+        frame_dias = tk.Frame(self, padx=10, pady=5)
+        frame_dias.pack(fill=tk.X)
+        tk.Label(frame_dias, text="Próximos días:").pack(side=tk.LEFT)
+        self.var_dias = tk.StringVar(value="30")
+        tk.Spinbox(frame_dias, from_=1, to=366, width=5, textvariable=self.var_dias,
+                   command=self._mostrar).pack(side=tk.LEFT, padx=5)
+        tk.Button(frame_dias, text="Mostrar", command=self._mostrar).pack(side=tk.LEFT)
+
+        self.listbox = tk.Listbox(self)
+        self.listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self._mostrar()
+
+    def _mostrar(self):
+        texto = self.var_dias.get().strip()
+        if not texto.isdigit() or not 1 <= int(texto) <= 366:
+            messagebox.showerror("Error", "La cantidad de días debe ser un número entre 1 y 366.", parent=self)
+            return
+        self.listbox.delete(0, tk.END)
+        for fecha, id_contacto in self.cumpleanos.proximos(dt.date.today(), int(texto)):
+            contacto = self.contactos[id_contacto]
+            edad = fecha.year - contacto.fecha_nacimiento.year
+            self.listbox.insert(tk.END, f"{fecha.isoformat()}  {contacto.nombres} {contacto.apellidos} ({edad} años)")
+        if self.listbox.size() == 0:
+            self.listbox.insert(tk.END, "No hay cumpleaños en esos días.")
+
+
+class VentanaDuplicados(tk.Toplevel):
+    """Grupos de contactos que parecen la misma persona."""
+
+    def __init__(self, master, contactos, grupos):
+        super().__init__(master)
+        self.title("Contactos duplicados")
+        self.geometry("600x350")
+
+        repetidos = sum(len(grupo) - 1 for grupo in grupos)
+        texto = f"{len(grupos)} grupos de duplicados ({repetidos} contactos repetidos)."
+        if len(grupos) > MAX_GRUPOS_MOSTRADOS:
+            texto += f" Se muestran los primeros {MAX_GRUPOS_MOSTRADOS}."
+        tk.Label(self, text=texto, padx=10, pady=5).pack(anchor="w")
+
+        frame_lista = tk.Frame(self, padx=10, pady=5)
+        frame_lista.pack(fill=tk.BOTH, expand=True)
+        listbox = tk.Listbox(frame_lista)
+        listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(frame_lista, orient=tk.VERTICAL, command=listbox.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        listbox.config(yscrollcommand=scrollbar.set)
+
+        for numero, grupo in enumerate(grupos[:MAX_GRUPOS_MOSTRADOS], 1):
+            listbox.insert(tk.END, f"Grupo {numero}:")
+            for id_contacto in grupo:
+                listbox.insert(tk.END, f"    {id_contacto + 1}. {contactos[id_contacto]}")
+        if not grupos:
+            listbox.insert(tk.END, "No se encontraron contactos duplicados.")
+
+
 class AgendaApp(tk.Tk):
     """Ventana principal de la agenda de contactos."""
 
@@ -167,8 +379,13 @@ class AgendaApp(tk.Tk):
         self.resizable(True, True)
 
         self.contactos = []
+        self.indice = IndiceBusqueda()
+        self.cumpleanos = IndiceCumpleanos()
+        self.recordatorios = ProgramadorRecordatorios(self.cumpleanos, dt.date.today())
+        self._busqueda_pendiente = None
 
         self._crear_widgets()
+        self.after(INTERVALO_RECORDATORIOS, self._revisar_recordatorios)
 
     def _crear_widgets(self):
         # Frame superior con el formulario
@@ -205,9 +422,16 @@ class AgendaApp(tk.Tk):
         self.entry_correo = tk.Entry(frame_form)
         self.entry_correo.grid(row=5, column=1, sticky="ew", padx=5, pady=2)
 
-        # Botón Agregar
-        btn_agregar = tk.Button(frame_form, text="Agregar", command=self._agregar_contacto)
-        btn_agregar.grid(row=6, column=0, columnspan=2, pady=10)
+        # Botones Agregar, Importar y Exportar
+        frame_botones = tk.Frame(frame_form)
+        frame_botones.grid(row=6, column=0, columnspan=2, pady=10)
+        btn_agregar = tk.Button(frame_botones, text="Agregar", command=self._agregar_contacto)
+        btn_agregar.pack(side=tk.LEFT, padx=5)
+        self.btn_importar = tk.Button(frame_botones, text="Importar...", command=self._importar)
+        self.btn_importar.pack(side=tk.LEFT, padx=5)
+        tk.Button(frame_botones, text="Exportar...", command=self._exportar).pack(side=tk.LEFT, padx=5)
+        self.btn_duplicados = tk.Button(frame_botones, text="Duplicados...", command=self._buscar_duplicados)
+        self.btn_duplicados.pack(side=tk.LEFT, padx=5)
 
         frame_form.columnconfigure(1, weight=1)
 
@@ -218,14 +442,67 @@ class AgendaApp(tk.Tk):
         frame_lista = tk.Frame(self, padx=10, pady=5)
         frame_lista.pack(fill=tk.BOTH, expand=True)
 
-        tk.Label(frame_lista, text="Contactos:").pack(anchor="w")
-
-        self.listbox_contactos = tk.Listbox(frame_lista)
-        self.listbox_contactos.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        scrollbar_y = tk.Scrollbar(frame_lista, orient=tk.VERTICAL, command=self.listbox_contactos.yview)
-        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
-        self.listbox_contactos.config(yscrollcommand=scrollbar_y.set)
+        frame_buscar = tk.Frame(frame_lista)
+        frame_buscar.pack(fill=tk.X)
+
+        tk.Label(frame_buscar, text="Contactos:").pack(side=tk.LEFT)
+        self.lbl_resultados = tk.Label(frame_buscar, text="")
+        self.lbl_resultados.pack(side=tk.RIGHT)
+
+        self.var_busqueda = tk.StringVar()
+        self.var_busqueda.trace_add("write", lambda *args: self._programar_busqueda())
+        self.entry_busqueda = tk.Entry(frame_buscar, textvariable=self.var_busqueda)
+        self.entry_busqueda.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=5)
+        tk.Label(frame_buscar, text="Buscar:").pack(side=tk.RIGHT)
+
+        self.lista_contactos = ListaContactos(frame_lista, self.contactos)
+        self.lista_contactos.pack(fill=tk.BOTH, expand=True)
+
+        frame_ir = tk.Frame(frame_lista)
+        frame_ir.pack(fill=tk.X)
+        tk.Label(frame_ir, text="Ir a la posición:").pack(side=tk.LEFT)
+        self.entry_posicion = tk.Entry(frame_ir, width=8)
+        self.entry_posicion.pack(side=tk.LEFT, padx=5)
+        self.entry_posicion.bind("<Return>", lambda e: self._ir_a_posicion())
+        tk.Button(frame_ir, text="Ir", command=self._ir_a_posicion).pack(side=tk.LEFT)
+        tk.Button(frame_ir, text="Próximos cumpleaños",
+                  command=lambda: VentanaCumpleanos(self, self.contactos, self.cumpleanos)).pack(side=tk.RIGHT)
+
+    def _programar_busqueda(self):
+        # Si se sigue tecleando, se filtra una sola vez al final
+        if self._busqueda_pendiente is not None:
+            self.after_cancel(self._busqueda_pendiente)
+        self._busqueda_pendiente = self.after(DEMORA_BUSQUEDA, self._filtrar_contactos)
+
+    def _filtrar_contactos(self):
+        self._busqueda_pendiente = None
+        ids = self.indice.buscar(self.var_busqueda.get())
+
+        self.lista_contactos.mostrar(ids)
+        self.lbl_resultados.config(text="" if ids is None else f"{len(ids)} encontrados")
+
+    def _refrescar_lista(self):
+        if self.var_busqueda.get().strip():
+            self._filtrar_contactos()   # Los nuevos pueden o no coincidir con la búsqueda actual
+        else:
+            self.lista_contactos.actualizar()
+
+    def _ir_a_posicion(self):
+        texto = self.entry_posicion.get().strip()
+        if not texto.isdigit() or not 1 <= int(texto) <= self.lista_contactos.total():
+            messagebox.showerror("Error", f"La posición debe ser un número entre 1 y {self.lista_contactos.total()}.")
+            return
+        self.lista_contactos.ir_a(int(texto) - 1)
+
+    def _revisar_recordatorios(self):
+        # Solo se sacan del montículo los días que ya llegaron
+        for fecha, ids in self.recordatorios.vencidos(dt.date.today()):
+            nombres = [f"{self.contactos[i].nombres} {self.contactos[i].apellidos}"
+                       for i in ids[:MAX_NOMBRES_RECORDATORIO]]
+            if len(ids) > MAX_NOMBRES_RECORDATORIO:
+                nombres.append(f"y {len(ids) - MAX_NOMBRES_RECORDATORIO} más")
+            messagebox.showinfo("Cumpleaños", f"Cumpleaños del {fecha.isoformat()}:\n" + "\n".join(nombres))
+        self.after(INTERVALO_RECORDATORIOS, self._revisar_recordatorios)
 
     def _agregar_contacto(self):
         nombres = self.entry_nombres.get().strip()
@@ -246,8 +523,10 @@ class AgendaApp(tk.Tk):
 
         # Crear contacto y agregar a la lista
         contacto = Contacto(nombres, apellidos, fecha_nac, direccion, telefono, correo)
+        self.indice.agregar(len(self.contactos), nombres, apellidos, telefono, correo)
+        self.cumpleanos.agregar(len(self.contactos), fecha_nac)
         self.contactos.append(contacto)
-        self.listbox_contactos.insert(tk.END, str(contacto))
+        self._refrescar_lista()
 
         # Opcional: limpiar campos
         self.entry_nombres.delete(0, tk.END)
@@ -258,6 +537,122 @@ class AgendaApp(tk.Tk):
 
         messagebox.showinfo("Información", "Contacto agregado a la agenda.")
 
+    def _buscar_duplicados(self):
+        # Con un millón de contactos la búsqueda tarda decenas de segundos:
+        # se hace en un hilo sobre una copia de la lista para que la agenda
+        # siga respondiendo, y los grupos se refieren a esa copia
+        self.btn_duplicados.config(state=tk.DISABLED)
+        self.config(cursor="watch")
+        contactos = list(self.contactos)
+        busqueda = {"grupos": None, "error": None, "terminada": False}
+
+        def buscar():
+            # Se ejecuta en el hilo de trabajo: no debe tocar widgets
+            try:
+                busqueda["grupos"] = buscar_duplicados(contactos)
+            except Exception as e:
+                busqueda["error"] = e
+            finally:
+                busqueda["terminada"] = True
+
+        threading.Thread(target=buscar, daemon=True).start()
+        self.after(INTERVALO_DUPLICADOS, self._revisar_duplicados, contactos, busqueda)
+
+    def _revisar_duplicados(self, contactos, busqueda):
+        if not busqueda["terminada"]:
+            self.after(INTERVALO_DUPLICADOS, self._revisar_duplicados, contactos, busqueda)
+            return
+        self.config(cursor="")
+        self.btn_duplicados.config(state=tk.NORMAL)
+        if busqueda["error"] is not None:
+            messagebox.showerror("Error", f"No se pudieron buscar duplicados: {busqueda['error']}")
+            return
+        VentanaDuplicados(self, contactos, busqueda["grupos"])
+
+    # ----- Importación y exportación -----
+
+    def _importar(self):
+        ruta = filedialog.askopenfilename(parent=self, title="Importar contactos", filetypes=TIPOS_ARCHIVO)
+        if not ruta:
+            return
+        self.btn_importar.config(state=tk.DISABLED)
+        resumen = {"ruta": ruta, "importados": 0, "errores": 0, "mostrados": [],
+                   "ruta_errores": ruta + ".errores.txt", "archivo_errores": None}
+        self.after_idle(self._importar_lote, importar(ruta), resumen)
+
+    def _importar_lote(self, lotes, resumen):
+        # Un lote por llamada: la ventana se redibuja una vez por lote y sigue respondiendo
+        try:
+            lote = next(lotes, None)
+            if lote is not None:
+                self._agregar_lote(lote, resumen)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            lotes.close()
+            self._terminar_importacion(resumen, f"No se pudo importar el archivo: {e}")
+            return
+        except Exception as e:
+            # Ante cualquier otra falla también se cierran los archivos y se
+            # vuelve a habilitar el botón; el error sigue hacia Tk
+            lotes.close()
+            self._terminar_importacion(resumen, f"Error inesperado al importar: {e!r}")
+            raise
+        if lote is None:
+            self._terminar_importacion(resumen)
+            return
+        self.after_idle(self._importar_lote, lotes, resumen)
+
+    def _agregar_lote(self, lote, resumen):
+        # Primero los errores: si el archivo de errores no se puede escribir
+        # el lote no se agrega, y el resumen cuenta solo lo que sí entró
+        if lote.errores:
+            if resumen["archivo_errores"] is None:
+                resumen["archivo_errores"] = open(resumen["ruta_errores"], "w", encoding="utf-8")
+            resumen["archivo_errores"].write("".join(f"{error}\n" for error in lote.errores))
+
+        inicio = len(self.contactos)
+        nuevos = [Contacto(*fila) for fila in lote.filas]
+        self.indice.agregar_lote((i, c.nombres, c.apellidos, c.telefono, c.correo)
+                                 for i, c in enumerate(nuevos, inicio))
+        for i, c in enumerate(nuevos, inicio):
+            self.cumpleanos.agregar(i, c.fecha_nacimiento)
+        self.contactos.extend(nuevos)
+        self._refrescar_lista()
+
+        if lote.errores:
+            faltan = MAX_ERRORES_MOSTRADOS - len(resumen["mostrados"])
+            resumen["mostrados"].extend(str(error) for error in lote.errores[:faltan])
+        resumen["importados"] += len(nuevos)
+        resumen["errores"] += len(lote.errores)
+        self.lbl_resultados.config(text=f"Importando: {resumen['importados']} contactos")
+
+    def _terminar_importacion(self, resumen, fallo=None):
+        if resumen["archivo_errores"] is not None:
+            resumen["archivo_errores"].close()
+        self.btn_importar.config(state=tk.NORMAL)
+        self._filtrar_contactos()
+        mensaje = f"Contactos importados: {resumen['importados']}.\nFilas con errores: {resumen['errores']}."
+        if resumen["mostrados"]:
+            mensaje += "\n\n" + "\n".join(resumen["mostrados"])
+            if resumen["errores"] > len(resumen["mostrados"]):
+                mensaje += "\n..."
+            mensaje += f"\n\nTodos los errores están en {resumen['ruta_errores']}."
+        if fallo:
+            messagebox.showerror("Error", f"{fallo}\n\n{mensaje}")
+        else:
+            messagebox.showinfo("Importación", mensaje)
+
+    def _exportar(self):
+        ruta = filedialog.asksaveasfilename(parent=self, title="Exportar contactos",
+                                            defaultextension=".csv", filetypes=TIPOS_ARCHIVO)
+        if not ruta:
+            return
+        try:
+            cantidad = exportar(self.contactos, ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo escribir el archivo: {e}")
+            return
+        messagebox.showinfo("Exportación", f"Contactos exportados: {cantidad}.")
+
 
 if __name__ == "__main__":
     app = AgendaApp()
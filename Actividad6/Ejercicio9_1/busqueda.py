@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de búsqueda por prefijos para la agenda.
+
+Cada contacto aporta varias palabras normalizadas (sin tildes y en
+minúsculas): las de sus nombres y apellidos, las partes de su correo, el
+correo completo y los dígitos de su teléfono. Las palabras se guardan en
+una lista ordenada junto al identificador del contacto, de modo que todas
+las palabras que empiezan con un prefijo quedan contiguas y se encuentran
+con dos búsquedas binarias.
+
+Para que agregar contactos uno a uno no obligue a reordenar todo, las
+palabras se guardan en varias corridas ordenadas (como un árbol LSM): las
+nuevas van a una lista pequeña de pendientes, que al llenarse se ordena
+como una corrida más, y dos corridas de tamaño parecido se mezclan en una.
+Las corridas no crecen más allá de TAMANO_MAX_CORRIDA palabras, así ningún
+agregado tiene que reordenar de golpe todo el índice; una búsqueda hace dos
+búsquedas binarias por corrida.
+"""
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+_PALABRA = re.compile(r"\w+")
+_NO_DIGITO = re.compile(r"\D")
+_SEPARADORES_TELEFONO = re.compile(r"[\s()+.\-]")
+
+# Palabras pendientes a partir de las cuales se ordenan como una corrida
+MAX_PENDIENTES = 1024
+# Tamaño máximo de una corrida (mezclarla cuesta unos 25 ms)
+TAMANO_MAX_CORRIDA = 1 << 15
+
+
+def normalizar(texto):
+    """Minúsculas sin tildes ni espacios repetidos ("  José  " -> "jose")."""
+    if texto.isascii():
+        return " ".join(texto.lower().split())
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.split())
+
+
+def solo_digitos(texto):
+    return _NO_DIGITO.sub("", texto)
+
+
+@lru_cache(maxsize=1 << 16)
+def _palabras_nombre(texto):
+    # Los nombres y apellidos se repiten mucho: se normalizan una vez
+    return tuple(_PALABRA.findall(normalizar(texto)))
+
+
+def palabras_contacto(nombres, apellidos, telefono, correo):
+    """Palabras por las que se puede encontrar un contacto."""
+    palabras = set(_palabras_nombre(nombres))
+    palabras.update(_palabras_nombre(apellidos))
+    correo = normalizar(correo)
+    if correo:
+        palabras.add(correo)
+        palabras.update(_PALABRA.findall(correo))
+    digitos = solo_digitos(telefono)
+    if digitos:
+        palabras.add(digitos)
+    return palabras
+
+
+def palabras_consulta(consulta):
+    """
+    Prefijos que deben encontrarse todos en un mismo contacto. Un teléfono
+    escrito con espacios o guiones ("300 12-3") se toma como un solo prefijo.
+    """
+    texto = normalizar(consulta)
+    if not texto:
+        return []
+    compacto = _SEPARADORES_TELEFONO.sub("", texto)
+    if compacto.isdigit():
+        return [compacto]
+    if "@" in texto:
+        return texto.split()
+    return _PALABRA.findall(texto)
+
+
+class _Corrida:
+    """Palabras ordenadas con el id del contacto de cada una."""
+
+    __slots__ = ("palabras", "ids")
+
+    def __init__(self, pares):
+        self.palabras = [palabra for palabra, _ in pares]
+        self.ids = array("i", [id_contacto for _, id_contacto in pares])
+
+    def __len__(self):
+        return len(self.palabras)
+
+    def pares(self):
+        return zip(self.palabras, self.ids)
+
+    def ids_con_prefijo(self, prefijo):
+        inicio = bisect_left(self.palabras, prefijo)
+        fin = bisect_left(self.palabras, prefijo + "\U0010ffff", inicio)
+        return self.ids[inicio:fin]
+
+
+class IndiceBusqueda:
+    """Índice de prefijos sobre identificadores enteros de contactos."""
+
+    def __init__(self):
+        self._corridas = []            # las llenas primero, luego de mayor a menor
+        self._pendientes = []          # (palabra, id) todavía sin ordenar
+        self._cantidad = 0
+        self._mayor_id = -1
+
+    def __len__(self):
+        return self._cantidad
+
+    def agregar(self, id_contacto, nombres, apellidos, telefono, correo):
+        for palabra in palabras_contacto(nombres, apellidos, telefono, correo):
+            self._pendientes.append((palabra, id_contacto))
+        self._cantidad += 1
+        self._mayor_id = max(self._mayor_id, id_contacto)
+        if len(self._pendientes) >= MAX_PENDIENTES:
+            self._ordenar_pendientes()
+
+    def agregar_lote(self, contactos):
+        """contactos: iterable de (id, nombres, apellidos, telefono, correo)."""
+        for id_contacto, nombres, apellidos, telefono, correo in contactos:
+            for palabra in palabras_contacto(nombres, apellidos, telefono, correo):
+                self._pendientes.append((palabra, id_contacto))
+            self._cantidad += 1
+            self._mayor_id = max(self._mayor_id, id_contacto)
+        self._ordenar_pendientes()
+
+    def _ordenar_pendientes(self):
+        if not self._pendientes:
+            return
+        pares = sorted(self._pendientes)
+        self._pendientes = []
+        # Un lote grande se parte en corridas llenas
+        while len(pares) > TAMANO_MAX_CORRIDA:
+            self._corridas.insert(0, _Corrida(pares[:TAMANO_MAX_CORRIDA]))
+            del pares[:TAMANO_MAX_CORRIDA]
+        nueva = _Corrida(pares)
+        # Se mezcla con las corridas que no sean bastante más grandes
+        while (self._corridas and len(self._corridas[-1]) <= 2 * len(nueva)
+               and len(self._corridas[-1]) + len(nueva) <= TAMANO_MAX_CORRIDA):
+            anterior = self._corridas.pop()
+            nueva = _Corrida(sorted(list(anterior.pares()) + list(nueva.pares())))
+        self._corridas.append(nueva)
+
+    def _mascara_con_prefijo(self, prefijo):
+        # Con NumPy, un arreglo de marcas por id: la intersección es un AND
+        # y los ids salen ya ordenados
+        mascara = np.zeros(self._mayor_id + 1, dtype=bool)
+        for corrida in self._corridas:
+            ids = corrida.ids_con_prefijo(prefijo)
+            if ids:
+                mascara[np.frombuffer(ids, dtype=np.int32)] = True
+        for palabra, id_contacto in self._pendientes:
+            if palabra.startswith(prefijo):
+                mascara[id_contacto] = True
+        return mascara
+
+    def _ids_con_prefijo(self, prefijo):
+        encontrados = set()
+        for corrida in self._corridas:
+            encontrados.update(corrida.ids_con_prefijo(prefijo))
+        encontrados.update(id_contacto for palabra, id_contacto in self._pendientes
+                           if palabra.startswith(prefijo))
+        return encontrados
+
+    def buscar(self, consulta, limite=None):
+        """
+        Identificadores de los contactos que tienen, por cada palabra de la
+        consulta, alguna palabra que empieza con ella. Vienen en orden
+        creciente (el orden en que se agregaron). Una consulta vacía no
+        filtra nada y devuelve None.
+        """
+        prefijos = palabras_consulta(consulta)
+        if not prefijos:
+            return None
+        # Se empieza por el prefijo más largo, que suele ser el más selectivo
+        prefijos.sort(key=len, reverse=True)
+        if np is not None:
+            mascara = self._mascara_con_prefijo(prefijos[0])
+            for prefijo in prefijos[1:]:
+                mascara &= self._mascara_con_prefijo(prefijo)
+            ids = np.flatnonzero(mascara)
+            return (ids if limite is None else ids[:limite]).tolist()
+        resultado = self._ids_con_prefijo(prefijos[0])
+        for prefijo in prefijos[1:]:
+            if not resultado:
+                break
+            resultado &= self._ids_con_prefijo(prefijo)
+        ordenados = sorted(resultado)
+        return ordenados if limite is None else ordenados[:limite]
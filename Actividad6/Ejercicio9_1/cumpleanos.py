@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de cumpleaños de la agenda.
+
+Los contactos se agrupan en 366 cubetas, una por día del año (contando el
+29 de febrero), según el mes y el día de su fecha de nacimiento. Los
+cumpleaños de una fecha son una sola cubeta y los de los próximos N días son
+N cubetas seguidas, así que las consultas no recorren la agenda entera. En
+los años no bisiestos, quienes nacieron un 29 de febrero cumplen el 28.
+
+El programador de recordatorios guarda en un montículo la próxima fecha de
+cada día del año y cada día solo saca los que ya vencieron.
+"""
+import calendar
+import datetime as dt
+import heapq
+from array import array
+
+DIAS_ANIO = 366
+_ANIO_BISIESTO = 2000
+_DIA_29_FEBRERO = dt.date(2000, 2, 29).timetuple().tm_yday - 1
+
+
+def dia_del_anio(fecha):
+    """Posición (0 a 365) del mes y día de la fecha en un año bisiesto."""
+    return dt.date(_ANIO_BISIESTO, fecha.month, fecha.day).timetuple().tm_yday - 1
+
+
+def fecha_en_anio(dia, anio):
+    """Fecha en que cae el día del año (0 a 365) en ese año."""
+    fecha = dt.date(_ANIO_BISIESTO, 1, 1) + dt.timedelta(days=dia)
+    if fecha.month == 2 and fecha.day == 29 and not calendar.isleap(anio):
+        return dt.date(anio, 2, 28)
+    return fecha.replace(year=anio)
+
+
+class IndiceCumpleanos:
+    """Identificadores de contactos agrupados por día de cumpleaños."""
+
+    def __init__(self):
+        self._cubetas = [array("i") for _ in range(DIAS_ANIO)]
+
+    def agregar(self, id_contacto, fecha_nacimiento):
+        if fecha_nacimiento is not None:
+            self._cubetas[dia_del_anio(fecha_nacimiento)].append(id_contacto)
+
+    def del_dia(self, dia):
+        return self._cubetas[dia]
+
+    def en_fecha(self, fecha):
+        """Contactos que cumplen años en esa fecha."""
+        ids = list(self._cubetas[dia_del_anio(fecha)])
+        if fecha.month == 2 and fecha.day == 28 and not calendar.isleap(fecha.year):
+            ids.extend(self._cubetas[_DIA_29_FEBRERO])
+        return ids
+
+    def proximos(self, desde, dias):
+        """Lista de (fecha, id) de los cumpleaños en [desde, desde + dias)."""
+        resultado = []
+        for i in range(dias):
+            fecha = desde + dt.timedelta(days=i)
+            resultado.extend((fecha, id_contacto) for id_contacto in self.en_fecha(fecha))
+        return resultado
+
+
+class ProgramadorRecordatorios:
+    """
+    Recordatorios de cumpleaños sin revisar todos los contactos cada día.
+
+    El montículo tiene una entrada (próxima fecha, día del año) por cada uno
+    de los 366 días; vencidos() saca las que ya llegaron, devuelve los
+    contactos de esas cubetas y vuelve a programar cada día para el año
+    siguiente.
+    """
+
+    def __init__(self, indice, hoy, anticipacion=0):
+        self.indice = indice
+        self.anticipacion = anticipacion     # días de aviso antes del cumpleaños
+        self._monticulo = []
+        for dia in range(DIAS_ANIO):
+            fecha = fecha_en_anio(dia, hoy.year)
+            # Un cumpleaños que aún no pasó se queda en este año aunque ya
+            # esté dentro de la anticipación: vencidos() lo avisa enseguida
+            if fecha < hoy:
+                fecha = fecha_en_anio(dia, hoy.year + 1)
+            self._monticulo.append((fecha, dia))
+        heapq.heapify(self._monticulo)
+
+    def proximo_aviso(self):
+        """Fecha del próximo aviso programado."""
+        fecha, _ = self._monticulo[0]
+        return fecha - dt.timedelta(days=self.anticipacion)
+
+    def vencidos(self, hoy):
+        """Lista de (fecha de cumpleaños, ids) de los avisos que llegan hasta hoy."""
+        avisos = []
+        while self._monticulo and self._monticulo[0][0] - dt.timedelta(days=self.anticipacion) <= hoy:
+            fecha, dia = heapq.heappop(self._monticulo)
+            ids = list(self.indice.del_dia(dia))
+            if ids:
+                avisos.append((fecha, ids))
+            heapq.heappush(self._monticulo, (fecha_en_anio(dia, fecha.year + 1), dia))
+        return avisos
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Detección de contactos duplicados.
+
+Dos contactos son el mismo si comparten teléfono o correo (normalizados como
+claves de un diccionario, así que esta parte es lineal) o si sus nombres se
+parecen lo suficiente. Para no comparar todos contra todos, los nombres solo
+se comparan dentro de un bloque: los contactos con la misma clave fonética
+del primer apellido y el mismo año de nacimiento. En un bloque muy grande
+se ordenan por nombre y cada uno se compara con los VENTANA anteriores.
+
+Los duplicados se van uniendo con un union-find: si A se parece a B y B
+comparte teléfono con C, los tres quedan en el mismo grupo. Por eso un
+teléfono o un correo que comparten más de MAX_POR_CLAVE contactos (el de una
+oficina o el fijo de una familia) no se usa para unir: juntaría a todas esas
+personas en un solo grupo enorme. Esos contactos aún pueden unirse por nombre.
+"""
+import re
+from array import array
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from busqueda import normalizar, solo_digitos
+
+UMBRAL_NOMBRES = 0.85          # parecido mínimo (ratio de difflib) entre nombres
+MAX_BLOQUE = 50                # bloques más grandes se comparan por ventana
+VENTANA = 20
+DIGITOS_TELEFONO = 10          # se ignoran prefijos de país y de larga distancia
+MIN_DIGITOS_TELEFONO = 7
+MAX_POR_CLAVE = 5              # contactos con el mismo teléfono o correo que se unen
+
+_REGLAS_FONETICAS = (
+    (re.compile(r"[^a-z]"), ""),
+    (re.compile(r"ch"), "x"),
+    (re.compile(r"h"), ""),
+    (re.compile(r"ll|y"), "i"),
+    (re.compile(r"qu"), "k"),
+    (re.compile(r"c(?=[ei])|z"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"g(?=[ei])|j"), "g"),
+    (re.compile(r"v|w"), "b"),
+    (re.compile(r"(.)\1+"), r"\1"),
+)
+
+
+def clave_telefono(telefono):
+    """Últimos DIGITOS_TELEFONO dígitos, o "" si hay muy pocos."""
+    digitos = solo_digitos(telefono)
+    return digitos[-DIGITOS_TELEFONO:] if len(digitos) >= MIN_DIGITOS_TELEFONO else ""
+
+
+def clave_correo(correo):
+    """Correo en minúsculas y sin la etiqueta "+algo" del usuario."""
+    usuario, arroba, dominio = normalizar(correo).replace(" ", "").partition("@")
+    if not arroba or not usuario or not dominio:
+        return ""
+    return f"{usuario.split('+', 1)[0]}@{dominio}"
+
+
+@lru_cache(maxsize=1 << 16)
+def clave_fonetica(apellidos):
+    """
+    Clave fonética del primer apellido según cómo suena en español
+    ("Vásquez", "Basques" y "Vazquez" dan "baskes").
+    """
+    palabras = normalizar(apellidos).split()
+    if not palabras:
+        return ""
+    clave = palabras[0]
+    for patron, reemplazo in _REGLAS_FONETICAS:
+        clave = patron.sub(reemplazo, clave)
+    return clave
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.padres = array("i", range(n))
+
+    def raiz(self, x):
+        padres = self.padres
+        while padres[x] != x:
+            padres[x] = padres[padres[x]]   # Compresión por mitades
+            x = padres[x]
+        return x
+
+    def unir(self, a, b):
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra != rb:
+            self.padres[max(ra, rb)] = min(ra, rb)
+
+
+def _unir_por_clave(grupos, claves, maximo=MAX_POR_CLAVE):
+    primero = {}
+    repetidos = {}     # primer contacto con una clave -> los demás que la tienen
+    for i, clave in enumerate(claves):
+        if clave:
+            j = primero.setdefault(clave, i)
+            if j != i:
+                repetidos.setdefault(j, []).append(i)
+    for j, otros in repetidos.items():
+        if len(otros) < maximo:
+            for i in otros:
+                grupos.unir(j, i)
+
+
+def _comparar_bloque(grupos, ids, nombres, umbral):
+    if len(ids) > MAX_BLOQUE:
+        ids = sorted(ids, key=nombres.__getitem__)
+        ventana = VENTANA
+    else:
+        ventana = len(ids)
+    comparador = SequenceMatcher(autojunk=False)
+    for posicion, b in enumerate(ids):
+        nombre_b = nombres[b]
+        preparado = False
+        for a in ids[max(0, posicion - ventana):posicion]:
+            nombre_a = nombres[a]
+            if grupos.raiz(a) == grupos.raiz(b):
+                continue
+            if nombre_a == nombre_b:
+                grupos.unir(a, b)
+                continue
+            # Cota por largo (la de real_quick_ratio) antes de preparar difflib
+            if 2 * min(len(nombre_a), len(nombre_b)) < umbral * (len(nombre_a) + len(nombre_b)):
+                continue
+            if not preparado:
+                comparador.set_seq2(nombre_b)
+                preparado = True
+            comparador.set_seq1(nombre_a)
+            # quick_ratio() es otra cota más barata que ratio()
+            if comparador.quick_ratio() >= umbral and comparador.ratio() >= umbral:
+                grupos.unir(a, b)
+
+
+def buscar_duplicados(contactos, umbral=UMBRAL_NOMBRES):
+    """
+    Grupos de posiciones de contactos que parecen la misma persona. Cada
+    grupo está ordenado y los grupos vienen ordenados por su primer contacto.
+    """
+    n = len(contactos)
+    grupos = _UnionFind(n)
+    _unir_por_clave(grupos, (clave_telefono(c.telefono) for c in contactos))
+    _unir_por_clave(grupos, (clave_correo(c.correo) for c in contactos))
+
+    nombres = [normalizar(f"{c.nombres} {c.apellidos}") for c in contactos]
+    bloques = {}
+    for i, c in enumerate(contactos):
+        anio = c.fecha_nacimiento.year if c.fecha_nacimiento else 0
+        bloques.setdefault((clave_fonetica(c.apellidos), anio), []).append(i)
+    for ids in bloques.values():
+        if len(ids) > 1:
+            _comparar_bloque(grupos, ids, nombres, umbral)
+
+    por_raiz = {}
+    for i in range(n):
+        por_raiz.setdefault(grupos.raiz(i), []).append(i)
+    return [ids for ids in por_raiz.values() if len(ids) > 1]
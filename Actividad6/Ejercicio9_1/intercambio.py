@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Importación y exportación de contactos en CSV y vCard.
+
+Los archivos se leen línea a línea y se entregan en lotes de TAMANO_LOTE
+filas ya validadas, junto con los errores de las filas rechazadas; nunca se
+tiene en memoria más de un lote, así que importar un archivo de un millón de
+contactos no ocupa más memoria que uno de mil (además de lo que guarde la
+agenda). Las filas se validan con las mismas reglas del formulario: todos
+los campos son obligatorios y la fecha se lee con leer_fecha().
+
+El CSV lleva una fila de encabezado con los nombres de CAMPOS (en cualquier
+orden). En vCard se usan las propiedades N, BDAY, ADR, TEL y EMAIL.
+"""
+import csv
+import datetime as dt
+import os
+
+CAMPOS = ("nombres", "apellidos", "fecha_nacimiento", "direccion", "telefono", "correo")
+TAMANO_LOTE = 5000
+TAMANO_BUFFER = 1 << 20        # 1 MiB
+EXTENSIONES_VCARD = (".vcf", ".vcard")
+
+
+def leer_fecha(texto):
+    """Fecha en formato AAAA-MM-DD como objeto date, o None si no es válida."""
+    texto = texto.strip()
+    if not texto:
+        return None
+    try:
+        if len(texto) == 10 and texto[4] == "-" and texto[7] == "-" and texto.isascii():
+            # Caso común AAAA-MM-DD completo: fromisoformat es mucho más rápido
+            return dt.date.fromisoformat(texto)
+        return dt.datetime.strptime(texto, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+class ErrorFila:
+    __slots__ = ("linea", "mensaje")
+
+    def __init__(self, linea, mensaje):
+        self.linea = linea
+        self.mensaje = mensaje
+
+    def __str__(self):
+        return f"Línea {self.linea}: {self.mensaje}"
+
+
+class Lote:
+    """filas: tuplas con los valores de CAMPOS; errores: ErrorFila."""
+
+    __slots__ = ("filas", "errores")
+
+    def __init__(self):
+        self.filas = []
+        self.errores = []
+
+    def __len__(self):
+        return len(self.filas) + len(self.errores)
+
+
+def validar_fila(nombres, apellidos, fecha_nacimiento, direccion, telefono, correo):
+    """Tupla con los campos limpios; ValueError si alguno no es válido."""
+    nombres, apellidos = nombres.strip(), apellidos.strip()
+    direccion, telefono, correo = direccion.strip(), telefono.strip(), correo.strip()
+    if not nombres or not apellidos or not direccion or not telefono or not correo:
+        raise ValueError("Todos los campos son obligatorios.")
+    fecha = leer_fecha(fecha_nacimiento)
+    if fecha is None:
+        raise ValueError("La fecha de nacimiento es obligatoria y debe tener formato AAAA-MM-DD.")
+    return nombres, apellidos, fecha, direccion, telefono, correo
+
+
+def _agrupar(registros, tamano_lote):
+    """Valida los (línea, valores o mensaje de error) y los agrupa en lotes."""
+    lote = Lote()
+    for linea, valores in registros:
+        try:
+            if isinstance(valores, str):
+                raise ValueError(valores)
+            lote.filas.append(validar_fila(*valores))
+        except ValueError as e:
+            lote.errores.append(ErrorFila(linea, str(e)))
+        if len(lote) >= tamano_lote:
+            yield lote
+            lote = Lote()
+    if len(lote):
+        yield lote
+
+
+# ----- CSV -----
+
+def _registros_csv(archivo):
+    lector = csv.reader(archivo)
+    try:
+        encabezado = [columna.strip().lower() for columna in next(lector, [])]
+    except csv.Error as e:
+        raise ValueError(f"El encabezado no se pudo leer como CSV: {e}.") from None
+    faltantes = [campo for campo in CAMPOS if campo not in encabezado]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el encabezado: {', '.join(faltantes)}.")
+    posiciones = [encabezado.index(campo) for campo in CAMPOS]
+    while True:
+        try:
+            fila = next(lector)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # Por ejemplo un campo enorme o un byte nulo: se rechaza solo esa
+            # fila y el lector sigue con la línea siguiente
+            yield lector.line_num, f"La fila no se pudo leer como CSV: {e}."
+            continue
+        if not any(fila):
+            continue
+        if len(fila) < len(encabezado):
+            yield lector.line_num, f"Se esperaban {len(encabezado)} columnas y hay {len(fila)}."
+            continue
+        yield lector.line_num, [fila[i] for i in posiciones]
+
+
+def _escribir_csv(archivo, contactos, tamano_lote):
+    escritor = csv.writer(archivo, lineterminator="\n")
+    escritor.writerow(CAMPOS)
+    lote, cantidad = [], 0
+    for cantidad, c in enumerate(contactos, 1):
+        lote.append((c.nombres, c.apellidos,
+                     c.fecha_nacimiento.isoformat() if c.fecha_nacimiento else "",
+                     c.direccion, c.telefono, c.correo))
+        if len(lote) >= tamano_lote:
+            escritor.writerows(lote)
+            lote.clear()
+    escritor.writerows(lote)
+    return cantidad
+
+
+# ----- vCard -----
+
+def _dividir(valor, separador=";"):
+    """Separa por el separador sin escapar y quita los escapes de cada parte."""
+    partes, actual, i = [], [], 0
+    while i < len(valor):
+        c = valor[i]
+        if c == "\\" and i + 1 < len(valor):
+            siguiente = valor[i + 1]
+            actual.append("\n" if siguiente in "nN" else siguiente)
+            i += 2
+            continue
+        if c == separador:
+            partes.append("".join(actual))
+            actual = []
+        else:
+            actual.append(c)
+        i += 1
+    partes.append("".join(actual))
+    return partes
+
+
+def _desescapar(valor):
+    return _dividir(valor, None)[0]
+
+
+def _escapar(valor):
+    return (valor.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _lineas_desplegadas(archivo):
+    """(número de línea, línea) uniendo las líneas plegadas (que empiezan con espacio)."""
+    inicio, actual = 0, None
+    for numero, linea in enumerate(archivo, 1):
+        linea = linea.rstrip("\r\n")
+        if linea[:1] in (" ", "\t") and actual is not None:
+            actual += linea[1:]
+            continue
+        if actual is not None:
+            yield inicio, actual
+        inicio, actual = numero, linea
+    if actual is not None:
+        yield inicio, actual
+
+
+def _valores_vcard(propiedades):
+    apellidos, nombres = "", ""
+    if "N" in propiedades:
+        partes = _dividir(propiedades["N"]) + ["", ""]
+        apellidos, nombres = partes[0], partes[1]
+    elif "FN" in propiedades:
+        nombres, _, apellidos = _desescapar(propiedades["FN"]).partition(" ")
+    fecha = propiedades.get("BDAY", "").strip()
+    if len(fecha) == 8 and fecha.isdigit():       # Formato básico AAAAMMDD
+        fecha = f"{fecha[:4]}-{fecha[4:6]}-{fecha[6:]}"
+    direccion = ", ".join(p.strip() for p in _dividir(propiedades.get("ADR", "")) if p.strip())
+    telefono = _desescapar(propiedades.get("TEL", ""))
+    correo = _desescapar(propiedades.get("EMAIL", ""))
+    return [nombres, apellidos, fecha, direccion, telefono, correo]
+
+
+def _registros_vcard(archivo):
+    propiedades, inicio = None, 0
+    for numero, linea in _lineas_desplegadas(archivo):
+        nombre, separador, valor = linea.partition(":")
+        if not separador:
+            continue
+        nombre = nombre.split(";", 1)[0].split(".")[-1].strip().upper()
+        if nombre == "BEGIN" and valor.strip().upper() == "VCARD":
+            if propiedades is not None:
+                yield inicio, "Tarjeta sin END:VCARD."
+            propiedades, inicio = {}, numero
+        elif nombre == "END" and valor.strip().upper() == "VCARD":
+            if propiedades is not None:
+                yield inicio, _valores_vcard(propiedades)
+            propiedades = None
+        elif propiedades is not None:
+            propiedades.setdefault(nombre, valor)   # Se toma el primer TEL, EMAIL, etc.
+    if propiedades is not None:
+        yield inicio, "Tarjeta sin END:VCARD."
+
+
+def _escribir_vcard(archivo, contactos, tamano_lote):
+    lote, cantidad = [], 0
+    for cantidad, c in enumerate(contactos, 1):
+        lote.append(
+            "BEGIN:VCARD\r\nVERSION:3.0\r\n"
+            f"N:{_escapar(c.apellidos)};{_escapar(c.nombres)};;;\r\n"
+            f"FN:{_escapar(f'{c.nombres} {c.apellidos}')}\r\n"
+            + (f"BDAY:{c.fecha_nacimiento.isoformat()}\r\n" if c.fecha_nacimiento else "")
+            + f"ADR:;;{_escapar(c.direccion)};;;;\r\n"
+            f"TEL:{_escapar(c.telefono)}\r\n"
+            f"EMAIL:{_escapar(c.correo)}\r\n"
+            "END:VCARD\r\n")
+        if len(lote) >= tamano_lote:
+            archivo.write("".join(lote))
+            lote.clear()
+    archivo.write("".join(lote))
+    return cantidad
+
+
+# ----- Entrada y salida -----
+
+def es_vcard(ruta):
+    return os.path.splitext(ruta)[1].lower() in EXTENSIONES_VCARD
+
+
+def importar(ruta, tamano_lote=TAMANO_LOTE):
+    """
+    Genera los Lote de un archivo CSV o vCard (según la extensión). Si el
+    encabezado del CSV no tiene todas las columnas lanza ValueError.
+    """
+    with open(ruta, encoding="utf-8-sig", newline="", buffering=TAMANO_BUFFER) as archivo:
+        registros = _registros_vcard(archivo) if es_vcard(ruta) else _registros_csv(archivo)
+        yield from _agrupar(registros, tamano_lote)
+
+
+def exportar(contactos, ruta, tamano_lote=TAMANO_LOTE):
+    """Escribe los contactos en CSV o vCard (según la extensión); devuelve cuántos."""
+    with open(ruta, "w", encoding="utf-8", newline="", buffering=TAMANO_BUFFER) as archivo:
+        if es_vcard(ruta):
+            return _escribir_vcard(archivo, contactos, tamano_lote)
+        return _escribir_csv(archivo, contactos, tamano_lote)